@@ -0,0 +1,732 @@
+#!/usr/bin/env python
+
+import argparse
+import gzip
+import importlib.util
+import json
+import lzma
+import math
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from graph.flow.cost_minimal.cycle_canceling import CycleCanceling
+from graph.flow.cost_minimal.successive_shortest_path import SuccessiveShortestPath
+from graph.flow.flow import Flow
+from graph.flow.max.edmondsKarp import EdmondsKarp
+from graph.flow.max.gomoryHu import GomoryHu
+from graph import generators, loader, stream
+from graph.batch import jsonable
+from graph.csr import CSR
+from graph.graph import Graph
+from graph.metrics import metrics
+from graph.mst.kruskal import Kruskal
+from graph.mst.prim import Prim
+from graph.shortest_path.dijkstra import Dijkstra
+from graph.shortest_path.mooreBellmanFord import MooreBellmanFord
+from graph.tsp.branchAndBound import BranchAndBound
+from graph.tsp.doubleTree import DoubleTree
+from graph.tsp.nearestNeighbour import NearestNeighbour
+
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+EXTRA = os.path.join(SRC, '..', 'extra')
+
+
+class Stages:
+    """
+    Measure the stages of a single benchmark run.
+
+    Every stage (e.g. ``load`` and ``solve``) is measured by its runtime and,
+    if memory allocations are traced, the peak memory allocated while running
+    the stage.
+    """
+
+    def __init__(self, trace: bool = False):
+        """
+        Constructor.
+
+
+        :param trace: Whether memory allocations are traced by
+            :py:mod:`tracemalloc` to get the peak memory of each stage.
+        """
+        self.trace = trace
+        self.times: dict[str, int] = {}
+        self.peaks: dict[str, int] = {}
+
+    @contextmanager
+    def __call__(self, name: str) -> Iterator[None]:
+        """
+        Measure a stage.
+
+
+        :param name: The name of the stage.
+        """
+        if self.trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter_ns()
+        yield
+        self.times[name] = self.times.get(name, 0) + time.perf_counter_ns() - start
+        if self.trace:
+            peak = tracemalloc.get_traced_memory()[1] - base
+            self.peaks[name] = max(self.peaks.get(name, 0), peak)
+
+
+class Benchmark:
+    """
+    A single benchmark: an algorithm run on one input.
+    """
+
+    def __init__(self, name: str, run: Callable[[Stages, str], object], path: str):
+        """
+        Constructor.
+
+
+        :param name: The name of the benchmark, used as key for baselines.
+        :param run: The function to run the benchmark. It gets the
+            :py:class:`Stages` to measure and the input path, and returns the
+            algorithm's result to detect changed results.
+        :param path: The input file.
+        """
+        self.name = name
+        self.run = run
+        self.path = path
+
+    def measure(self, warmup: int, repeats: int) -> dict:
+        """
+        Run the benchmark and collect its measurements.
+
+        After the warm-up runs, the runtime of each stage is measured over
+        ``repeats`` runs. An additional run traces memory allocations for the
+        peak memory of each stage and collects the counters of the algorithms,
+        as tracing would distort the runtime measurements.
+
+
+        :param warmup: The number of runs before measuring.
+        :param repeats: The number of runs to measure.
+
+        :returns: The measurements of this benchmark.
+        """
+        for _ in range(warmup):
+            self.run(Stages(), self.path)
+
+        times: dict[str, list[int]] = {}
+        for _ in range(repeats):
+            stages = Stages()
+            result = self.run(stages, self.path)
+            for name, elapsed in stages.times.items():
+                times.setdefault(name, []).append(elapsed)
+
+        stages = Stages(trace=True)
+        metrics.reset()
+        metrics.enable()
+        tracemalloc.start()
+        try:
+            self.run(stages, self.path)
+        finally:
+            tracemalloc.stop()
+            metrics.disable()
+
+        return {
+            'result': result,
+            'counters': dict(metrics.counters),
+            'stages': {
+                name: {
+                    'median_ms': statistics.median(values) / 1e6,
+                    'min_ms': min(values) / 1e6,
+                    'peak_bytes': stages.peaks.get(name, 0),
+                }
+                for name, values in times.items()
+            },
+        }
+
+
+def _components(stages: Stages, path: str, backend: str = 'python'):
+    graph = Graph()
+    with stages('load'):
+        graph.import_from_file(path)
+    with stages('solve'):
+        return graph.count_components(backend=backend)
+
+
+def _components_scipy(stages: Stages, path: str):
+    return _components(stages, path, 'scipy')
+
+
+def _load(stages: Stages, path: str):
+    graph = Graph()
+    with stages('load'):
+        graph.import_from_file(path)
+    return len(graph.vertexes), sum(map(len, graph.edges.values()))
+
+
+def _parallel_load(workers: int) -> Callable[[Stages, str], object]:
+    def run(stages: Stages, path: str):
+        with stages('load'):
+            vertex_count, edges = loader.read_arrays(path, workers)
+        with stages('build'):
+            csr = CSR.from_edges(vertex_count, edges[0], edges[1], *edges[2:3])
+        return csr.edge_count
+    return run
+
+
+def _components_frontier(stages: Stages, path: str):
+    graph = Graph()
+    with stages('load'):
+        graph.import_from_file(path)
+    with stages('build'):
+        csr = graph.to_csr()
+    with stages('solve'):
+        return csr.components()
+
+
+def _mst(algorithm, **kwargs) -> Callable[[Stages, str], object]:
+    def run(stages: Stages, path: str):
+        mst = algorithm()
+        with stages('load'):
+            mst.import_from_file(path)
+        with stages('solve'):
+            return mst(**kwargs)
+    return run
+
+
+def _tsp(algorithm, **kwargs) -> Callable[[Stages, str], object]:
+    def run(stages: Stages, path: str):
+        tsp = algorithm()
+        with stages('load'):
+            tsp.import_from_file(path)
+        with stages('solve'):
+            return tsp(**kwargs).cost
+    return run
+
+
+def _shortest_path(algorithm, start: int, **kwargs) -> Callable[[Stages, str], object]:
+    def run(stages: Stages, path: str):
+        sp = algorithm()
+        with stages('load'):
+            sp.import_from_file(path, directed=True)
+        with stages('solve'):
+            return sp(start, **kwargs)[0]
+    return run
+
+
+def _max_flow(start: int, target: int, **kwargs) -> Callable[[Stages, str], object]:
+    def run(stages: Stages, path: str):
+        ek = EdmondsKarp()
+        with stages('load'):
+            ek.import_from_file(path)
+        with stages('solve'):
+            ek(start, target, **kwargs)
+        return ek.flow
+    return run
+
+
+def _update_capacity(start: int, target: int, edges: int = 10) -> Callable[[Stages, str], object]:
+    """
+    Update the maximum flow after increasing the capacity of the first edges
+    and decreasing it again, one edge after another.
+    """
+    def run(stages: Stages, path: str):
+        ek = EdmondsKarp()
+        with stages('load'):
+            ek.import_from_file(path)
+        with stages('solve'):
+            ek(start, target)
+        changed = list(ek.graph._flatten_edges())[:edges]
+        with stages('update'):
+            for e in changed:
+                ek.update_capacity(e.start.value, e.end.value, e.capacity + 1)
+            for e in changed:
+                ek.update_capacity(e.start.value, e.end.value, e.capacity - 1)
+        return ek.flow
+    return run
+
+
+def _check_update_capacity_cycle() -> list[str]:
+    """
+    Lower a capacity of a network, whose excess can flow back to the start on
+    a cycle through it: 0 -> 1 -> 2 with capacity 1 and 1 -> 0 with capacity
+    5. The updated value must match a fresh solve and the capacity of the cut,
+    i.e. 0.
+
+
+    :returns: The mismatches found.
+    """
+    flow = Flow(vertex_count=3)
+    flow.add_edge(0, 1, 1.0)
+    flow.add_edge(1, 2, 1.0)
+    flow.add_edge(1, 0, 5.0)
+    ek = EdmondsKarp(flow)
+    ek(0, 2)
+    ek.update_capacity(1, 2, 0.0)
+    fresh = EdmondsKarp(flow.copy())
+    for e in fresh.graph._flatten_edges():
+        e.flow = 0
+    fresh(0, 2)
+    cut = sum(e.capacity for e in ek.min_cut()[1])
+
+    problems = []
+    if ek.flow != fresh.flow:
+        problems.append(f'updated value {ek.flow} != fresh value {fresh.flow}')
+    if ek.flow != cut:
+        problems.append(f'updated value {ek.flow} != cut capacity {cut}')
+    return problems
+
+
+def _gomory_hu(workers: int) -> Callable[[Stages, str], object]:
+    """
+    Build the Gomory-Hu tree of a network by ``workers`` processes and sum up
+    the capacities of its edges as result.
+    """
+    def run(stages: Stages, path: str):
+        tree = GomoryHu()
+        with stages('load'):
+            tree.import_from_file(path)
+        with stages('solve'):
+            _, capacity = tree(workers)
+        return sum(c for c in capacity if c != float('inf'))
+    return run
+
+
+def _successive_shortest_path(stages: Stages, path: str, backend: str = 'python'):
+    ssp = SuccessiveShortestPath()
+    with stages('load'):
+        ssp.import_from_file(path)
+    with stages('solve'):
+        result, _ = ssp(backend)
+    return ssp.cost if result else None
+
+
+def _successive_shortest_path_numpy(stages: Stages, path: str):
+    return _successive_shortest_path(stages, path, 'numpy')
+
+
+def _cycle_canceling(stages: Stages, path: str, backend: str = 'python'):
+    cc = CycleCanceling()
+    with stages('load'):
+        cc.import_from_file(path)
+    with stages('solve'):
+        flow = cc(backend)
+    return cc.cost if flow else None
+
+
+def _cycle_canceling_numpy(stages: Stages, path: str):
+    return _cycle_canceling(stages, path, 'numpy')
+
+
+def _reoptimize(stages: Stages, path: str):
+    """
+    Re-optimize a cost minimal flow after moving a unit of supply between the
+    first source and sink and raising the cost of the first edges.
+    """
+    ssp = SuccessiveShortestPath()
+    with stages('load'):
+        ssp.import_from_file(path)
+    with stages('solve'):
+        result, flow = ssp()
+    if not result:
+        return None
+    vertexes = flow.vertexes.values()
+    source = next(v for v in vertexes if v.balance > 0)
+    sink = next(v for v in vertexes if v.balance < 0)
+    costs = {(e.start.value, e.end.value): e.weight + 2 for e in list(flow._flatten_edges())[:3]}
+    with stages('reoptimize'):
+        flow = ssp.reoptimize(flow, costs, balances={source.value: source.balance - 1,
+                                                     sink.value: sink.balance + 1})
+    return ssp.cost if flow else None
+
+
+def _startup(*argv: str) -> Callable[[Stages, str], object]:
+    """
+    Measure a fresh interpreter running ``argv`` (with the input path
+    appended, if any), including its startup and imports.
+    """
+    def run(stages: Stages, path: str):
+        command = [sys.executable, *argv] + ([path] if path else [])
+        with stages('process'):
+            output = subprocess.run(command, cwd=SRC, capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    return run
+
+
+def benchmarks(extra: str) -> list[Benchmark]:
+    """
+    Get all benchmarks over the datasets shipped in ``extra``.
+
+
+    :param extra: The directory of the datasets.
+
+    :returns: The list of benchmarks.
+    """
+    def path(family: str, name: str) -> str:
+        return os.path.join(extra, family, name + '.txt')
+
+    # The startup of short invocations. Importing the package must not import
+    # NumPy or any algorithm, which is guarded by the result as well.
+    result = [
+        Benchmark('startup/import', _startup('-c', 'import sys, graph; print(sorted(m for m in sys.modules '
+                                                   'if m == "numpy" or m.startswith("graph.")))'), ''),
+        Benchmark('startup/components/Graph1', _startup('main.py'), path('graph', 'Graph1')),
+    ]
+    # Importing alone, as the import dominates most of the runs on large graphs.
+    result.append(Benchmark('load/graph/Graph_gross', _load, path('graph', 'Graph_gross')))
+    for workers in sorted({1, os.cpu_count() or 1}):
+        for family, name in (('graph', 'Graph_gross'), ('mst', 'G_100_200')):
+            result.append(Benchmark(f'load/parallel/workers={workers}/{name}',
+                                    _parallel_load(workers), path(family, name)))
+    for name in ('Graph1', 'Graph2', 'Graph3', 'Graph_gross'):
+        result.append(Benchmark(f'components/bfs/{name}', _components, path('graph', name)))
+        result.append(Benchmark(f'components/frontier/{name}', _components_frontier, path('graph', name)))
+    for name in ('G_1_2', 'G_1_20', 'G_1_200', 'G_10_20', 'G_10_200', 'G_100_200'):
+        result.append(Benchmark(f'mst/kruskal/{name}', _mst(Kruskal), path('mst', name)))
+        result.append(Benchmark(f'mst/prim/{name}', _mst(Prim), path('mst', name)))
+    for name in ('K_10', 'K_12', 'K_15', 'K_20', 'K_30', 'K_50', 'K_70', 'K_100'):
+        result.append(Benchmark(f'tsp/nearest_neighbour/{name}', _tsp(NearestNeighbour), path('tsp', name)))
+        result.append(Benchmark(f'tsp/nearest_neighbour_multistart/{name}',
+                                _tsp(NearestNeighbour, multi_start=True), path('tsp', name)))
+        result.append(Benchmark(f'tsp/double_tree/{name}', _tsp(DoubleTree), path('tsp', name)))
+    result.append(Benchmark('tsp/branch_and_bound/K_10', _tsp(BranchAndBound), path('tsp', 'K_10')))
+    for name in ('Wege1', 'Wege2', 'Wege3'):
+        result.append(Benchmark(f'shortest_path/moore_bellman_ford/{name}',
+                                _shortest_path(MooreBellmanFord, 2), path('shortest_path', name)))
+        result.append(Benchmark(f'shortest_path/moore_bellman_ford_numpy/{name}',
+                                _shortest_path(MooreBellmanFord, 2, backend='numpy'), path('shortest_path', name)))
+    for name in ('Wege1', 'Wege2'):
+        result.append(Benchmark(f'shortest_path/dijkstra/{name}',
+                                _shortest_path(Dijkstra, 2), path('shortest_path', name)))
+    for name in ('Fluss1', 'Fluss2'):
+        result.append(Benchmark(f'flow_max/edmonds_karp/{name}', _max_flow(0, 7), path('flow_max', name)))
+        result.append(Benchmark(f'flow_max/update_capacity/{name}', _update_capacity(0, 7), path('flow_max', name)))
+        result.append(Benchmark(f'flow_max/gomory_hu/{name}', _gomory_hu(1), path('flow_max', name)))
+
+    # The same algorithms by SciPy's csgraph routines, to compare results and
+    # runtime. SciPy is optional, so these are skipped without it.
+    if importlib.util.find_spec('scipy'):
+        for name in ('Graph1', 'Graph2', 'Graph3', 'Graph_gross'):
+            result.append(Benchmark(f'components/scipy/{name}', _components_scipy, path('graph', name)))
+        for name in ('G_1_2', 'G_1_20', 'G_1_200', 'G_10_20', 'G_10_200', 'G_100_200'):
+            result.append(Benchmark(f'mst/kruskal_scipy/{name}', _mst(Kruskal, backend='scipy'), path('mst', name)))
+        for name in ('Wege1', 'Wege2'):
+            result.append(Benchmark(f'shortest_path/dijkstra_scipy/{name}',
+                                    _shortest_path(Dijkstra, 2, backend='scipy'),
+                                    path('shortest_path', name)))
+        for name in ('Fluss1', 'Fluss2'):
+            result.append(Benchmark(f'flow_max/edmonds_karp_scipy/{name}', _max_flow(0, 7, backend='scipy'),
+                                    path('flow_max', name)))
+    for name in ('Kostenminimal1', 'Kostenminimal2', 'Kostenminimal3', 'Kostenminimal4',
+                 'Kostenminimal_gross1', 'Kostenminimal_gross2', 'Kostenminimal_gross3'):
+        result.append(Benchmark(f'flow_costmin/successive_shortest_path/{name}',
+                                _successive_shortest_path, path('flow_costmin', name)))
+        result.append(Benchmark(f'flow_costmin/cycle_canceling/{name}',
+                                _cycle_canceling, path('flow_costmin', name)))
+        result.append(Benchmark(f'flow_costmin/successive_shortest_path_numpy/{name}',
+                                _successive_shortest_path_numpy, path('flow_costmin', name)))
+        result.append(Benchmark(f'flow_costmin/cycle_canceling_numpy/{name}',
+                                _cycle_canceling_numpy, path('flow_costmin', name)))
+        result.append(Benchmark(f'flow_costmin/reoptimize/{name}', _reoptimize, path('flow_costmin', name)))
+    return result
+
+
+def _read_input(stages: Stages, path: str):
+    with stages('read'):
+        with stream.open_input(path) as input_file:
+            lines = characters = 0
+            for line in input_file:
+                lines += 1
+                characters += len(line)
+    return lines, characters
+
+
+# Functions compressing files by their format, for the formats available.
+COMPRESSORS = {
+    'gzip': ('.gz', lambda data: gzip.compress(data, compresslevel=6)),
+    'xz': ('.xz', lzma.compress),
+}
+if importlib.util.find_spec('zstandard'):
+    COMPRESSORS['zstd'] = ('.zst', lambda data: __import__('zstandard').ZstdCompressor().compress(data))
+
+
+def compressed_benchmarks(directory: str, extra: str) -> list[Benchmark]:
+    """
+    Get benchmarks comparing plain and compressed inputs.
+
+    The largest datasets in ``extra`` are compressed by every format available
+    into ``directory`` to measure reading their lines and importing them,
+    compared to the plain files.
+
+
+    :param directory: The directory to write the compressed files to.
+    :param extra: The directory of the datasets.
+
+    :returns: The list of benchmarks.
+    """
+    result = []
+    for family, name, run in (('graph', 'Graph_gross', _load),
+                              ('mst', 'G_100_200', _mst(Kruskal)),
+                              ('flow_costmin', 'Kostenminimal_gross1', _successive_shortest_path)):
+        path = os.path.join(extra, family, name + '.txt')
+        result.append(Benchmark(f'compression/read/plain/{name}', _read_input, path))
+        result.append(Benchmark(f'compression/import/plain/{name}', run, path))
+        with open(path, 'rb') as input_file:
+            data = input_file.read()
+        for compression, (suffix, compress) in COMPRESSORS.items():
+            compressed = os.path.join(directory, name + '.txt' + suffix)
+            with open(compressed, 'wb') as output_file:
+                output_file.write(compress(data))
+            result.append(Benchmark(f'compression/read/{compression}/{name}', _read_input, compressed))
+            result.append(Benchmark(f'compression/import/{compression}/{name}', run, compressed))
+    return result
+
+
+def synthetic_benchmarks(directory: str, sizes: list[int], seed: int = 0) -> list[Benchmark]:
+    """
+    Get benchmarks over synthetic graphs of increasing size.
+
+    For every size ``n``, the inputs are generated by :py:mod:`graph.generators`
+    into ``directory`` to measure how Kruskal, Dijkstra, Edmonds-Karp and
+    Successive Shortest Path scale: a random weighted graph with ``3n`` edges,
+    a random network with ``4n`` edges (maximum flow from vertex 0 to vertex
+    ``n - 1``) and a feasible cost minimal flow instance with ``4n`` edges.
+
+
+    :param directory: The directory to write the generated files to.
+    :param sizes: The numbers of vertexes to generate graphs for.
+    :param seed: The seed of the generators.
+
+    :returns: The list of benchmarks.
+    """
+    result = []
+    for n in sizes:
+        path = os.path.join(directory, f'random_{n}.txt')
+        with open(path, 'w') as output_file:
+            generators.write_graph(output_file, n,
+                                   generators.random_graph(n, 3 * n, seed),
+                                   ('%d', '%d', '%.4f'))
+        result.append(Benchmark(f'scaling/kruskal/n={n}', _mst(Kruskal), path))
+        result.append(Benchmark(f'scaling/dijkstra/n={n}', _shortest_path(Dijkstra, 0), path))
+        result.append(Benchmark(f'scaling/moore_bellman_ford/n={n}', _shortest_path(MooreBellmanFord, 0), path))
+        result.append(Benchmark(f'scaling/moore_bellman_ford_numpy/n={n}',
+                                _shortest_path(MooreBellmanFord, 0, backend='numpy'), path))
+        for workers in sorted({1, os.cpu_count() or 1}):
+            result.append(Benchmark(f'scaling/parallel_load/workers={workers}/n={n}', _parallel_load(workers), path))
+
+        path = os.path.join(directory, f'flow_{n}.txt')
+        with open(path, 'w') as output_file:
+            generators.write_graph(output_file, n,
+                                   generators.flow_network(n, 4 * n, seed),
+                                   ('%d', '%d', '%.1f'))
+        result.append(Benchmark(f'scaling/edmonds_karp/n={n}', _max_flow(0, n - 1), path))
+        result.append(Benchmark(f'scaling/update_capacity/n={n}', _update_capacity(0, n - 1), path))
+        for workers in sorted({1, os.cpu_count() or 1}):
+            result.append(Benchmark(f'scaling/gomory_hu/workers={workers}/n={n}', _gomory_hu(workers), path))
+
+        path = os.path.join(directory, f'costmin_{n}.txt')
+        with open(path, 'w') as output_file:
+            generators.write_graph(output_file, n,
+                                   generators.cost_minimal(n, 4 * n, seed),
+                                   ('%d', '%d', '%.1f', '%.1f'),
+                                   generators.balances(n, generators.cost_minimal(n, 4 * n, seed)))
+        result.append(Benchmark(f'scaling/successive_shortest_path/n={n}',
+                                _successive_shortest_path, path))
+        result.append(Benchmark(f'scaling/successive_shortest_path_numpy/n={n}',
+                                _successive_shortest_path_numpy, path))
+    return result
+
+
+# Correctness checks run before the benchmarks, which aren't timed. A check
+# returns the mismatches found, so the harness fails instead of recording a
+# wrong result as just another one.
+CHECKS: dict[str, Callable[[], list[str]]] = {
+    'flow_max/update_capacity/cycle_through_start': _check_update_capacity_cycle,
+}
+
+
+def check(names: list[str]) -> list[str]:
+    """
+    Run correctness checks.
+
+
+    :param names: The names of the checks to run.
+
+    :returns: The failures of all checks, prefixed by their name.
+    """
+    failures = []
+    for name in names:
+        print(f'{name} (check) ...', file=sys.stderr, flush=True)
+        failures += [f'{name}: {problem}' for problem in CHECKS[name]()]
+    return failures
+
+
+def compare(results: dict, baseline: dict, threshold: float, floor: float = 0.0) -> list[str]:
+    """
+    Compare benchmark results against a baseline.
+
+    A stage is flagged as regression, if its median runtime or peak memory
+    exceeds the baseline by more than ``threshold`` (relative). Runtimes below
+    ``floor`` in the baseline are too noisy to be compared and ignored. In
+    addition, changed results of the algorithms are reported.
+
+
+    :param results: The current benchmark results.
+    :param baseline: The baseline results.
+    :param threshold: The relative threshold, e.g. ``0.2`` for 20%.
+    :param floor: The minimum baseline runtime in milliseconds to compare.
+
+    :returns: A message for every regression found.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        if not _same_result(current['result'], base['result']):
+            regressions.append(f"{name}: result changed from {base['result']} to {current['result']}")
+
+        for stage, values in current['stages'].items():
+            base_values = base['stages'].get(stage)
+            if base_values is None:
+                continue
+            for key in ('median_ms', 'peak_bytes'):
+                if key == 'median_ms' and base_values[key] < floor:
+                    continue
+                if base_values[key] and values[key] > base_values[key] * (1 + threshold):
+                    regressions.append(
+                        f"{name} [{stage}]: {key} {base_values[key]:.4g} -> {values[key]:.4g} "
+                        f"(+{(values[key] / base_values[key] - 1) * 100:.1f}%)")
+    return regressions
+
+
+def _same_result(a, b) -> bool:
+    """
+    Compare two results, allowing for rounding errors of floats.
+    """
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(_same_result, a, b))
+    return a == b
+
+
+def getArgs() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+
+    :returns: A :py:class:`argparse.Namespace` to access the argument values.
+    """
+    parser = argparse.ArgumentParser(
+        description='Run the benchmarks over the datasets in extra/')
+
+    parser.add_argument('-f', '--filter',
+                        help='Just run benchmarks whose name matches this regular expression')
+    parser.add_argument('-l', '--list',
+                        action='store_true',
+                        help='List the benchmarks instead of running them')
+    parser.add_argument('--extra',
+                        default=EXTRA,
+                        help='Directory of the datasets')
+    parser.add_argument('-s', '--synthetic',
+                        metavar='SIZES',
+                        help='Comma separated numbers of vertexes to run scaling benchmarks on synthetic graphs for')
+    parser.add_argument('-c', '--compressed',
+                        action='store_true',
+                        help='Run benchmarks comparing plain and compressed (gzip, xz, zstd) inputs')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='Seed for generating synthetic graphs')
+    parser.add_argument('-w', '--warmup',
+                        type=int,
+                        default=1,
+                        help='Number of warm-up runs per benchmark')
+    parser.add_argument('-r', '--repeats',
+                        type=int,
+                        default=3,
+                        help='Number of measured runs per benchmark')
+    parser.add_argument('-o', '--output',
+                        default='-',
+                        help='File to write the results to as JSON (default: stdout)')
+    parser.add_argument('-b', '--baseline',
+                        help='Results of a previous run to compare against')
+    parser.add_argument('-t', '--threshold',
+                        type=float,
+                        default=0.2,
+                        help='Relative slowdown or memory growth flagged as regression')
+    parser.add_argument('--floor',
+                        type=float,
+                        default=1.0,
+                        help='Ignore runtime changes of stages faster than FLOOR ms in the baseline')
+
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    Run the benchmarks selected by the command line arguments.
+
+
+    :param args: The parsed command line arguments.
+
+    :returns: The exit code, non-zero if checks fail or regressions have
+        been found.
+    """
+    selected = benchmarks(args.extra)
+    directory = tempfile.TemporaryDirectory()
+    if args.synthetic:
+        sizes = [int(n) for n in args.synthetic.split(',')]
+        selected += synthetic_benchmarks(directory.name, sizes, args.seed)
+    if args.compressed:
+        selected += compressed_benchmarks(directory.name, args.extra)
+    checks = list(CHECKS)
+    if args.filter:
+        selected = [b for b in selected if re.search(args.filter, b.name)]
+        checks = [c for c in checks if re.search(args.filter, c)]
+    if args.list:
+        for name in checks:
+            print(f'{name} (check)')
+        for b in selected:
+            print(b.name)
+        return 0
+
+    failures = check(checks)
+    for f in failures:
+        print(f'CHECK FAILED {f}', file=sys.stderr)
+    if failures:
+        return 1
+
+    results = {}
+    for b in selected:
+        print(f'{b.name} ...', file=sys.stderr, flush=True)
+        results[b.name] = b.measure(args.warmup, args.repeats)
+        results[b.name]['result'] = jsonable(results[b.name]['result'])
+
+    output = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold, args.floor)
+        for r in regressions:
+            print(f'REGRESSION {r}', file=sys.stderr)
+        if regressions:
+            return 1
+        print('No regressions found.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(getArgs()))
@@ -1,6 +1,33 @@
+import importlib
+
 from .graph import Vertex, Edge, Graph, timeit
-from .mst.abstractMst import MST
-from .mst.kruskal import Kruskal
-from .mst.prim import Prim
-from .tsp.abstractTSP import TSP
-from .tsp.nearestNeighbour import NearestNeighbour
+from .metrics import Metrics, metrics
+from .unionFind import UnionFind
+from .cache import LRUCache
+
+# Classes depending on NumPy or implementing algorithms are imported on first
+# access only, so importing the package for a plain graph stays fast.
+_LAZY = {
+    'CSR': '.csr',
+    'MST': '.mst.abstractMst',
+    'Kruskal': '.mst.kruskal',
+    'Prim': '.mst.prim',
+    'TSP': '.tsp.abstractTSP',
+    'DistanceMatrix': '.tsp.distanceMatrix',
+    'Tour': '.tsp.tour',
+    'NearestNeighbour': '.tsp.nearestNeighbour',
+    'GraphView': '.view',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY))
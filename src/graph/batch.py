@@ -0,0 +1,330 @@
+"""
+Run batches of jobs on graphs.
+
+A job runs a single algorithm on an input file, e.g. ``{"graph":
+"extra/mst/G_1_2.txt", "algorithm": "kruskal"}``. Jobs are grouped by their
+input, so every file is imported just once per representation (graph, distance
+matrix or flow network) and shared by all jobs on it. Algorithms changing the
+flow of a network get a copy of it instead of importing it again.
+
+Groups of jobs on different inputs are independent and can be run in parallel
+by a pool of processes.
+"""
+
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from .flow.cost_minimal.cycle_canceling import CycleCanceling
+from .flow.cost_minimal.successive_shortest_path import SuccessiveShortestPath
+from .flow.max.edmondsKarp import EdmondsKarp
+from .flow.max.gomoryHu import GomoryHu
+from .graph import Graph
+from .mst.kruskal import Kruskal
+from .mst.prim import Prim
+from .shortest_path.contractionHierarchy import ContractionHierarchy
+from .shortest_path.dijkstra import Dijkstra
+from .shortest_path.mooreBellmanFord import MooreBellmanFord
+from .tsp.branchAndBound import BranchAndBound
+from .tsp.bruteForce import BruteForce
+from .tsp.distanceMatrix import DistanceMatrix
+from .tsp.doubleTree import DoubleTree
+from .tsp.nearestNeighbour import NearestNeighbour
+
+
+def _load_graph(path: str, directed: bool) -> Graph:
+    graph = Graph(directed=directed)
+    graph.import_from_file(path)
+    return graph
+
+
+def _load_weighted(path: str, directed: bool) -> Graph:
+    loader = MooreBellmanFord()
+    loader.import_from_file(path, directed=directed)
+    return loader.graph
+
+
+def _load_hierarchy(path: str, directed: bool) -> ContractionHierarchy:
+    if path.endswith('.npz'):
+        return ContractionHierarchy.load(path)
+    hierarchy = ContractionHierarchy(_load_weighted(path, directed))
+    hierarchy.preprocess()
+    return hierarchy
+
+
+def _load_matrix(path: str, directed: bool) -> DistanceMatrix:
+    return DistanceMatrix.from_file(path)
+
+
+def _load_network(path: str, directed: bool):
+    loader = EdmondsKarp()
+    loader.import_from_file(path)
+    return loader.graph
+
+
+def _load_cut_tree(path: str, directed: bool) -> GomoryHu:
+    tree = GomoryHu()
+    tree.import_from_file(path)
+    tree()
+    return tree
+
+
+def _load_balanced(path: str, directed: bool):
+    loader = SuccessiveShortestPath()
+    loader.import_from_file(path)
+    return loader.graph
+
+
+# Functions to import an input file by the representation required by the
+# algorithms. Each gets the path and whether the graph is directed.
+LOADERS: dict[str, Callable[[str, bool], object]] = {
+    'graph': _load_graph,
+    'weighted': _load_weighted,
+    'hierarchy': _load_hierarchy,
+    'matrix': _load_matrix,
+    'network': _load_network,
+    'cut_tree': _load_cut_tree,
+    'balanced': _load_balanced,
+}
+
+
+def _value(vertex) -> Optional[int]:
+    """
+    Get the value of a vertex, which may be given as object or int.
+    """
+    return getattr(vertex, 'value', vertex)
+
+
+def _shortest_path(result: tuple) -> dict:
+    return {
+        'distance': result[0],
+        'predecessor': [_value(v) for v in result[1]],
+        'negative_cycle': len(result) > 2 and bool(result[2]),
+    }
+
+
+def _contraction_hierarchy(hierarchy: ContractionHierarchy, job: dict) -> dict:
+    return {
+        'distance': hierarchy(job['start'], job['target']),
+        'path': hierarchy.path(job['start'], job['target']),
+    }
+
+
+def _components(graph: Graph, job: dict):
+    return graph.count_components(job.get('frontier', False), job.get('strong', False),
+                                  job.get('backend', 'python'))
+
+
+def _edmonds_karp(graph, job: dict):
+    ek = EdmondsKarp(graph.copy())
+    ek(job['start'], job['target'], job.get('backend', 'python'))
+    if not job.get('cut', False):
+        return ek.flow
+    source_side, edges = ek.min_cut()
+    return {
+        'flow': ek.flow,
+        'source_side': sorted(source_side),
+        'cut': [[e.start.value, e.end.value] for e in edges],
+    }
+
+
+def _gomory_hu(tree: GomoryHu, job: dict):
+    if 'start' in job and 'target' in job:
+        return tree.min_cut_value(job['start'], job['target'])
+    return {'parent': tree.parent, 'capacity': tree.capacity}
+
+
+def _successive_shortest_path(graph, job: dict):
+    ssp = SuccessiveShortestPath(graph.copy())
+    result, _ = ssp(job.get('backend', 'python'))
+    return ssp.cost if result else None
+
+
+def _cycle_canceling(graph, job: dict):
+    cc = CycleCanceling(graph.copy())
+    return cc.cost if cc(job.get('backend', 'python')) else None
+
+
+# The algorithms available for jobs, by the representation of their input and
+# the function to run them. The functions get the imported input and the job
+# for additional arguments, and return a result, which can be serialized as
+# JSON.
+ALGORITHMS: dict[str, tuple[str, Callable[[object, dict], object]]] = {
+    'components': ('graph', _components),
+    'kruskal': ('weighted', lambda g, job: Kruskal(g)(job.get('backend', 'python'))),
+    'prim': ('weighted', lambda g, job: Prim(g)()),
+    'dijkstra': ('weighted', lambda g, job: _shortest_path(Dijkstra(g)(job['start'],
+                                                                       backend=job.get('backend', 'python')))),
+    'moore_bellman_ford': ('weighted', lambda g, job: _shortest_path(MooreBellmanFord(g)(
+        job['start'], backend=job.get('backend', 'python')))),
+    'contraction_hierarchy': ('hierarchy', _contraction_hierarchy),
+    'nearest_neighbour': ('matrix', lambda m, job: NearestNeighbour(m)(job.get('start', 0),
+                                                                      job.get('multistart', False)).cost),
+    'double_tree': ('matrix', lambda m, job: DoubleTree(m)().cost),
+    'brute_force': ('matrix', lambda m, job: BruteForce(m)(job.get('start', 0)).cost),
+    'branch_and_bound': ('matrix', lambda m, job: BranchAndBound(m)().cost),
+    'edmonds_karp': ('network', _edmonds_karp),
+    'gomory_hu': ('cut_tree', _gomory_hu),
+    'successive_shortest_path': ('balanced', _successive_shortest_path),
+    'cycle_canceling': ('balanced', _cycle_canceling),
+}
+
+
+def parse_job(spec: str, graph: Optional[str] = None) -> dict:
+    """
+    Parse a job given on the command line.
+
+    The job is either a JSON object or the name of the algorithm, followed by
+    comma separated arguments, e.g. ``dijkstra,start=2,directed=true``. The
+    values of the arguments are parsed as JSON, if possible.
+
+
+    :param spec: The job's specification.
+    :param graph: The input file, if not given by the job.
+
+    :returns: The job.
+    """
+    if spec.lstrip().startswith('{'):
+        job = json.loads(spec)
+    else:
+        name, *args = spec.split(',')
+        job = {'algorithm': name}
+        for arg in args:
+            key, _, value = arg.partition('=')
+            try:
+                job[key] = json.loads(value)
+            except ValueError:
+                job[key] = value
+
+    if graph is not None:
+        job.setdefault('graph', graph)
+    _validate(job)
+    return job
+
+
+def read_jobs(input_file: TextIO, graph: Optional[str] = None) -> Iterator[dict]:
+    """
+    Read jobs from a file of JSON lines.
+
+    Each line holds a job as JSON object. Empty lines and lines starting with
+    ``#`` will be skipped.
+
+
+    :param input_file: The file object to read from.
+    :param graph: The input file for jobs not giving one.
+
+    :returns: Iterator over the jobs.
+    """
+    for line in input_file:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_job(line, graph)
+
+
+def _validate(job: dict) -> None:
+    """
+    Check a job for a known algorithm and input, before running any job.
+    """
+    if job.get('algorithm') not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{job.get('algorithm')}', "
+                         f"expected one of: {', '.join(ALGORITHMS)}")
+    if 'graph' not in job:
+        raise ValueError(f"No graph given for job '{job['algorithm']}'")
+    if not isinstance(job['graph'], str):
+        raise ValueError(f"The graph of job '{job['algorithm']}' must be a path, not {job['graph']!r}")
+
+
+def jsonable(value):
+    """
+    Convert results into values, which can be serialized as JSON.
+    """
+    if isinstance(value, float) and math.isinf(value):
+        return None
+    if isinstance(value, dict):
+        return {k: jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    return value
+
+
+def run_job(job: dict, inputs, version=None, id=None) -> dict:
+    """
+    Run a single job.
+
+    The input is taken from ``inputs``, a mapping of imported inputs by their
+    path, ``version``, representation and direction. If missing, it is
+    imported and stored for following jobs, reporting the time of the import
+    separately. Failing jobs report their error instead of a result.
+
+
+    :param job: The job to run.
+    :param inputs: Mapping of imported inputs, e.g. a dict or
+        :py:class:`.LRUCache`.
+    :param version: Version of the input file (e.g. its modification time), so
+        changed files are imported again.
+    :param id: The id reported for jobs without one.
+
+    :returns: The result of the job.
+    """
+    kind, run = ALGORITHMS[job['algorithm']]
+    directed = job.get('directed', False)
+    entry = {'id': job.get('id', id), 'graph': job['graph'], 'algorithm': job['algorithm']}
+    start = time.perf_counter_ns()
+    try:
+        key = (job['graph'], version, kind, directed)
+        if key not in inputs:
+            inputs[key] = LOADERS[kind](job['graph'], directed)
+            entry['load_ms'] = (time.perf_counter_ns() - start) / 1e6
+            start = time.perf_counter_ns()
+        entry['result'] = jsonable(run(inputs[key], job))
+    except Exception as e:
+        entry['error'] = f'{type(e).__name__}: {e}'
+    entry['time_ms'] = (time.perf_counter_ns() - start) / 1e6
+    return entry
+
+
+def run_group(jobs: list[tuple[int, dict]]) -> list[dict]:
+    """
+    Run jobs sharing their input.
+
+    Each representation of the input is imported on its first use and kept for
+    the following jobs. Failing jobs don't stop the remaining ones.
+
+
+    :param jobs: The jobs with their position in the batch.
+
+    :returns: The results of the jobs in their order.
+    """
+    inputs = {}
+    return [run_job(job, inputs, id=position) for position, job in jobs]
+
+
+def run_batch(jobs: Iterable[dict], workers: int = 1) -> Iterator[dict]:
+    """
+    Run a batch of jobs.
+
+    The jobs are grouped by their input file. Groups are run one after another
+    in the order of their first job, or by a pool of ``workers`` processes in
+    parallel. Results are yielded per group, as soon as all of its jobs are
+    finished.
+
+
+    :param jobs: The jobs to run.
+    :param workers: The number of processes to run groups in parallel.
+
+    :returns: Iterator over the results.
+    """
+    groups: dict[str, list[tuple[int, dict]]] = {}
+    for position, job in enumerate(jobs):
+        groups.setdefault(job['graph'], []).append((position, job))
+
+    if workers <= 1 or len(groups) <= 1:
+        for group in groups.values():
+            yield from run_group(group)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+        for results in pool.map(run_group, groups.values()):
+            yield from results
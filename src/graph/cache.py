@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Mapping of bounded size, evicting the least recently used entries.
+
+    Looking up or storing an entry marks it as most recently used. If the cache
+    exceeds its maximum size, the entries not used for the longest time are
+    removed. The size is the number of entries, or the sum of the entries'
+    sizes, if a function to measure them is given.
+    """
+
+    def __init__(self, maxsize: int = 8, size: Optional[Callable[[object], int]] = None):
+        """
+        Constructor.
+
+
+        :param maxsize: The maximum size of all entries kept.
+        :param size: Function to get the size of a value, e.g. to bound the
+            memory used. By default, each entry has a size of one.
+        """
+        self.maxsize = maxsize
+        self._size = size or (lambda value: 1)
+        self._entries: OrderedDict = OrderedDict()
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: Hashable):
+        value = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value) -> None:
+        if key in self._entries:
+            del self[key]
+        self._entries[key] = value
+        self.total += self._size(value)
+        while self.total > self.maxsize:
+            _, evicted = self._entries.popitem(last=False)
+            self.total -= self._size(evicted)
+
+    def __delitem__(self, key: Hashable) -> None:
+        self.total -= self._size(self._entries.pop(key))
+
+    def get(self, key: Hashable, default=None):
+        """
+        Get an entry, if cached.
+
+
+        :param key: The key of the entry.
+        :param default: The value returned, if the key is not cached.
+
+        :returns: The cached value or ``default``.
+        """
+        if key in self._entries:
+            return self[key]
+        return default
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+        self.total = 0
@@ -0,0 +1,321 @@
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class CSR:
+    """
+    Compressed sparse row (CSR) adjacency of a graph.
+
+    The edges of all vertexes are stored in flat arrays sorted by their start
+    vertex, so the edges starting at vertex ``v`` are found at the positions
+    ``indptr[v]`` to ``indptr[v + 1]`` of :py:attr:`indices` (the end vertexes)
+    and :py:attr:`weights`. As these arrays don't need any per-edge objects,
+    traversals can be vectorized with NumPy for large graphs.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        """
+        Constructor.
+
+
+        :param indptr: Offsets of the edges for every vertex.
+        :param indices: End vertex of every edge.
+        :param weights: Weight of every edge.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        :returns: The number of vertexes.
+        """
+        return len(self.indptr) - 1
+
+    @property
+    def edge_count(self) -> int:
+        """
+        :returns: The number of (directed) edges.
+        """
+        return len(self.indices)
+
+    @classmethod
+    def from_edges(cls,
+                   vertex_count: int,
+                   starts: np.ndarray,
+                   ends: np.ndarray,
+                   weights: Optional[np.ndarray] = None,
+                   directed: bool = True
+                   ) -> 'CSR':
+        """
+        Build the adjacency from arrays of edges in bulk.
+
+
+        :param vertex_count: The number of vertexes.
+        :param starts: The start vertex of every edge.
+        :param ends: The end vertex of every edge.
+        :param weights: The weight of every edge (0 if omitted).
+        :param directed: If false, the inverted edges will be added, too.
+
+        :returns: The CSR adjacency of the edges.
+        """
+        starts = np.asarray(starts, dtype=np.intp)
+        ends = np.asarray(ends, dtype=np.intp)
+        if weights is None:
+            weights = np.zeros(len(starts))
+        weights = np.asarray(weights, dtype=float)
+        if not directed:
+            starts, ends = np.concatenate((starts, ends)), np.concatenate((ends, starts))
+            weights = np.concatenate((weights, weights))
+
+        # Sort the edges by their start vertex. The sort is stable, so edges of
+        # the same vertex keep the order they have been passed in.
+        order = np.argsort(starts, kind='stable')
+        indptr = np.zeros(vertex_count + 1, dtype=np.intp)
+        np.cumsum(np.bincount(starts, minlength=vertex_count), out=indptr[1:])
+        return cls(indptr, ends[order], weights[order])
+
+    @classmethod
+    def from_graph(cls, graph, reverse: bool = False) -> 'CSR':
+        """
+        Build the adjacency of a :py:class:`.Graph`.
+
+
+        :param graph: The graph to convert.
+        :param reverse: Whether to invert the direction of all edges, e.g. to
+            get the incoming edges of every vertex for directed graphs.
+
+        :returns: The CSR adjacency of the graph.
+        """
+        starts = []
+        ends = []
+        weights = []
+        for x in graph.edges.values():
+            for e in x.values():
+                starts.append(e.start.value)
+                ends.append(e.end.value)
+                weights.append(e.weight)
+        if reverse:
+            starts, ends = ends, starts
+        return cls.from_edges(graph.vertex_count, starts, ends, weights)
+
+    def edge_starts(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Get the start vertex of edges.
+
+
+        :param positions: Positions of the edges in :py:attr:`indices`.
+
+        :returns: The start vertex of every edge.
+        """
+        return np.searchsorted(self.indptr, positions, side='right') - 1
+
+    def _levels(self,
+                start: int,
+                marked: np.ndarray,
+                parent: np.ndarray
+                ) -> Iterator[np.ndarray]:
+        """
+        Expand the levels of a breath-first-search (BFS) tree.
+
+        Instead of queuing single vertexes, a whole level of the BFS tree is
+        expanded at once: the edges of all vertexes in the frontier are gathered
+        with vectorized array operations and the unmarked end vertexes build the
+        next frontier.
+
+
+        :param start: The vertex to start from.
+        :param marked: Boolean array of vertexes already visited, which will be
+            updated in place.
+        :param parent: Array to store the position of the edge each vertex has
+            been discovered by, which will be updated in place.
+
+        :returns: Iterator over the vertexes of each level, starting with the
+            start vertex itself.
+        """
+        marked[start] = True
+        frontier = np.array([start], dtype=np.intp)
+        while frontier.size:
+            yield frontier
+
+            # Get the positions of all edges starting in the frontier. For each
+            # vertex, a range of its edges will be generated by repeating its
+            # first position and adding an increasing offset.
+            first = self.indptr[frontier]
+            count = self.indptr[frontier + 1] - first
+            total = int(count.sum())
+            if not total:
+                break
+            offset = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+            positions = np.repeat(first, count) + offset
+
+            # Keep just the edges to unmarked vertexes. If a vertex can be
+            # reached by multiple edges, only the first one will be used.
+            ends = self.indices[positions]
+            new = ~marked[ends]
+            frontier, index = np.unique(ends[new], return_index=True)
+            parent[frontier] = positions[new][index]
+            marked[frontier] = True
+
+    def bfs(self,
+            start: int,
+            needle: int = -1,
+            marked: Optional[np.ndarray] = None
+            ) -> np.ndarray:
+        """
+        Run a frontier based breath-first-search (BFS).
+
+        The levels of the BFS tree are expanded by vectorized operations over
+        the whole frontier (see :py:meth:`_levels`). Only a single parent edge
+        is recorded for each vertex discovered.
+
+
+        :param start: The vertex to start from.
+        :param needle: An optional vertex to stop the search at, as soon as it
+            has been discovered.
+        :param marked: An optional boolean array identifying the vertexes
+            already visited. It will be updated in place, so it can be shared
+            by subsequent searches.
+
+        :returns: The position of the edge each vertex has been discovered by,
+            or -1 for vertexes not discovered (and the start vertex).
+        """
+        if marked is None:
+            marked = np.zeros(self.vertex_count, dtype=bool)
+        parent = np.full(self.vertex_count, -1, dtype=np.intp)
+
+        for _ in self._levels(start, marked, parent):
+            if needle >= 0 and marked[needle]:
+                break
+
+        return parent
+
+    def path(self, parent: np.ndarray, needle: int) -> Optional[list[int]]:
+        """
+        Reconstruct the path to a vertex found by :py:meth:`bfs`.
+
+
+        :param parent: The parent edges returned by :py:meth:`bfs`.
+        :param needle: The vertex to get the path for.
+
+        :returns: The positions of the path's edges in order, or
+            :py:class:`None`, if ``needle`` has not been discovered or is the
+            start vertex itself.
+        """
+        if parent[needle] < 0:
+            return None
+        path = []
+        v = needle
+        while parent[v] >= 0:
+            path.append(int(parent[v]))
+            v = int(self.edge_starts(parent[v]))
+        path.reverse()
+        return path
+
+    def labels(self) -> np.ndarray:
+        """
+        Label the components reachable by frontier based searches.
+
+        Every vertex not labeled yet starts a new search and all vertexes
+        discovered by it get the same label. For undirected graphs (i.e. both
+        directions of an edge are present), these are its connected components.
+
+
+        :returns: The component label of every vertex, numbered from 0.
+        """
+        marked = np.zeros(self.vertex_count, dtype=bool)
+        parent = np.full(self.vertex_count, -1, dtype=np.intp)
+        labels = np.full(self.vertex_count, -1, dtype=np.intp)
+        components = 0
+        for v in range(self.vertex_count):
+            if marked[v]:
+                continue
+            for level in self._levels(v, marked, parent):
+                labels[level] = components
+            components += 1
+        return labels
+
+    def components(self) -> int:
+        """
+        Count the components by frontier based searches.
+
+
+        :returns: Number of components.
+        """
+        return int(self.labels().max(initial=-1)) + 1
+
+    def strongly_connected(self) -> np.ndarray:
+        """
+        Label the strongly connected components using Tarjan's algorithm.
+
+        The depth-first-search of Tarjan's algorithm is implemented iteratively
+        with an explicit stack of vertexes and their next edge position, so
+        large graphs don't hit Python's recursion limit.
+
+
+        :returns: The component label of every vertex, numbered from 0.
+        """
+        # Convert the arrays into lists, as accessing single python integers is
+        # much faster than indexing numpy arrays element by element.
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+
+        n = self.vertex_count
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        labels = [-1] * n
+        stack = []
+        counter = 0
+        components = 0
+
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [[root, indptr[root]]]
+
+            while work:
+                frame = work[-1]
+                v, pos = frame
+                if pos < indptr[v + 1]:
+                    # Follow the next edge of the vertex on top of the work
+                    # stack. Unvisited vertexes are descended into, while edges
+                    # to vertexes on the stack may lower the low-link.
+                    frame[1] += 1
+                    w = indices[pos]
+                    if index[w] < 0:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append([w, indptr[w]])
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+
+                # All edges of the vertex have been followed, so return to its
+                # parent and propagate the low-link. If the vertex is the root
+                # of a component, all vertexes above it on the stack belong to
+                # this component.
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        labels[w] = components
+                        if w == v:
+                            break
+                    components += 1
+
+        return np.array(labels, dtype=np.intp)
@@ -1,6 +1,11 @@
 import abc
+from typing import Optional
 
-from ..flow import Flow, BalanceVertex
+from ..flow import residual_graph, Flow, BalanceVertex
+from ...graph import bulk, timeit
+from ...metrics import metrics
+from ...shortest_path.mooreBellmanFord import MooreBellmanFord
+from ...stream import open_input
 
 
 class AbstractCostminFlow(abc.ABC):
@@ -8,6 +13,7 @@ class AbstractCostminFlow(abc.ABC):
         super().__init__()
         self.graph = graph or Flow()
 
+    @timeit
     def import_from_file(self, filepath):
         """
         Import the given file as weighted graph
@@ -15,7 +21,7 @@ class AbstractCostminFlow(abc.ABC):
         :param filepath: the path to the graph file
         :return: void
         """
-        with open(filepath, "r") as input_file:
+        with open_input(filepath) as input_file, bulk():
             self.graph = Flow(vertex_count=int(input_file.readline()))
             for i in range(self.graph.vertex_count):
                 self.graph.vertexes[i] = BalanceVertex(value=i, balance=float(input_file.readline()))
@@ -28,3 +34,244 @@ class AbstractCostminFlow(abc.ABC):
         """
         """
         pass
+
+    @timeit
+    def reoptimize(self,
+                   flow: Flow,
+                   costs: Optional[dict[tuple[int, int], float]] = None,
+                   capacities: Optional[dict[tuple[int, int], float]] = None,
+                   balances: Optional[dict[int, float]] = None,
+                   backend: str = 'python'
+                   ) -> Optional[Flow]:
+        """
+        Re-optimize a cost minimal flow after small changes of its network.
+
+        Instead of solving from scratch, the previous optimal flow is repaired
+        locally: flows exceeding a reduced capacity are cut down to it, and
+        negative cycles (only possible after changing costs or increasing
+        capacities) are canceled. The remaining differences to the balances
+        are augmented along shortest paths of the residual network, just like
+        :py:class:`.SuccessiveShortestPath` does. As the previous flow is
+        optimal for all unchanged parts, just a few cycles and augmentations
+        are needed for a few changes.
+
+        The flow is changed in place, so copy it before to keep the previous
+        one.
+
+
+        :param flow: The previous cost minimal flow, e.g. the result of
+            :py:class:`.SuccessiveShortestPath` or :py:class:`.CycleCanceling`.
+        :param costs: The new cost of changed edges by start and end vertex.
+        :param capacities: The new capacity of changed edges by start and end
+            vertex.
+        :param balances: The new balance of changed vertexes.
+        :param backend: The backend of :py:class:`.MooreBellmanFord`,
+            ``numpy`` for vectorized rounds.
+
+        :returns: The cost minimal flow for the changed network, or
+            :py:class:`None`, if no b-flow exists.
+
+        :raises ValueError: A changed edge is not part of the flow.
+        """
+        self.graph = flow
+
+        # Apply the changes. Changing balances or reducing capacities keeps all
+        # cycles of the residual network non-negative, so cycles need to be
+        # canceled just after changing costs or increasing capacities.
+        cycles = False
+        for (s, e), weight in (costs or {}).items():
+            edge = self._edge(s, e)
+            cycles |= weight != edge.weight
+            edge.weight = weight
+        for (s, e), capacity in (capacities or {}).items():
+            edge = self._edge(s, e)
+            cycles |= capacity > edge.capacity
+            edge.capacity = capacity
+            edge.flow = min(edge.flow, capacity)
+        for value, balance in (balances or {}).items():
+            flow.vertexes[value].balance = balance
+
+        if sum(v.balance for v in flow.vertexes.values()) != 0:
+            print("The sinks require more units then the sources can provide.")
+            return None
+        if cycles:
+            self._cancel_cycles(backend)
+        if not self._augment(backend):
+            return None
+        self.cost = flow.cost
+        return flow
+
+    def _edge(self, start: int, end: int):
+        try:
+            return self.graph.edges[start][end]
+        except KeyError:
+            raise ValueError(f'There is no edge {start} -> {end} in the flow.') from None
+
+    def _cancel_cycles(self, backend: str = 'python') -> None:
+        """
+        Cancel negative cycles of the residual network of :py:attr:`graph`
+        until there are none left. The balances of the vertexes are kept, so
+        this works for flows not being b-flows (yet), too.
+
+
+        :param backend: The backend of :py:class:`.MooreBellmanFord`.
+        """
+        while True:
+            # Search from an additional vertex having an edge to all others, so
+            # cycles are found regardless of which vertexes reach them.
+            residual = residual_graph(self.graph)
+            source = residual.add_vertex(residual.vertex_count)
+            for value in list(residual.vertexes):
+                if value != source.value:
+                    residual.add_edge(source.value, value, capacity=0)
+            cycle_backend = backend
+            while True:
+                distance, predecessor, hist = MooreBellmanFord(residual)(source.value, cache=False,
+                                                                         backend=cycle_backend)
+                if not hist:
+                    return
+                v = self._cycle_vertex(residual, distance, predecessor)
+                if v is not None:
+                    break
+                if cycle_backend == 'python':
+                    raise RuntimeError('The predecessors of a negative cycle don\'t lead into it.')
+                # The predecessors of vectorized rounds don't need to close a
+                # cycle yet, while the ones of relaxing edges one by one do.
+                cycle_backend = 'python'
+
+            cycle = []
+            u = v
+            while True:
+                p = predecessor[u]
+                cycle.append(residual.edges[p][u])
+                u = p
+                if u == v:
+                    break
+
+            ymin = min(map(lambda e: e.capacity, cycle))
+            metrics.count('AbstractCostminFlow.cycles')
+            for pe in cycle:
+                if not pe.residual:
+                    self.graph.edges[pe.start.value][pe.end.value].flow += ymin
+                else:
+                    self.graph.edges[pe.end.value][pe.start.value].flow -= ymin
+
+    @staticmethod
+    def _cycle_vertex(residual: Flow, distance: list, predecessor: list) -> Optional[int]:
+        """
+        Get a vertex of a negative cycle found by :py:class:`.MooreBellmanFord`.
+
+        An edge still improving a distance is relaxed once more. Following the
+        predecessors from its end for ``n`` steps ends up in a cycle, which is
+        negative.
+
+
+        :param residual: The graph searched.
+        :param distance: The distances found.
+        :param predecessor: The predecessors found, updated in place.
+
+        :returns: The value of the vertex, or :py:class:`None`, if the
+            predecessors don't lead into a cycle.
+        """
+        e = next(e for x in residual.edges.values() for e in x.values()
+                 if distance[e.start.value] + e.weight < distance[e.end.value])
+        v = e.end.value
+        predecessor[v] = e.start.value
+        for _ in range(residual.vertex_count):
+            v = predecessor[v]
+            if v is None:
+                return None
+        return v
+
+    def _augment(self, backend: str = 'python') -> bool:
+        """
+        Augment the flow of :py:attr:`graph` along shortest paths of its
+        residual network, until it meets the balance of all vertexes. The
+        residual network must not have negative cycles.
+
+
+        :param backend: The backend of :py:class:`.MooreBellmanFord`.
+
+        :returns: Whether the flow is a b-flow now.
+        """
+        while True:
+            """
+            Step 1:
+            Determine Residual Graph
+            Choose s with b(s) - b'(s) > 0
+            Choose t that is reachable from s where b(t) - b'(t) < 0
+            """
+            # get residual graph
+            g_f = residual_graph(self.graph)
+            # calculate b' values
+            for edge in edge_list(g_f.edges):
+                if edge.residual:
+                    # only use residual edges and invert the behavior
+                    g_f.vertexes[edge.start].balance -= edge.capacity
+                    g_f.vertexes[edge.end].balance += edge.capacity
+            # retrieve all vertexes where b(v) - b'(v) > 0
+            s_vertexes = [v for v in g_f.vertexes.values() if self.graph.vertexes[v.value].balance - v.balance > 0]
+            # retrieve all vertexes where b(s) - b'(s) < 0
+            t_vertexes = [v for v in g_f.vertexes.values() if self.graph.vertexes[v.value].balance - v.balance < 0]
+            # Cancel if there are no start points anymore
+            if s_vertexes:
+                # Choose a source vertex
+                start = s_vertexes[0].value
+                # determine all possible shortest paths to the other vertexes
+                mbf = MooreBellmanFord(graph=g_f)
+                distances, predecessors, _ = mbf(start, cache=False, backend=backend)
+                # choose a sink vertex
+                end = None
+                for v in t_vertexes:
+                    # Choose a vertex from t_vertexes that is reachable from
+                    if distances[v.value] != float('Inf'):
+                        end = v
+                        break
+                if end is None:
+                    print(f"There is no s-t-Way from s {start} to any t in {t_vertexes}")
+                    return False
+                p = []
+                """
+                Step 2:
+                Determine a shortest s-t path within the residualgraph
+                """
+                curr = end.value
+                # determine the path by traversing all predecessors
+                while curr != start:
+                    p.append(g_f.get_edge(predecessors[curr], curr))
+                    curr = predecessors[curr]
+                ymin = min(min(map(lambda e: e.capacity, p)), (self.graph.vertexes[start].balance - g_f.vertexes[start].balance), abs(self.graph.vertexes[end].balance - g_f.vertexes[end].balance))
+                metrics.count('SuccessiveShortestPath.augmentations')
+                for pe in p:
+                    if not pe.residual:
+                        self.graph.edges[pe.start.value][pe.end.value].flow += ymin
+                    else:
+                        self.graph.edges[pe.end.value][pe.start.value].flow -= ymin
+                """
+                Break Condition:
+                if b(v)-b'(v) is 0 for every vertex we have our costminimal flow otherwise fail
+                """
+            elif t_vertexes:
+                # This case should never occur due to the first check within the initialisation
+                print("The sinks require more units then the sources can provide.")
+                return False
+            else:
+                # determine the overall balance
+                for v in g_f.vertexes.values():
+                    if self.graph.vertexes[v.value].balance - v.balance != 0:
+                        print("The balance b(v)-b'(v) isn't 0 for every vertex v.")
+                        return False
+                return True
+
+
+def edge_list(edge_dict: dict):
+    """
+    Transform the edge 2d dict into a list
+    :param edge_dict: The dictionary of all edges
+    :return: list of all edges
+    """
+    edge_list = []
+    for s in edge_dict.values():
+        if s:
+            edge_list.extend(s.values())
+    return edge_list
@@ -1,6 +1,7 @@
 from .abstractFlowCostmin import AbstractCostminFlow
 from ..flow import residual_graph, Flow, BalanceVertex, FlowEdge
 from ...graph import timeit
+from ...metrics import metrics
 from ..max.edmondsKarp import EdmondsKarp
 from ...shortest_path.mooreBellmanFord import MooreBellmanFord
 
@@ -11,10 +12,10 @@ class CycleCanceling(AbstractCostminFlow):
     """
     """
 
-    def __call__(self):
+    def __call__(self, backend: str = 'python'):
         """
         """
-        return self._cycle_canceling()
+        return self._cycle_canceling(backend)
 
     @staticmethod
     def __bFlow(flow: Flow) -> Optional[Flow]:
@@ -46,27 +47,53 @@ class CycleCanceling(AbstractCostminFlow):
             maxFlow.remove_vertex(maxFlow.vertex_count - 1)
             return maxFlow
 
-    def __negativeCycle(self, residual: Flow, start: int = 0) -> Optional[Flow]:
+    @staticmethod
+    def __historyVertex(negHist: list, predecessor: list, vertex_count: int) -> Optional[int]:
+        """
+        Search the first vertex to be in a negative cycle, starting from one
+        relaxed ``n`` relaxations before the last one.
+
+
+        :returns: The vertex, or :py:class:`None`, if its predecessors don't
+            lead into a cycle.
+        """
+        v = negHist[max(len(negHist) - 1 - vertex_count, 0)]
+        visited = [v]
+        while True:
+            v = predecessor[v]
+            if v is None:
+                return None
+            if v in visited:
+                return v
+            visited.append(v)
+
+    def __negativeCycle(self, residual: Flow, start: int = 0, backend: str = 'python') -> Optional[Flow]:
         """
         Find a negative cost cycle in `residual` graph.
 
 
         :param residual: The residual graph to be searched.
         :param start: At which node to start the search.
+        :param backend: The backend of :py:class:`.MooreBellmanFord`.
         """
-        (_, predecessor, negHist) = MooreBellmanFord(residual)(start)
+        (distance, predecessor, negHist) = MooreBellmanFord(residual)(start, cache=False, backend=backend)
         if not negHist:
             return
 
-        # If a negative cycle has been found, search for the first vertex to be
-        # in this cycle.
-        v = negHist[len(negHist) - 1 - residual.vertex_count]
-        visited = [v]
-        while True:
-            v = predecessor[v]
-            if v in visited:
-                break
-            visited.append(v)
+        # The history of vectorized rounds doesn't have an entry per
+        # relaxation, and their predecessors don't need to close a cycle yet.
+        # So the cycle is located by relaxing once more, falling back to
+        # relaxing edges one by one.
+        v = None
+        if backend == 'python':
+            v = self.__historyVertex(negHist, predecessor, residual.vertex_count)
+        if v is None:
+            v = self._cycle_vertex(residual, distance, predecessor)
+        if v is None:
+            (distance, predecessor, _) = MooreBellmanFord(residual)(start, cache=False)
+            v = self._cycle_vertex(residual, distance, predecessor)
+        if v is None:
+            raise RuntimeError('The predecessors of a negative cycle don\'t lead into it.')
 
         # Starting from the vertex found above, a complete iteration of edges in
         # this cycle will be yielded to be processed by other methods of this
@@ -80,10 +107,12 @@ class CycleCanceling(AbstractCostminFlow):
                 break
 
     @timeit
-    def _cycle_canceling(self) -> Optional[Flow]:
+    def _cycle_canceling(self, backend: str = 'python') -> Optional[Flow]:
         """
         :param int start: The start of our flow
         :param int target: The end of our flow
+        :param str backend: The backend of :py:class:`.MooreBellmanFord`
+            searching negative cycles, ``numpy`` for vectorized rounds.
 
         :return The maximum flow
         """
@@ -100,17 +129,18 @@ class CycleCanceling(AbstractCostminFlow):
             # Step 3: Get a cycle with negative cost inside the residual graph.
             #         If none can be found, the loop will be exited, as there
             #         are no further optimizations possible.
-            c = list(self.__negativeCycle(residual_graph(flow)))
+            c = list(self.__negativeCycle(residual_graph(flow), backend=backend))
             if not c:
                 break
 
             # Step 4: Update flow along cycle c with its minimum capacity.
             ymin = min(map(lambda e: e.capacity, c))
+            metrics.count('CycleCanceling.cycles')
             for pe in c:
                 if not pe.residual:
-                    flow.edges[pe.start][pe.end].flow += ymin
+                    flow.edges[pe.start.value][pe.end.value].flow += ymin
                 else:
-                    flow.edges[pe.end][pe.start].flow -= ymin
+                    flow.edges[pe.end.value][pe.start.value].flow -= ymin
 
         self.cost = sum(map(lambda e: e.weight * e.flow, flow._flatten_edges()))
         return flow
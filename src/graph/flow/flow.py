@@ -1,14 +1,22 @@
 # flow class
-from graph import Graph, Edge, Vertex
+from collections import deque
+from typing import Iterator, Optional
+
+from graph import Graph, Edge, Vertex, timeit
+from graph.graph import _versions
 
 
 class BalanceVertex(Vertex):
-    def __init__(self, value: int, balance=0, edges=None):
-        super(BalanceVertex, self).__init__(value=value, edges=edges)
+    __slots__ = ('balance',)
+
+    def __init__(self, value: int, balance=0, edges=None, in_edges=None):
+        super(BalanceVertex, self).__init__(value=value, edges=edges, in_edges=in_edges)
         self.balance = balance
 
 
 class FlowEdge(Edge):
+    __slots__ = ('flow', 'capacity', 'residual')
+
     def __init__(self, start: Vertex, end: Vertex, capacity: int, flow=0, weight=0, residual=False):
         super(FlowEdge, self).__init__(start, end, weight)
         self.flow = flow
@@ -37,6 +45,9 @@ class Flow(Graph):
             self.vertexes[value] = v = BalanceVertex(value)
             self.edges[value] = {}
             self.vertex_count += 1
+            if self.connectivity is not None:
+                self.connectivity.grow(self.vertex_count)
+            self.version = next(_versions)
         return v
 
     def remove_vertex(self, value: int):
@@ -44,15 +55,21 @@ class Flow(Graph):
         Remove a vertex from flow.
         :param value: Which vertex to remove.
         """
-        del self.vertexes[value]
+        vertex = self.vertexes.pop(value)
         del self.edges[value]
+        for e in vertex.edges:
+            e.end.in_edges.discard(e)
         for v in self.vertexes.values():
             try:
-                v.edges.remove(self.edges[v][value])
-                del self.edges[v][value]
+                v.edges.remove(self.edges[v.value][value])
+                del self.edges[v.value][value]
             except KeyError:
                 pass
         self.vertex_count -= 1
+        # Components can't be split incrementally, so tracking them needs to be
+        # started from scratch.
+        self.connectivity = None
+        self.version = next(_versions)
 
     def add_existing_edge(self, edge: FlowEdge):
         """
@@ -86,15 +103,67 @@ class Flow(Graph):
         # for optimized performance and avoid iterating over all vertexes.
         edge = FlowEdge(start_v, end_v, weight=weight,
                         capacity=capacity, flow=flow, residual=residual)
-        self.edges[start_v][end_v] = edge
+        self.edges[start_v.value][end_v.value] = edge
 
-        # Add the edge to its start vertex
+        # Add the edge to its start vertex and as incoming edge to its end
+        # vertex.
         start_v.add_edge(edge)
+        end_v.add_in_edge(edge)
+
+        if self.connectivity is not None:
+            self.connectivity.union(start_v.value, end_v.value)
+        self.version = next(_versions)
+
+    def copy(self) -> 'Flow':
+        """
+        Copy the flow with new vertexes and edges.
+
+        Algorithms change the flow of the edges (and may add temporary
+        vertexes), so a copy allows running several of them on a graph imported
+        just once.
+
+        :return: The copied flow.
+        """
+        flow = Flow(weighted=self.weighted)
+        for value, vertex in self.vertexes.items():
+            flow.vertexes[value] = BalanceVertex(value, balance=getattr(vertex, 'balance', 0))
+            flow.edges[value] = {}
+        flow.vertex_count = self.vertex_count
+        for e in self._flatten_edges():
+            flow.add_edge(e.start.value, e.end.value, e.capacity, e.flow, e.weight, e.residual)
+        return flow
+
+    def to_sparse(self, values: str = 'capacity', format: str = 'csr'):
+        """
+        Export this flow as SciPy sparse matrix, see :py:func:`.to_sparse`.
+
+        :param values: The attribute of the edges used for the entries, e.g.
+            ``capacity``, ``flow`` or ``weight``.
+        :param format: The format of the matrix, e.g. ``csr`` or ``coo``.
+        :return: The sparse matrix of this flow.
+        :raises ImportError: SciPy is not installed.
+        """
+        return super().to_sparse(values, format)
+
+    @classmethod
+    def from_sparse(cls, capacities, weights=None, balances=None) -> 'Flow':
+        """
+        Import a flow network from sparse matrices, see
+        :py:func:`.flow_from_sparse`.
+
+        :param capacities: The capacity of every edge.
+        :param weights: The cost of every edge.
+        :param balances: The balance of every vertex.
+        :return: The flow network with zero flow.
+        :raises ImportError: SciPy is not installed.
+        """
+        from ..sparse import flow_from_sparse
+
+        return flow_from_sparse(capacities, weights, balances)
 
     def _flatten_edges(self):
-        for s in self.edges:
-            for e in self.edges[s]:
-                yield self.edges[s][e]
+        for edges in self.edges.values():
+            yield from edges.values()
 
     def __str__(self):
         flow = list(filter(lambda e: e.flow > 0, self._flatten_edges()))
@@ -108,16 +177,130 @@ class Flow(Graph):
         return sum(map(lambda e: e.weight * e.flow, self._flatten_edges()))
 
 
+@timeit
 def residual_graph(graph: Flow):
     g_f = Flow(vertex_count=graph.vertex_count)
     for v in graph.vertexes.values():
         for e in v.edges:
             # residual capacity
             if e.flow > 0:
-                g_f.add_edge(e.end, e.start, capacity=e.flow, weight=-e.weight, residual=True)
+                g_f.add_edge(e.end.value, e.start.value, capacity=e.flow, weight=-e.weight, residual=True)
             # remaining capacity
             u = e.capacity - e.flow
             if u > 0:
-                g_f.add_edge(e.start, e.end, capacity=u, weight=e.weight)
+                g_f.add_edge(e.start.value, e.end.value, capacity=u, weight=e.weight)
 
     return g_f
+
+
+class ResidualView:
+    """
+    Residual network of a flow, derived from its edges while traversing.
+
+    Every edge with remaining capacity is an arc of the residual network in its
+    direction and every edge with flow an arc in opposite direction. Instead
+    of creating a new graph for these arcs like :py:func:`residual_graph`, the
+    arcs are given as the flow's edge and their direction. Changes of the flow
+    are seen immediately, and antiparallel edges keep separate arcs, as arcs
+    aren't identified by their vertexes.
+
+    Forward arcs into a source and out of a sink can be omitted, so paths never
+    add flow entering the source or leaving the sink, e.g. when pushing flow
+    back to them.
+    """
+
+    def __init__(self, flow: Flow, source: Optional[int] = None, sink: Optional[int] = None):
+        """
+        Constructor.
+
+
+        :param flow: The flow to view.
+        :param source: The vertex, whose incoming edges don't get forward arcs.
+        :param sink: The vertex, whose outgoing edges don't get forward arcs.
+        """
+        self.flow = flow
+        self.source = source
+        self.sink = sink
+
+    @staticmethod
+    def capacity(edge: FlowEdge, forward: bool) -> float:
+        """
+        Get the residual capacity of an arc.
+
+
+        :param edge: The edge of the arc.
+        :param forward: Whether the arc has the direction of ``edge``.
+
+        :returns: The capacity of the arc.
+        """
+        return edge.capacity - edge.flow if forward else edge.flow
+
+    def arcs(self, vertex: Vertex) -> Iterator[tuple[FlowEdge, bool]]:
+        """
+        Get the arcs starting at a vertex.
+
+
+        :param vertex: The vertex to get the arcs of.
+
+        :returns: Iterator over the arcs as edge and direction.
+        """
+        if vertex.value != self.sink:
+            for e in vertex.edges:
+                if e.capacity - e.flow > 0 and e.end.value != self.source:
+                    yield e, True
+        for e in vertex.in_edges:
+            if e.flow > 0:
+                yield e, False
+
+    def bfs(self,
+            start: int,
+            target: int,
+            marked: Optional[set[int]] = None
+            ) -> Optional[list[tuple[FlowEdge, bool]]]:
+        """
+        Search the shortest path (by number of arcs) of the residual network.
+
+
+        :param start: The value of the vertex to start at.
+        :param target: The value of the vertex to search.
+        :param marked: An optional set to get the values of the vertexes
+            reached from ``start``.
+
+        :returns: The arcs of the path as edge and direction, or
+            :py:class:`None`, if ``target`` can't be reached.
+        """
+        if marked is None:
+            marked = set()
+        parent: dict[int, tuple[FlowEdge, bool]] = {}
+
+        marked.add(start)
+        queue = deque([self.flow.vertexes[start]])
+        while queue:
+            vertex = queue.popleft()
+            # The arcs are checked inline instead of using arcs(), as this is
+            # the hot path of Edmonds-Karp.
+            if vertex.value != self.sink:
+                for e in vertex.edges:
+                    if e.end.value not in marked and e.capacity - e.flow > 0 and e.end.value != self.source:
+                        marked.add(e.end.value)
+                        parent[e.end.value] = (e, True)
+                        queue.append(e.end)
+            for e in vertex.in_edges:
+                if e.start.value not in marked and e.flow > 0:
+                    marked.add(e.start.value)
+                    parent[e.start.value] = (e, False)
+                    queue.append(e.start)
+            if target in marked:
+                break
+        else:
+            return None
+
+        # Follow the parent arcs back from the target to the start.
+        path = []
+        value = target
+        while value != start:
+            e, forward = parent[value]
+            path.append((e, forward))
+            value = e.start.value if forward else e.end.value
+        path.reverse()
+        return path
@@ -1,14 +1,22 @@
 import abc
+from typing import Optional
 
-from graph.flow.flow import Flow
-from graph.graph import Vertex
+from graph.flow.flow import Flow, FlowEdge
+from graph.graph import Vertex, bulk, timeit
+from graph.stream import open_input
 
 
 class AbstractMaxFlow(abc.ABC):
     def __init__(self, graph=None):
         super().__init__()
         self.graph = graph or Flow()
+        # The vertexes of the last maximum flow determined.
+        self.start = self.target = None
+        # The vertexes reachable from the start in the final residual network,
+        # which are the source side of the minimum cut.
+        self.source_side: Optional[set[int]] = None
 
+    @timeit
     def import_from_file(self, filepath):
         """
         Import the given file as weighted graph
@@ -16,7 +24,7 @@ class AbstractMaxFlow(abc.ABC):
         :param filepath: the path to the graph file
         :return: void
         """
-        with open(filepath, "r") as input_file:
+        with open_input(filepath) as input_file, bulk():
             self.graph = Flow(vertex_count=int(input_file.readline()))
             for i in range(self.graph.vertex_count):
                 self.graph.vertexes[i] = Vertex(value=i)
@@ -29,3 +37,26 @@ class AbstractMaxFlow(abc.ABC):
         """
         """
         pass
+
+    def min_cut(self) -> tuple[set[int], list[FlowEdge]]:
+        """
+        Get the minimum cut of the last maximum flow determined.
+
+        The source side consists of the vertexes reachable from the start in
+        the residual network of the maximum flow, which are marked by the
+        search that detected the termination anyway. Just the edges of these
+        vertexes are checked for the cut, instead of traversing the network
+        again.
+
+
+        :returns: The values of the vertexes on the source side and the edges
+            leaving it. The capacity of these edges sums up to the value of
+            the maximum flow.
+
+        :raises ValueError: The maximum flow hasn't been determined yet.
+        """
+        if self.source_side is None:
+            raise ValueError('The maximum flow must be determined before getting the cut.')
+        edges = [e for value in self.source_side for e in self.graph.vertexes[value].edges
+                 if e.end.value not in self.source_side]
+        return set(self.source_side), edges
@@ -1,18 +1,63 @@
+from typing import Optional
+
 from graph.graph import timeit
+from graph.metrics import metrics
 
 from .abstractFlowMax import AbstractMaxFlow
-from ..flow import residual_graph
+from ..flow import ResidualView
 
 
 class EdmondsKarp(AbstractMaxFlow):
     """
     """
 
-    def __call__(self, start, target):
+    def __call__(self, start, target, backend: str = 'python'):
         """
         """
+        if backend != 'python':
+            from graph.sparse import check_backend
+
+            check_backend(backend)
+            return self._edmondsKarp_scipy(start, target)
         return self._edmondsKarp(start, target)
 
+    @timeit
+    def _edmondsKarp_scipy(self, start, target):
+        """
+        Get the maximum flow by :py:func:`scipy.sparse.csgraph.maximum_flow`,
+        e.g. to compare results and runtime. The flow of the edges is replaced
+        by the flow found.
+
+        :param int start: The start of our flow
+        :param int target: The end of our flow
+        :return The maximum flow
+        :raises ValueError: Capacities are not integers, which SciPy requires.
+        """
+        import numpy as np
+
+        from graph.sparse import csgraph
+
+        capacities = self.graph.to_sparse('capacity')
+        if not np.array_equal(capacities.data, np.round(capacities.data)):
+            raise ValueError('The scipy backend supports integer capacities only.')
+        result = csgraph().maximum_flow(capacities.astype(np.int32), start, target, method='edmonds_karp')
+
+        # SciPy returns the net flow between every pair of vertexes, which is
+        # negative against the direction of the flow. For antiparallel edges,
+        # just the one in direction of the net flow carries it.
+        net = result.flow.tocoo()
+        flows = dict(zip(zip(net.row.tolist(), net.col.tolist()), net.data.tolist()))
+        for e in self.graph._flatten_edges():
+            e.flow = max(flows.get((e.start.value, e.end.value), 0), 0)
+
+        self.start, self.target = start, target
+        self.flow = float(result.flow_value)
+        # SciPy doesn't return its residual network, so the source side of the
+        # minimum cut needs a search of its own.
+        self.source_side = set()
+        ResidualView(self.graph).bfs(start, target, self.source_side)
+        return self.graph
+
     @timeit
     def _edmondsKarp(self, start, target):
         """
@@ -20,24 +65,121 @@ class EdmondsKarp(AbstractMaxFlow):
         :param int target: The end of our flow
         :return The maximum flow
         """
-        while True:
-            # Step 2: Get residual graph for current flow graph.
-            g_f = residual_graph(self.graph)
-            # Step 3: Get shortest path (number of edges) from start to target.
-            #         If no path could be found, the algorithm hits its end and
-            #         finishes.
-            p = self.graph.bfs(g_f.vertexes.get(target),
-                               g_f.vertexes.get(start))
+        self.start, self.target = start, target
+        # The residual network is traversed by a view of the flow, so it
+        # doesn't need to be built again after every augmentation. The last
+        # search, failing to reach the target, marks the source side of the
+        # minimum cut.
+        self.source_side = set()
+        self._push(ResidualView(self.graph, start, target), start, target, cut=self.source_side)
+
+        self.flow = self._value()
+        return self.graph
+
+    def _value(self) -> float:
+        """
+        :returns: The value of the flow, which is the flow leaving the start
+            minus the flow entering it.
+        """
+        vertex = self.graph.vertexes[self.start]
+        return sum(e.flow for e in vertex.edges) - sum(e.flow for e in vertex.in_edges)
+
+    @staticmethod
+    def _push(g_f: ResidualView,
+              start: int,
+              target: int,
+              amount: float = float('inf'),
+              cut: Optional[set[int]] = None
+              ) -> float:
+        """
+        Push flow along shortest paths of the residual network.
+
+
+        :param g_f: The residual network of the flow.
+        :param start: The vertex to push the flow from.
+        :param target: The vertex to push the flow to.
+        :param amount: The maximum amount of flow to push, by default as much
+            as possible.
+        :param cut: An optional set to get the vertexes reached by the last
+            search, if it fails to reach ``target``.
+
+        :returns: The amount of flow pushed.
+        """
+        pushed = 0
+        while pushed < amount:
+            # Step 2+3: Get shortest path (number of arcs) from start to target
+            #           in the residual network of the current flow. If no path
+            #           could be found, the algorithm hits its end and
+            #           finishes.
+            reached = set()
+            p = g_f.bfs(start, target, reached)
             if not p:
+                if cut is not None:
+                    cut.update(reached)
                 break
 
-            # Step 4: Update flow along path p with its minimum capacity.
-            ymin = min(map(lambda e: e.capacity, p))
-            for pe in p:
-                if not pe.residual:
-                    self.graph.edges[pe.start][pe.end].flow += ymin
-                else:
-                    self.graph.edges[pe.end][pe.start].flow -= ymin
+            # Step 4: Update flow along path p with its minimum capacity. Arcs
+            #         against the direction of their edge reduce its flow.
+            ymin = min(min(g_f.capacity(e, forward) for e, forward in p), amount - pushed)
+            metrics.count('EdmondsKarp.augmentations')
+            for e, forward in p:
+                e.flow += ymin if forward else -ymin
+            pushed += ymin
+        return pushed
 
-        self.flow = sum(map(lambda e: e.flow, self.graph.vertexes[start].edges))
-        return self.graph
+    @timeit
+    def update_capacity(self, start_vertex: int, end_vertex: int, capacity: float) -> float:
+        """
+        Change the capacity of an edge and update the maximum flow found by the
+        last call, keeping the current flow.
+
+        If the capacity is increased, further flow is augmented starting from
+        the current flow. If it is decreased below the flow of the edge, the
+        excess is rerouted around the edge or, as far as this isn't possible,
+        pushed back to the start and the lacking flow pulled back from the
+        target. Each augmenting path moves at least a unit of flow for integer
+        capacities, so the cost is proportional to the change instead of a
+        full solve.
+
+
+        :param start_vertex: The start vertex of the edge.
+        :param end_vertex: The end vertex of the edge.
+        :param capacity: The new capacity of the edge.
+
+        :returns: The new value of the maximum flow.
+
+        :raises ValueError: The maximum flow hasn't been determined yet, the
+            edge doesn't exist or the capacity is negative.
+        """
+        if self.start is None:
+            raise ValueError('The maximum flow must be determined before updating capacities.')
+        try:
+            edge = self.graph.edges[start_vertex][end_vertex]
+        except KeyError:
+            raise ValueError(f'There is no edge {start_vertex} -> {end_vertex} in the flow.') from None
+        if capacity < 0:
+            raise ValueError(f'The capacity must not be negative, but is {capacity}.')
+
+        # Paths must not add flow entering the start or leaving the target,
+        # e.g. on cycles through them while pushing the excess back.
+        g_f = ResidualView(self.graph, self.start, self.target)
+        excess = edge.flow - capacity
+        edge.capacity = capacity
+        if excess > 0:
+            # Cut the flow down to the capacity, which leaves an excess at the
+            # start vertex of the edge and a lack at its end vertex. Both are
+            # balanced along residual paths, preferably between the two of
+            # them, so the value of the flow doesn't change.
+            edge.flow = capacity
+            excess -= self._push(g_f, start_vertex, end_vertex, excess)
+            if excess > 0 and start_vertex != self.start:
+                self._push(g_f, start_vertex, self.start, excess)
+            if excess > 0 and end_vertex != self.target:
+                self._push(g_f, self.target, end_vertex, excess)
+
+        # Augment along any paths the change opened, e.g. by an increased
+        # capacity.
+        self.source_side = set()
+        self._push(g_f, self.start, self.target, cut=self.source_side)
+        self.flow = self._value()
+        return self.flow
@@ -0,0 +1,254 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from graph.flow.flow import Flow
+from graph.graph import Vertex, bulk, timeit
+from graph.metrics import metrics
+from graph.stream import open_input
+
+from .abstractFlowMax import AbstractMaxFlow
+from .edmondsKarp import EdmondsKarp
+
+# The network of the process running the maximum flows of a pool.
+_network: Optional[Flow] = None
+
+
+def _init_worker(vertex_count: int, edges: list[tuple[int, int, float]]) -> None:
+    """
+    Initialize a process of the pool with its own copy of the network.
+    """
+    global _network
+
+    with bulk():
+        _network = Flow(vertex_count=vertex_count)
+        for s, e, capacity in edges:
+            _network.add_edge(s, e, capacity)
+
+
+def _min_cut(network: Flow, start: int, target: int) -> tuple[float, list[int]]:
+    """
+    Get a minimum cut between two vertexes of a network.
+
+
+    :param network: The network, whose flow is reset.
+    :param start: The vertex on the source side.
+    :param target: The vertex on the other side.
+
+    :returns: The value of the cut and the vertexes on the source side.
+    """
+    for e in network._flatten_edges():
+        e.flow = 0
+    ek = EdmondsKarp(network)
+    ek(start, target)
+    return ek.flow, sorted(ek.source_side)
+
+
+def _worker_min_cut(start: int, target: int) -> tuple[float, list[int]]:
+    return _min_cut(_network, start, target)
+
+
+class GomoryHu(AbstractMaxFlow):
+    """
+    Gomory-Hu tree of an undirected capacity network.
+
+    The minimum cut between any two vertexes is the minimum capacity on the
+    path between them in the tree. Besides, removing an edge of the tree
+    splits the vertexes into a minimum cut between its two vertexes. The tree
+    is built by Gusfield's algorithm: vertex ``s`` is cut from its current
+    parent ``p[s]`` by a maximum flow, and all vertexes on its side having the
+    same parent are moved below it. If the parent of ``p[s]`` is on the side
+    of ``s``, too, ``s`` takes the place of ``p[s]`` in the tree. So just
+    ``n - 1`` maximum flows are needed for all pairs, instead of one per pair.
+
+    The maximum flow of ``s`` depends on the parent assigned by the previous
+    ones. With a pool of processes, the flows of the next vertexes are
+    started speculatively with their current parent and recomputed just if
+    the parent changed meanwhile, which gets rare as the tree takes shape.
+    """
+
+    def __init__(self, graph=None):
+        super().__init__(graph)
+        self.parent: list[int] = []
+        self.capacity: list[float] = []
+        self._up: list[list[int]] = []
+        self._min: list[list[float]] = []
+        self._depth: list[int] = []
+
+    @timeit
+    def import_from_file(self, filepath):
+        """
+        Import the given file as undirected capacity network. Every edge can be
+        used in both directions with its full capacity.
+
+        :param filepath: the path to the graph file
+        :return: void
+        """
+        with open_input(filepath) as input_file, bulk():
+            self.graph = Flow(vertex_count=int(input_file.readline()))
+            for i in range(self.graph.vertex_count):
+                self.graph.vertexes[i] = Vertex(value=i)
+            for knot in input_file:
+                s, e, c = knot.split("\t")
+                self.add_edge(int(s), int(e), float(c.replace('\n', '')))
+
+    def add_edge(self, start: int, end: int, capacity: float) -> None:
+        """
+        Add an undirected edge as pair of antiparallel edges. The capacity of
+        parallel edges adds up.
+
+
+        :param start: One vertex of the edge.
+        :param end: The other vertex of the edge.
+        :param capacity: The capacity of the edge.
+        """
+        if start == end:
+            return
+        for s, e in ((start, end), (end, start)):
+            edge = self.graph.edges[s].get(e)
+            if edge is None:
+                self.graph.add_edge(s, e, capacity)
+            else:
+                edge.capacity += capacity
+
+    def __call__(self, workers: int = 1, window: Optional[int] = None):
+        """
+        Build the tree.
+
+
+        :param workers: The number of processes to run the maximum flows in
+            parallel, or 1 to run them one after another.
+        :param window: The number of maximum flows started ahead of the one
+            needed next (default: two per worker).
+
+        :returns: The parent and the capacity of the edge to it for every
+            vertex. The first vertex is the root.
+        """
+        return self._gomory_hu(workers, window or 2 * workers)
+
+    @timeit
+    def _gomory_hu(self, workers: int, window: int) -> tuple[list[int], list[float]]:
+        vertexes = sorted(self.graph.vertexes)
+        n = len(vertexes)
+        root = vertexes[0] if vertexes else 0
+        parent = {v: root for v in vertexes}
+        capacity = {v: float('inf') for v in vertexes}
+
+        pool = None
+        if workers > 1 and n > 2:
+            edges = [(e.start.value, e.end.value, e.capacity) for e in self.graph._flatten_edges()]
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.graph.vertex_count, edges))
+        pending: dict[int, tuple[int, Future]] = {}
+        ahead = 1
+        try:
+            for i in range(1, n):
+                s = vertexes[i]
+                if pool is not None:
+                    # Start the flows of the next vertexes with their current
+                    # parent, which is kept if no earlier cut moves them.
+                    while ahead < n and ahead <= i + window:
+                        v = vertexes[ahead]
+                        pending[v] = (parent[v], pool.submit(_worker_min_cut, v, parent[v]))
+                        ahead += 1
+                    t, future = pending.pop(s)
+                    if t != parent[s]:
+                        metrics.count('GomoryHu.speculation_misses')
+                        future.cancel()
+                        t, future = parent[s], pool.submit(_worker_min_cut, s, parent[s])
+                    value, side = future.result()
+                else:
+                    t = parent[s]
+                    value, side = _min_cut(self.graph, s, t)
+                metrics.count('GomoryHu.max_flows')
+
+                # Move all vertexes on the side of s, which are cut from the
+                # same parent, below s.
+                capacity[s] = value
+                for v in side:
+                    if v != s and parent[v] == t:
+                        parent[v] = s
+                # If the cut separates t from its own parent, too, s gets in
+                # between them, so the edge of t is still a minimum cut. The
+                # root is its own parent and never on the side of s.
+                if parent[t] in side:
+                    parent[s], parent[t] = parent[t], s
+                    capacity[s], capacity[t] = capacity[t], value
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            # The flow of the network is reset, as the last one found is just
+            # one of the cuts.
+            for e in self.graph._flatten_edges():
+                e.flow = 0
+
+        self.parent = [parent.get(v, v) for v in range(self.graph.vertex_count)]
+        self.capacity = [capacity.get(v, float('inf')) for v in range(self.graph.vertex_count)]
+        self._lift(root)
+        return self.parent, self.capacity
+
+    def _lift(self, root: int) -> None:
+        """
+        Build the tables of binary lifting, giving the ``2^k``-th ancestor of
+        every vertex and the minimum capacity on the path to it.
+        """
+        n = len(self.parent)
+        children: list[list[int]] = [[] for _ in range(n)]
+        for v in range(n):
+            if v != root and self.parent[v] != v:
+                children[self.parent[v]].append(v)
+
+        depth = [0] * n
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            for c in children[v]:
+                depth[c] = depth[v] + 1
+                stack.append(c)
+
+        self._depth = depth
+        self._up = [list(self.parent)]
+        self._min = [list(self.capacity)]
+        for k in range(1, max(1, max(depth, default=0).bit_length())):
+            up, low = self._up[k - 1], self._min[k - 1]
+            self._up.append([up[up[v]] for v in range(n)])
+            self._min.append([min(low[v], low[up[v]]) for v in range(n)])
+
+    def min_cut_value(self, start: int, target: int) -> float:
+        """
+        Get the value of the minimum cut between two vertexes, which is the
+        minimum capacity on their path in the tree.
+
+
+        :param start: One of the vertexes.
+        :param target: The other vertex.
+
+        :returns: The value of the minimum cut, which equals the maximum flow
+            between both vertexes.
+
+        :raises ValueError: The tree hasn't been built yet.
+        """
+        if not self._up:
+            raise ValueError('The tree must be built before querying cuts.')
+        if start == target:
+            return float('inf')
+
+        # Lift the deeper vertex to the depth of the other one first, then
+        # both of them up to below their lowest common ancestor.
+        result = float('inf')
+        if self._depth[start] < self._depth[target]:
+            start, target = target, start
+        diff = self._depth[start] - self._depth[target]
+        k = 0
+        while diff:
+            if diff & 1:
+                result = min(result, self._min[k][start])
+                start = self._up[k][start]
+            diff >>= 1
+            k += 1
+        if start == target:
+            return result
+        for k in reversed(range(len(self._up))):
+            if self._up[k][start] != self._up[k][target]:
+                result = min(result, self._min[k][start], self._min[k][target])
+                start, target = self._up[k][start], self._up[k][target]
+        return min(result, self._min[0][start], self._min[0][target])
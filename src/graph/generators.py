@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+
+"""
+Generators for synthetic graphs.
+
+All generators produce the edges of a graph in chunks of arrays, so large
+graphs can be written to disk by :py:func:`write_graph` without holding more
+than a single chunk of lines in memory. The output uses the same text formats
+as the files in ``extra/``, so it can be loaded by all algorithms of this
+package. Every generator is seeded and will produce the same graph for the
+same arguments.
+"""
+
+import argparse
+from typing import Iterator, Optional, TextIO
+
+import numpy as np
+
+from .stream import open_output
+
+# A chunk is a tuple of arrays, the first two being start and end vertexes and
+# all further ones additional columns like weight or capacity.
+Chunk = tuple[np.ndarray, ...]
+
+CHUNK_SIZE = 1 << 20
+
+
+def _pairs(codes: np.ndarray, directed: bool, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode the index of a vertex pair into start and end vertex.
+
+    For undirected graphs, the pairs ``u < v`` are numbered row by row of the
+    upper triangle of the adjacency matrix. For directed graphs, the pairs
+    ``u != v`` are numbered row by row, skipping the diagonal.
+    """
+    if directed:
+        u = codes // (n - 1)
+        v = codes % (n - 1)
+        return u, v + (v >= u)
+
+    # Invert the triangular numbers, numbering the pairs by their end vertex
+    # (code = v * (v - 1) / 2 + u). The floating point root may be off by one
+    # for large codes, which will be corrected afterwards.
+    v = ((np.sqrt(8 * codes.astype(np.float64) + 1) + 1) // 2).astype(np.int64)
+    v -= (v * (v - 1) // 2) > codes
+    v += ((v + 1) * v // 2) <= codes
+    return codes - v * (v - 1) // 2, v
+
+
+def random_graph(n: int,
+                 m: int,
+                 seed: int = 0,
+                 directed: bool = False,
+                 weights: Optional[tuple[float, float]] = (1.0, 100.0),
+                 chunk_size: int = CHUNK_SIZE
+                 ) -> Iterator[Chunk]:
+    """
+    Generate a uniform random graph G(n, m).
+
+    Exactly ``m`` distinct edges are drawn without loops, and just a chunk of
+    them is held in memory at once. For more than ``10^9`` vertex pairs, the
+    edges are distributed over ranges of pairs by binomial draws, which is
+    close to, but not exactly uniform.
+
+
+    :param n: The number of vertexes.
+    :param m: The number of edges.
+    :param seed: The seed of the random generator.
+    :param directed: Whether to draw directed edges.
+    :param weights: Range to draw uniform weights from, or :py:class:`None` for
+        unweighted graphs.
+    :param chunk_size: The number of edges per chunk.
+
+    :returns: Iterator over the chunks of edges.
+    """
+    pairs = n * (n - 1) if directed else n * (n - 1) // 2
+    if m > pairs:
+        raise ValueError(f'A graph with {n} vertexes has at most {pairs} edges.')
+
+    rng = np.random.default_rng(seed)
+    for codes in _sample(pairs, m, rng, chunk_size):
+        u, v = _pairs(codes, directed, n)
+        if weights is None:
+            yield u, v
+        else:
+            yield u, v, rng.uniform(*weights, size=len(u)).round(4)
+
+
+# Ranges of at least this many pairs are split by a binomial instead of a
+# hypergeometric draw, which NumPy doesn't support for them.
+MAX_HYPERGEOMETRIC = 10 ** 9
+
+
+def _sample(population: int, k: int, rng, chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Draw ``k`` distinct codes out of ``range(population)`` in chunks.
+
+    The range is split into halves recursively, drawing how many of the codes
+    fall into each half, until a range is small enough to draw its codes
+    directly. So just about a chunk of codes is held in memory, and the chunks
+    come in ascending ranges of codes.
+    """
+    buffer: list[np.ndarray] = []
+    buffered = 0
+    stack = [(0, population, k)]
+    while stack:
+        lo, size, count = stack.pop()
+        if not count:
+            continue
+        # Drawing without replacement holds a permutation of the range, unless
+        # it is at least 50 times larger than the count.
+        if count <= chunk_size and (size <= chunk_size or size // 50 >= count):
+            buffer.append(lo + rng.choice(size, size=count, replace=False))
+            buffered += count
+            if buffered >= chunk_size:
+                codes = np.concatenate(buffer)
+                yield from np.split(codes, range(chunk_size, len(codes), chunk_size))
+                buffer, buffered = [], 0
+            continue
+
+        half = size // 2
+        if size < MAX_HYPERGEOMETRIC:
+            left = int(rng.hypergeometric(half, size - half, count))
+        else:
+            left = min(max(int(rng.binomial(count, half / size)), count - (size - half)), half)
+        # The right half is pushed first, so the left one is drawn first.
+        stack.append((lo + half, size - half, count - left))
+        stack.append((lo, half, left))
+    if buffer:
+        yield np.concatenate(buffer)
+
+
+def grid(rows: int,
+         cols: int,
+         seed: int = 0,
+         weights: Optional[tuple[float, float]] = (1.0, 100.0)
+         ) -> Iterator[Chunk]:
+    """
+    Generate an undirected grid graph.
+
+    The vertex in row ``r`` and column ``c`` has the value ``r * cols + c`` and
+    is connected to its right and lower neighbour. Each row of the grid is
+    yielded as a chunk.
+
+
+    :param rows: The number of rows.
+    :param cols: The number of columns.
+    :param seed: The seed of the random generator.
+    :param weights: Range to draw uniform weights from, or :py:class:`None` for
+        unweighted graphs.
+
+    :returns: Iterator over the chunks of edges.
+    """
+    rng = np.random.default_rng(seed)
+    for r in range(rows):
+        first = r * cols
+        right = np.arange(first, first + cols - 1)
+        u = [right]
+        v = [right + 1]
+        if r < rows - 1:
+            down = np.arange(first, first + cols)
+            u.append(down)
+            v.append(down + cols)
+        u = np.concatenate(u)
+        v = np.concatenate(v)
+        if weights is None:
+            yield u, v
+        else:
+            yield u, v, rng.uniform(*weights, size=len(u)).round(4)
+
+
+def power_law(n: int,
+              degree: int,
+              seed: int = 0,
+              weights: Optional[tuple[float, float]] = (1.0, 100.0),
+              chunk_size: int = CHUNK_SIZE
+              ) -> Iterator[Chunk]:
+    """
+    Generate an undirected graph with power-law degree distribution.
+
+    The graph is built by preferential attachment (Barabási-Albert): each new
+    vertex is connected to ``degree`` distinct existing vertexes, chosen with a
+    probability proportional to their degree.
+
+
+    :param n: The number of vertexes.
+    :param degree: The number of edges added per vertex.
+    :param seed: The seed of the random generator.
+    :param weights: Range to draw uniform weights from, or :py:class:`None` for
+        unweighted graphs.
+    :param chunk_size: The (approximate) number of edges per chunk.
+
+    :returns: Iterator over the chunks of edges.
+    """
+    if degree < 1 or n <= degree:
+        raise ValueError('The number of vertexes needs to exceed the degree.')
+
+    rng = np.random.default_rng(seed)
+    # Every vertex is repeated in this array once per edge it belongs to, so
+    # drawing uniformly from it prefers vertexes by their degree.
+    repeated = np.empty(2 * degree * n, dtype=np.int64)
+    size = 0
+    u = []
+    v = []
+    count = 0
+
+    # Start with a star of the first 'degree + 1' vertexes.
+    for target in range(degree):
+        u.append(np.array([degree]))
+        v.append(np.array([target]))
+    repeated[:degree] = np.arange(degree)
+    repeated[degree:2 * degree] = degree
+    size = 2 * degree
+    count = degree
+
+    for vertex in range(degree + 1, n):
+        targets = np.unique(repeated[rng.integers(0, size, size=degree)])
+        while len(targets) < degree:
+            extra = repeated[rng.integers(0, size, size=degree - len(targets))]
+            targets = np.unique(np.concatenate((targets, extra)))
+        u.append(np.full(degree, vertex))
+        v.append(targets)
+        repeated[size:size + degree] = targets
+        repeated[size + degree:size + 2 * degree] = vertex
+        size += 2 * degree
+        count += degree
+
+        if count >= chunk_size:
+            yield _chunk(u, v, rng, weights)
+            u, v, count = [], [], 0
+
+    if u:
+        yield _chunk(u, v, rng, weights)
+
+
+def _chunk(u: list, v: list, rng, weights) -> Chunk:
+    """
+    Concatenate the collected edges into a chunk and draw their weights.
+    """
+    u = np.concatenate(u)
+    v = np.concatenate(v)
+    if weights is None:
+        return u, v
+    return u, v, rng.uniform(*weights, size=len(u)).round(4)
+
+
+def complete_euclidean(n: int, seed: int = 0, scale: float = 100.0) -> Iterator[Chunk]:
+    """
+    Generate a complete graph of random points in the plane.
+
+    The points are drawn uniformly from a square of size ``scale`` and the
+    weight of each edge is the euclidean distance between its points, so the
+    weights satisfy the triangle inequality (except for rounding). Each vertex
+    yields a chunk with the edges to all vertexes of higher value.
+
+
+    :param n: The number of vertexes.
+    :param seed: The seed of the random generator.
+    :param scale: The size of the square.
+
+    :returns: Iterator over the chunks of edges.
+    """
+    points = np.random.default_rng(seed).uniform(0, scale, size=(n, 2))
+    for i in range(n - 1):
+        v = np.arange(i + 1, n)
+        distance = np.sqrt(((points[v] - points[i]) ** 2).sum(axis=1))
+        yield np.full(len(v), i), v, distance.round(2)
+
+
+def _oriented(n: int, m: int, seed: int, rng, chunk_size: int) -> Iterator[Chunk]:
+    """
+    Generate random directed edges without antiparallel pairs.
+
+    The edges are drawn as undirected pairs and get a random direction, so
+    there is at most a single edge between any two vertexes, like in the
+    network files of ``extra/``.
+    """
+    for u, v in random_graph(n, m, seed, weights=None, chunk_size=chunk_size):
+        flip = rng.random(len(u)) < 0.5
+        yield np.where(flip, v, u), np.where(flip, u, v)
+
+
+def flow_network(n: int,
+                 m: int,
+                 seed: int = 0,
+                 capacities: tuple[int, int] = (1, 20),
+                 chunk_size: int = CHUNK_SIZE
+                 ) -> Iterator[Chunk]:
+    """
+    Generate a random directed network with integral capacities.
+
+    There is at most a single edge between any two vertexes.
+
+
+    :param n: The number of vertexes.
+    :param m: The number of edges.
+    :param seed: The seed of the random generator.
+    :param capacities: Range to draw the capacities from (inclusive).
+    :param chunk_size: The number of edges per chunk.
+
+    :returns: Iterator over the chunks of edges.
+    """
+    rng = np.random.default_rng(seed + 1)
+    for u, v in _oriented(n, m, seed, rng, chunk_size):
+        yield u, v, rng.integers(capacities[0], capacities[1] + 1, size=len(u)).astype(float)
+
+
+def cost_minimal(n: int,
+                 m: int,
+                 seed: int = 0,
+                 costs: tuple[int, int] = (1, 20),
+                 capacities: tuple[int, int] = (1, 20),
+                 chunk_size: int = CHUNK_SIZE
+                 ) -> Iterator[Chunk]:
+    """
+    Generate a feasible instance of the cost minimal flow problem.
+
+    Each edge gets a random cost and capacity, as well as a random flow within
+    its capacity. The flow itself is not part of the chunks, but used by
+    :py:func:`balances` to derive the balances of all vertexes, so the flow is
+    a valid b-flow and the instance is feasible by construction. There is at
+    most a single edge between any two vertexes.
+
+
+    :param n: The number of vertexes.
+    :param m: The number of edges.
+    :param seed: The seed of the random generator.
+    :param costs: Range to draw the costs from (inclusive).
+    :param capacities: Range to draw the capacities from (inclusive).
+    :param chunk_size: The number of edges per chunk.
+
+    :returns: Iterator over the chunks of edges with the columns start, end,
+        cost, capacity and flow.
+    """
+    rng = np.random.default_rng(seed + 1)
+    for u, v in _oriented(n, m, seed, rng, chunk_size):
+        cost = rng.integers(costs[0], costs[1] + 1, size=len(u)).astype(float)
+        capacity = rng.integers(capacities[0], capacities[1] + 1, size=len(u))
+        flow = rng.integers(0, capacity + 1) * (rng.random(len(u)) < 0.5)
+        yield u, v, cost, capacity.astype(float), flow
+
+
+def balances(n: int, chunks: Iterator[Chunk]) -> np.ndarray:
+    """
+    Get the balances of a cost minimal flow instance.
+
+    The balance of each vertex is the flow leaving it minus the flow entering
+    it, with the flow in the last column of the chunks.
+
+
+    :param n: The number of vertexes.
+    :param chunks: The chunks of :py:func:`cost_minimal`.
+
+    :returns: The balance of every vertex.
+    """
+    balance = np.zeros(n)
+    for chunk in chunks:
+        np.add.at(balance, chunk[0], chunk[-1])
+        np.subtract.at(balance, chunk[1], chunk[-1])
+    return balance
+
+
+def write_graph(output_file: TextIO,
+                n: int,
+                chunks: Iterator[Chunk],
+                formats: tuple[str, ...] = ('%d', '%d'),
+                balance: Optional[np.ndarray] = None
+                ) -> int:
+    """
+    Write a generated graph in the text format of the ``extra/`` files.
+
+    The first line is the number of vertexes, optionally followed by the
+    balance of every vertex (for cost minimal flows) and the edges with one
+    tab separated line per edge. Columns of the chunks without a format will
+    not be written.
+
+
+    :param output_file: The file object to write to.
+    :param n: The number of vertexes.
+    :param chunks: The chunks of edges.
+    :param formats: The format of each column to write.
+    :param balance: Optional balance of each vertex.
+
+    :returns: The number of edges written.
+    """
+    output_file.write(f'{n}\n')
+    if balance is not None:
+        np.savetxt(output_file, balance, fmt='%.1f')
+
+    edges = 0
+    for chunk in chunks:
+        np.savetxt(output_file, np.column_stack(chunk[:len(formats)]),
+                   fmt=formats, delimiter='\t')
+        edges += len(chunk[0])
+    return edges
+
+
+def getArgs() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+
+    :returns: A :py:class:`argparse.Namespace` to access the argument values.
+    """
+    parser = argparse.ArgumentParser(prog='python -m graph.generators',
+                                     description='Generate synthetic graphs')
+    parser.add_argument('kind',
+                        choices=['random', 'grid', 'power_law', 'euclidean',
+                                 'flow', 'costmin'],
+                        help='The kind of graph to generate')
+    parser.add_argument('-n', '--vertexes',
+                        type=int,
+                        required=True,
+                        help='Number of vertexes (rows for grids)')
+    parser.add_argument('-m', '--edges',
+                        type=int,
+                        help='Number of edges (columns for grids, edges per vertex for power_law)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='Seed of the random generator')
+    parser.add_argument('--directed',
+                        action='store_true',
+                        help='Generate directed edges (random only)')
+    parser.add_argument('--unweighted',
+                        action='store_true',
+                        help='Omit the weights (random, grid and power_law only)')
+    parser.add_argument('-o', '--output',
+                        default='-',
+                        help='File to write to (default: stdout)')
+    args = parser.parse_args()
+    if args.edges is None and args.kind != 'euclidean':
+        parser.error(f'-m/--edges is required for {args.kind} graphs')
+    return args
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Generate the graph selected by the command line arguments.
+
+
+    :param args: The parsed command line arguments.
+    """
+    n = args.vertexes
+    m = args.edges
+    weights = None if args.unweighted else (1.0, 100.0)
+    formats = ('%d', '%d') if args.unweighted else ('%d', '%d', '%.4f')
+    balance = None
+
+    if args.kind == 'random':
+        chunks = random_graph(n, m, args.seed, args.directed, weights)
+    elif args.kind == 'grid':
+        chunks = grid(n, m, args.seed, weights)
+        n = n * m
+    elif args.kind == 'power_law':
+        chunks = power_law(n, m, args.seed, weights)
+    elif args.kind == 'euclidean':
+        chunks = complete_euclidean(n, args.seed)
+        formats = ('%d', '%d', '%.2f')
+    elif args.kind == 'flow':
+        chunks = flow_network(n, m, args.seed)
+        formats = ('%d', '%d', '%.1f')
+    else:
+        # The balances depend on all edges, so the edges are generated twice:
+        # once to sum up the balances and once to write them after the
+        # balances. As the generator is seeded, both passes are identical.
+        balance = balances(n, cost_minimal(n, m, args.seed))
+        chunks = cost_minimal(n, m, args.seed)
+        formats = ('%d', '%d', '%.1f', '%.1f')
+
+    with open_output(args.output) as output_file:
+        write_graph(output_file, n, chunks, formats, balance)
+
+
+if __name__ == '__main__':
+    main(getArgs())
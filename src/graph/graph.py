@@ -1,26 +1,56 @@
-import functools
-import time
+import gc
 from collections import deque
-from typing import Optional, Union
+from contextlib import contextmanager
+from itertools import count
+from typing import TYPE_CHECKING, Iterable, Optional, Union
 
+from .metrics import metrics, timeit
+from .stream import open_input
+from .unionFind import UnionFind
 
-def timeit(func):
-    @functools.wraps(func)
-    def wrapped(*args, **kwargs):
-        start_time = time.time()
-        res = func(*args, **kwargs)
-        elapsed_time = time.time() - start_time
-        print('function [{}] finished in {} ms'.format(
-            func.__name__, int(elapsed_time * 1000)))
-        return res
+# NumPy and the CSR adjacency are imported on demand by the methods using them,
+# as importing NumPy dominates the startup time for small graphs.
+if TYPE_CHECKING:
+    import numpy as np
 
-    return wrapped
+    from .csr import CSR
+
+# Versions of all graphs. Every change of a graph assigns it the next version,
+# so versions are unique across graphs and results cached for a version never
+# belong to a different or changed graph.
+_versions = count()
+
+
+@contextmanager
+def bulk():
+    """
+    Pause the cyclic garbage collector while creating many objects.
+
+    Importing a graph creates millions of vertexes, edges and sets, each
+    triggering collections, which scan all objects created so far. None of
+    them is garbage, so these scans would take about half of the import.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 class Vertex:
-    def __init__(self, value: int, edges=None):
+    # Vertexes and edges are created in bulk when importing graphs, so they
+    # don't get a __dict__ to save memory and time.
+    __slots__ = ('value', 'edges', 'in_edges')
+
+    def __init__(self, value: int, edges=None, in_edges=None):
         self.value = value
+        # Edges starting at this vertex. For undirected graphs, this includes
+        # the inverted edges of all edges ending at this vertex, too.
         self.edges = edges if edges is not None else set()
+        # Edges ending at this vertex, just maintained for directed graphs.
+        self.in_edges = in_edges if in_edges is not None else set()
 
     def __eq__(self, o: Union[int, object]) -> bool:
         """
@@ -33,16 +63,9 @@ class Vertex:
 
         :param o: The object to be matched.
 
-        :returns: Whether the passed object matches this vertex. Although
-            objects of any type may be passed, this method statically returns
-            false, if the passed type can't be handled by this vertex.
+        :returns: Whether the passed object matches this vertex.
         """
-        if isinstance(o, int):
-            return self.value == o
-        elif isinstance(o, Vertex):
-            return self.value == o.value
-        else:
-            return False
+        return self.value == getattr(o, 'value', o)
 
     def __hash__(self):
         return self.value
@@ -60,9 +83,22 @@ class Vertex:
         """
         return len(self.edges)
 
+    @property
+    def in_degree(self) -> int:
+        """
+        Get the number of edges ending at this vertex in directed graphs.
+
+
+        :returns: The in-degree of this vertex.
+        """
+        return len(self.in_edges)
+
     def add_edge(self, edge):
         self.edges.add(edge)
 
+    def add_in_edge(self, edge):
+        self.in_edges.add(edge)
+
     def __str__(self):
         return f"{self.value}"
 
@@ -71,6 +107,8 @@ class Vertex:
 
 
 class Edge:
+    __slots__ = ('start', 'end', 'weight')
+
     def __init__(self, start: Vertex, end: Vertex, weight=0):
         """
         Describes edges between vertexes
@@ -140,13 +178,17 @@ class Edge:
         return f"{self.start} -({self.weight})-> {self.end}"
 
     def __eq__(self, o):
-        return hash(o) == self.__hash__()
+        # Edges are identified by their start and end vertex, regardless of
+        # their weight.
+        if not isinstance(o, Edge):
+            return NotImplemented
+        return self.start.value == o.start.value and self.end.value == o.end.value
 
     def __repr__(self):
         return self.__str__()
 
     def __hash__(self):
-        return hash(f"{self.start.value}:{self.end.value}")
+        return hash((self.start.value, self.end.value))
 
     @property
     def is_loop(self) -> bool:
@@ -168,8 +210,15 @@ class Graph:
         self.vertexes = vertexes if vertexes is not None else {}
         self.directed = directed
         self.weighted = weighted
-        # The edges dict has the schema: edges[start_v]
+        # The edges dict has the schema: edges[start][end] = edge, keyed by the
+        # values of the vertexes (not the vertex objects).
         self.edges = {k: v for (k, v) in zip(range(self.vertex_count), [{} for _ in range(self.vertex_count)])}
+        # Components tracked incrementally while edges are added. This is just
+        # enabled on demand by :py:meth:`track_components`.
+        self.connectivity: Optional[UnionFind] = None
+        # The version of the graph, changed by adding edges. Changing the
+        # weights of existing edges doesn't change the version.
+        self.version = next(_versions)
 
     def add_existing_edge(self, edge: Edge):
         """
@@ -200,17 +249,37 @@ class Graph:
         # Although it is not required for operating on graphs, it will be used
         # for optimized performance and avoid iterating over all vertexes.
         edge = Edge(start_v, end_v, weight)
-        self.edges[start_v][end_v] = edge
+        self.edges[start_v.value][end_v.value] = edge
 
         # Add the edge to its start vertex, allowing the vertex to know its
-        # adjacent vertexes. For undirected graphs, the end vertex will get an
-        # edge of opposite direction, too.
+        # adjacent vertexes. For directed graphs, the end vertex keeps track of
+        # its incoming edges separately. For undirected graphs, the end vertex
+        # will get an edge of opposite direction instead.
         start_v.add_edge(edge)
-        if not self.directed:
+        if self.directed:
+            end_v.add_in_edge(edge)
+        else:
             inverted_edge = Edge(end_v, start_v, weight)
-            self.edges[end_v][start_v] = inverted_edge
+            self.edges[end_v.value][start_v.value] = inverted_edge
             end_v.add_edge(inverted_edge)
 
+        # If components are tracked, merge the components of both vertexes.
+        if self.connectivity is not None:
+            self.connectivity.union(start_v.value, end_v.value)
+        self.version = next(_versions)
+
+    def add_edges(self, edges: Iterable[tuple]) -> int:
+        """
+        Add a batch of edges to the Graph
+        :param edges: Tuples of start, end and optionally weight of each edge
+        :return: The number of components after adding the batch, if components
+            are tracked by :py:meth:`track_components`, otherwise None
+        """
+        for edge in edges:
+            self.add_edge(*edge)
+        if self.connectivity is not None:
+            return self.connectivity.count
+
     def get_edge(self, start_v: int, end_v: int) -> Union[Edge, None]:
         """
         Returns an edge between to vertexes if present
@@ -227,27 +296,158 @@ class Graph:
     def overall_weight(self) -> float:
         """
         Returns the overall weight of all edges within the Graph.
-        Mostly used for TSP method
+        For undirected graphs, each edge is counted once, although it is
+        stored for both directions.
 
         :return: The weight of all edges
         """
         if not self.weighted:
             return 0
-        edge_list = []
-        [edge_list.extend(list(x.values())) for x in list(self.edges.values())]
-        return sum([_.weight for _ in edge_list])
+        return sum(e.weight
+                   for x in self.edges.values()
+                   for e in x.values()
+                   if self.directed or e.start.value <= e.end.value)
 
     @timeit
     def import_from_file(self, filepath):
-        with open(filepath, "r") as input_file:
+        with open_input(filepath) as input_file, bulk():
             self.vertex_count = int(input_file.readline())
             self.edges = {k: v for (k, v) in zip(range(self.vertex_count), [{} for _ in range(self.vertex_count)])}
+            self.connectivity = None
             for i in range(self.vertex_count):
                 self.vertexes[i] = Vertex(value=i)
             for knot in input_file:
                 s, e = knot.split("\t")
                 self.add_edge(int(s), int(e))
 
+    def to_csr(self, reverse: bool = False) -> 'CSR':
+        """
+        Get the :py:class:`.CSR` adjacency of this graph.
+
+        :param reverse: Get the incoming instead of the outgoing edges of every
+            vertex (just relevant for directed graphs).
+        :return: The CSR adjacency, built from the current edges.
+        """
+        from .csr import CSR
+
+        with metrics.phase('Graph.to_csr'):
+            return CSR.from_graph(self, reverse)
+
+    def to_sparse(self, values: str = 'weight', format: str = 'csr'):
+        """
+        Export this graph as SciPy sparse matrix, see :py:func:`.to_sparse`.
+
+        :param values: The attribute of the edges used for the entries.
+        :param format: The format of the matrix, e.g. ``csr`` or ``coo``.
+        :return: The sparse matrix of this graph.
+        :raises ImportError: SciPy is not installed.
+        """
+        from .sparse import to_sparse
+
+        with metrics.phase('Graph.to_sparse'):
+            return to_sparse(self, values, format)
+
+    @classmethod
+    def from_sparse(cls, matrix, directed: bool = False) -> 'Graph':
+        """
+        Import a graph from a sparse matrix, see :py:func:`.from_sparse`.
+
+        :param matrix: The matrix, e.g. of :py:mod:`scipy.sparse`.
+        :param directed: Whether the graph is directed.
+        :return: The graph of the matrix.
+        :raises ImportError: SciPy is not installed.
+        """
+        from .sparse import from_sparse
+
+        return from_sparse(matrix, directed)
+
+    def component_labels(self, strong: bool = False) -> 'np.ndarray':
+        """
+        Get the component of every vertex of this graph.
+
+        For undirected graphs, the connected components are labeled. Directed
+        graphs will be labeled by their weakly connected components, i.e. the
+        direction of edges is ignored, or by their strongly connected ones, if
+        ``strong`` is set. All methods are iterative and don't depend on the
+        recursion limit.
+
+
+        :param strong: Whether to get the strongly connected components of a
+            directed graph.
+
+        :returns: The component label of every vertex, numbered from 0.
+        """
+        if not self.directed:
+            return self.to_csr().labels()
+        if strong:
+            return self.to_csr().strongly_connected()
+
+        import numpy as np
+
+        from .csr import CSR
+
+        # For weakly connected components, the outgoing and incoming edges of
+        # all vertexes are merged into a single adjacency.
+        out_csr = self.to_csr()
+        starts = out_csr.edge_starts(np.arange(out_csr.edge_count))
+        return CSR.from_edges(self.vertex_count, starts, out_csr.indices,
+                              directed=False).labels()
+
+    def track_components(self) -> UnionFind:
+        """
+        Track the components of this graph incrementally.
+
+        This method builds a :py:class:`.UnionFind` from the current edges of
+        this graph once. Afterwards, every edge added merges the components of
+        its vertexes, so the number of components, their sizes and whether two
+        vertexes are connected can be retrieved without running any search on
+        this graph. For directed graphs, weakly connected components will be
+        tracked.
+
+
+        :returns: The union-find tracking the components.
+        """
+        if self.connectivity is None:
+            self.connectivity = UnionFind(self.vertex_count)
+            for x in self.edges.values():
+                for e in x.values():
+                    self.connectivity.union(e.start.value, e.end.value)
+        return self.connectivity
+
+    def same_component(self, u: int, v: int) -> bool:
+        """
+        Check whether two vertexes are in the same component.
+
+        This enables tracking components by :py:meth:`track_components`.
+
+        :param u: The first vertex.
+        :param v: The second vertex.
+        :return: Whether ``u`` and ``v`` are connected.
+        """
+        return self.track_components().same(u, v)
+
+    def component_size(self, v: int) -> int:
+        """
+        Get the number of vertexes in the component of a vertex.
+
+        This enables tracking components by :py:meth:`track_components`.
+
+        :param v: The vertex to look up.
+        :return: The size of the component of ``v``.
+        """
+        return self.track_components().size(v)
+
+    def component_sizes(self) -> dict[int, int]:
+        """
+        Get the sizes of all components.
+
+        This enables tracking components by :py:meth:`track_components`.
+
+        :return: The number of vertexes of every component, keyed by a vertex
+            identifying the component.
+        """
+        return self.track_components().sizes()
+
     @property
     def components(self) -> int:
         """
@@ -260,6 +460,41 @@ class Graph:
 
         :returns: Number of components for this graph.
         """
+        return self.count_components()
+
+    def count_components(self, frontier: bool = False, strong: bool = False, backend: str = 'python') -> int:
+        """
+        Get the number of components for this graph.
+
+        See :py:attr:`components` for details. For directed graphs, the weakly
+        connected components will be counted, unless ``strong`` is set.
+
+
+        :param frontier: Whether to use frontier based searches over the
+            :py:class:`.CSR` adjacency of this graph, which are vectorized and
+            therefore faster for large graphs.
+        :param strong: Whether to count the strongly connected components of a
+            directed graph.
+        :param backend: ``scipy`` to count the components by
+            :py:func:`scipy.sparse.csgraph.connected_components` instead,
+            e.g. to compare results and runtime.
+
+        :returns: Number of components for this graph.
+        """
+        if backend != 'python':
+            from .sparse import check_backend, csgraph
+
+            check_backend(backend)
+            count, _ = csgraph().connected_components(self.to_sparse(), directed=self.directed,
+                                                      connection='strong' if strong else 'weak')
+            return int(count)
+        if self.connectivity is not None and not strong:
+            return self.connectivity.count
+        if self.directed:
+            return int(self.component_labels(strong).max(initial=-1)) + 1
+        if frontier:
+            return self.to_csr().components()
+
         # Iterate over the vertexes of this graph and run a search algorithm
         # originating from each of them. As the search algorithm updates the
         # vertexes marked, following iterations will ignore these nodes, so each
@@ -287,8 +522,8 @@ class Graph:
             needle: int,
             start: Vertex,
             marked: set[int] = None,
-            pred: dict[list[int]] = None
-            ) -> Optional[list[int]]:
+            parent: dict[int, Edge] = None
+            ) -> Optional[list[Edge]]:
         """
         Search ``needle`` in this graph by using a breath-first-search (BFS).
 
@@ -308,7 +543,9 @@ class Graph:
             passing this argument, the search operation will start from scratch.
             As python usually passes by reference, passing an empty set to this
             parameter can be used to get the vertexes visited, too.
-        :param pred: predecessors of any given vertex while traversing.
+        :param parent: The edge each vertex has been discovered by while
+            traversing. Just a single edge is stored per vertex, so the path
+            will be reconstructed only if the ``needle`` has been found.
 
         :returns: The path to find the ``needle`` from start or
             :py:class:`False`, if ``needle`` could not be found.
@@ -318,10 +555,10 @@ class Graph:
         if marked is None:
             marked = set()
 
-        # If no predecessors have been passed, just add an empty list for the
-        # start vertex, as it doesn't have any predecessors.
-        if pred is None:
-            pred = {start: []}
+        # If no parent edges have been passed, start with an empty dict, as the
+        # start vertex doesn't have any parent.
+        if parent is None:
+            parent = {}
 
         # Initialize the search queue with the first vertex as starting point
         # and mark it as visited to avoid loops during search.
@@ -336,16 +573,14 @@ class Graph:
             # and check them to match the needle or further searching starting
             # from them.
             #
-            # NOTE: Due to the current implementation of the 'Vertex' class,
-            #       this will iterate over both edges starting and ending at
-            #       this vertex. For directed graphs, edges starting from the
-            #       vertex should be stored separately to just iterate these
-            #       below instead of all.
+            # NOTE: Just the edges starting at this vertex will be iterated.
+            #       For directed graphs, edges ending at this vertex are stored
+            #       separately in 'in_edges' and ignored by this search.
             for e in (queue.popleft()).edges:
-                # If the needle has been found, return the list of predecessors
-                # (including the current vertex) to indicate success.
+                # If the needle has been found, return the path following the
+                # parent edges back to the start to indicate success.
                 if e.end.value == needle:
-                    return pred[e.start] + [e]
+                    return self._path(parent, start.value, e)
 
                 # If the connected vertex doesn't match the needle, check if its
                 # already has been marked as visited (or a visit is scheduled).
@@ -356,18 +591,36 @@ class Graph:
                 # As this vertex likely was never seen before, it should be
                 # visited by the search algorithm and will be enqueued. It is
                 # marked as visited to avoid further vertex operations to
-                # enqueue the same vertex twice. In addition, its list of
-                # predecessors will be saved, to allow following the path from
-                # start to needle if found.
+                # enqueue the same vertex twice. In addition, the edge it has
+                # been discovered by will be saved, to allow following the path
+                # from start to needle if found.
                 marked.add(e.end.value)
                 queue.append(e.end)
-                pred[e.end] = pred[e.start] + [e]
+                parent[e.end.value] = e
 
         # If the method didn't return yet, the search didn't succeed and needle
         # couldn't be found in the component of the graph, the start vertex does
         # belong to.
         return False
 
+    @staticmethod
+    def _path(parent: dict[int, Edge], start: int, last: Edge) -> list[Edge]:
+        """
+        Reconstruct a path found by :py:meth:`bfs`.
+
+
+        :param parent: The edge each vertex has been discovered by.
+        :param start: The value of the vertex the search started from.
+        :param last: The last edge of the path, leading to the needle.
+
+        :returns: The edges of the path from ``start`` in order.
+        """
+        path = [last]
+        while path[-1].start.value != start:
+            path.append(parent[path[-1].start.value])
+        path.reverse()
+        return path
+
     def dfs(self, start_vertex=0) -> list[Vertex]:
         """
         Depth First Search for double tree algorithm
@@ -401,5 +654,5 @@ class Graph:
         return vertexes_passed
 
     @timeit
-    def component_time(self):
-        print(self.components)
+    def component_time(self, frontier: bool = False, strong: bool = False, backend: str = 'python'):
+        print(self.count_components(frontier, strong, backend))
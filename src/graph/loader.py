@@ -0,0 +1,198 @@
+"""
+Parse large graph files into arrays in parallel.
+
+Instead of creating vertex and edge objects line by line, the edge lines of a
+file are split into byte ranges aligned on line breaks, which are parsed by a
+pool of processes into arrays and concatenated afterwards. Adjacencies like
+the :py:class:`.CSR` are built from these arrays in bulk.
+
+The arrays use the same convention as the chunks of :py:mod:`.generators`: the
+first two are the start and end vertexes of the edges and all further ones
+additional columns like weight or capacity.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from .csr import CSR
+from .generators import Chunk
+from .stream import compression, open_input
+
+# Files smaller than this are parsed by the calling process, as starting the
+# pool would take longer than parsing them.
+MIN_PARALLEL_SIZE = 1 << 24
+
+# The number of characters of lines parsed at once from streams.
+STREAM_CHUNK_SIZE = 1 << 24
+
+
+def _ranges(filepath: str, parts: int) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Split the edge lines of a file into byte ranges aligned on line breaks.
+
+
+    :param filepath: The path to the graph file.
+    :param parts: The number of ranges to split into (at most).
+
+    :returns: The number of vertexes given by the header and the ranges as
+        start and end offset.
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as input_file:
+        vertex_count = int(input_file.readline())
+        begin = input_file.tell()
+
+        # Move every boundary forward to the start of the next line, so each
+        # line belongs to exactly one range.
+        bounds = [begin]
+        for i in range(1, parts):
+            offset = begin + (size - begin) * i // parts
+            if offset <= bounds[-1]:
+                continue
+            input_file.seek(offset - 1)
+            input_file.readline()
+            bounds.append(input_file.tell())
+        bounds.append(size)
+    return vertex_count, [(s, e) for s, e in zip(bounds, bounds[1:]) if s < e]
+
+
+def _columns(filepath: str, begin: int) -> int:
+    """
+    Get the number of columns by the first edge line at offset ``begin``.
+    """
+    with open(filepath, 'rb') as input_file:
+        input_file.seek(begin)
+        for line in input_file:
+            if line.split():
+                return len(line.split())
+    return 2
+
+
+def _parse(data, columns: int, where: str) -> np.ndarray:
+    """
+    Parse edge lines into the rows of an array.
+
+    :raises ValueError: The lines include anything else than numbers, or don't
+        have ``columns`` numbers each.
+    """
+    try:
+        values = np.fromstring(data, sep=' ')
+    except ValueError as e:
+        raise ValueError(f'Lines of {where} include invalid numbers: {e}') from None
+    if values.size % columns:
+        raise ValueError(f'Lines of {where} don\'t have {columns} columns each.')
+    return values.reshape(-1, columns)
+
+
+def _check_columns(filepath: str, columns: int) -> None:
+    if columns < 2:
+        raise ValueError(f'{filepath} is no edge list, its lines have {columns} column(s).')
+
+
+def _parse_range(filepath: str, begin: int, end: int, columns: int) -> np.ndarray:
+    """
+    Parse the edge lines of a byte range.
+
+
+    :param filepath: The path to the graph file.
+    :param begin: The offset of the first line.
+    :param end: The offset after the last line.
+    :param columns: The number of columns per line.
+
+    :returns: The lines as rows of an array.
+
+    :raises ValueError: The range includes invalid lines.
+    """
+    with open(filepath, 'rb') as input_file:
+        input_file.seek(begin)
+        data = input_file.read(end - begin)
+    return _parse(data, columns, f'{filepath} between bytes {begin} and {end}')
+
+
+def _read_stream(filepath: str) -> tuple[int, list[np.ndarray], int]:
+    """
+    Parse a file, which can't be split into byte ranges (e.g. as it is
+    compressed or read from stdin), by the calling process in chunks.
+
+
+    :param filepath: The path to the graph file or ``-`` for stdin.
+
+    :returns: The number of vertexes, the parsed chunks and the number of
+        columns.
+    """
+    parts = []
+    columns = 2
+    with open_input(filepath) as input_file:
+        vertex_count = int(input_file.readline())
+        for lines in iter(lambda: input_file.readlines(STREAM_CHUNK_SIZE), []):
+            if not parts:
+                columns = next((len(line.split()) for line in lines if line.split()), columns)
+                _check_columns(filepath, columns)
+            parts.append(_parse(''.join(lines), columns, filepath))
+    return vertex_count, parts, columns
+
+
+def read_arrays(filepath: str, workers: Optional[int] = None) -> tuple[int, Chunk]:
+    """
+    Read the edges of a graph file into arrays.
+
+    The edge lines are split into a range per worker, which are parsed in
+    parallel by a pool of processes. Unless the number of workers is given,
+    small files are parsed by the calling process in a single range.
+    Compressed files and stdin (``-``) are decompressed while reading and
+    parsed in chunks by the calling process, as they can't be split.
+
+
+    :param filepath: The path to the graph file.
+    :param workers: The number of processes (default: all CPUs for large
+        files).
+
+    :returns: The number of vertexes and the edge arrays (start, end and
+        further columns).
+
+    :raises ValueError: The file includes invalid lines or no edges, e.g. the
+        balances of flow networks.
+    """
+    if filepath == '-' or compression(filepath):
+        vertex_count, parts, columns = _read_stream(filepath)
+    else:
+        if workers is None:
+            workers = 1
+            if os.path.getsize(filepath) >= MIN_PARALLEL_SIZE:
+                workers = os.cpu_count() or 1
+        vertex_count, ranges = _ranges(filepath, workers)
+
+        columns = _columns(filepath, ranges[0][0]) if ranges else 2
+        _check_columns(filepath, columns)
+        args = [(filepath, begin, end, columns) for begin, end in ranges]
+        if len(ranges) <= 1:
+            parts = [_parse_range(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                parts = list(pool.map(_parse_range, *zip(*args)))
+
+    edges = np.concatenate(parts) if parts else np.zeros((0, columns))
+    return vertex_count, (edges[:, 0].astype(np.intp), edges[:, 1].astype(np.intp),
+                          *(edges[:, i] for i in range(2, columns)))
+
+
+def load_csr(filepath: str, directed: bool = False, workers: Optional[int] = None) -> CSR:
+    """
+    Load the :py:class:`.CSR` adjacency of a graph file, parsed in parallel by
+    :py:func:`read_arrays`. The third column (if any) is used as weight.
+
+
+    :param filepath: The path to the graph file.
+    :param directed: Whether the graph is directed. For undirected graphs, the
+        inverted edges are added, too.
+    :param workers: The number of processes (default: all CPUs for large
+        files).
+
+    :returns: The CSR adjacency of the graph.
+    """
+    vertex_count, edges = read_arrays(filepath, workers)
+    weights = edges[2] if len(edges) > 2 else None
+    return CSR.from_edges(vertex_count, edges[0], edges[1], weights, directed)
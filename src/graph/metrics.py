@@ -0,0 +1,172 @@
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Metrics:
+    """
+    Collector for timings and counters.
+
+    This class collects the time spent in named phases (e.g. loading a graph,
+    building a residual graph or solving) and counters for events inside the
+    algorithms (e.g. augmentations or relaxations). Collection is disabled by
+    default: in that case, each instrumented call just checks the
+    :py:attr:`enabled` flag, without taking any time or allocating memory.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.enabled = False
+        self.phases: dict[str, list[int]] = {}
+        self.counters: dict[str, int] = {}
+        self.values: dict[str, float] = {}
+
+    def enable(self) -> None:
+        """
+        Enable collecting metrics.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Disable collecting metrics.
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Drop all metrics collected so far.
+        """
+        self.phases.clear()
+        self.counters.clear()
+        self.values.clear()
+
+    def record(self, name: str, elapsed: int) -> None:
+        """
+        Record the runtime of a phase.
+
+
+        :param name: The name of the phase.
+        :param elapsed: The runtime in nanoseconds.
+        """
+        if not self.enabled:
+            return
+        phase = self.phases.get(name)
+        if phase is None:
+            # Schema: calls, total, minimum and maximum runtime (nanoseconds).
+            self.phases[name] = [1, elapsed, elapsed, elapsed]
+        else:
+            phase[0] += 1
+            phase[1] += elapsed
+            phase[2] = min(phase[2], elapsed)
+            phase[3] = max(phase[3], elapsed)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the runtime of a code block as phase.
+
+
+        :param name: The name of the phase.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Increase a counter.
+
+
+        :param name: The name of the counter.
+        :param n: The value to add to the counter.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name: str, value: float) -> None:
+        """
+        Set a value, e.g. the peak memory used.
+
+
+        :param name: The name of the value.
+        :param value: The value to be set.
+        """
+        if self.enabled:
+            self.values[name] = value
+
+    def to_dict(self) -> dict:
+        """
+        Get the metrics collected as dictionary.
+
+
+        :returns: The metrics with runtimes in milliseconds.
+        """
+        return {
+            'phases': {
+                name: {
+                    'calls': calls,
+                    'total_ms': total / 1e6,
+                    'min_ms': minimum / 1e6,
+                    'max_ms': maximum / 1e6,
+                }
+                for name, (calls, total, minimum, maximum) in self.phases.items()
+            },
+            'counters': dict(self.counters),
+            'values': dict(self.values),
+        }
+
+    def to_json(self) -> str:
+        """
+        :returns: The metrics collected as JSON.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def dump(self, filepath: str = '-') -> None:
+        """
+        Write the metrics collected as JSON.
+
+
+        :param filepath: The file to write to or ``-`` for stderr.
+        """
+        if filepath == '-':
+            print(self.to_json(), file=sys.stderr)
+        else:
+            with open(filepath, 'w') as output_file:
+                output_file.write(self.to_json())
+
+
+# Global collector used by all instrumented functions of this package.
+metrics = Metrics()
+
+
+def timeit(func):
+    """
+    Measure the runtime of a function as phase of the global :py:data:`metrics`.
+
+    The phase is named by the function's qualified name. If collecting metrics
+    is disabled, the function is called directly.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.record(name, time.perf_counter_ns() - start)
+
+    return wrapped
@@ -1,6 +1,8 @@
 import abc
 
-from graph import Graph, Vertex
+from graph import Graph, Vertex, timeit
+from graph.graph import bulk
+from graph.stream import open_input
 
 
 class MST(abc.ABC):
@@ -8,6 +10,7 @@ class MST(abc.ABC):
         super().__init__()
         self.graph = graph or Graph(weighted=True)
 
+    @timeit
     def import_from_file(self, filepath):
         """
         Import the given file as mst
@@ -15,7 +18,7 @@ class MST(abc.ABC):
         :param filepath: the path to the graph file
         :return: void
         """
-        with open(filepath, "r") as input_file:
+        with open_input(filepath) as input_file, bulk():
             self.graph = Graph(weighted=True, vertex_count=int(input_file.readline()))
             for i in range(self.graph.vertex_count):
                 self.graph.vertexes[i] = Vertex(value=i)
@@ -1,8 +1,12 @@
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
-from graph import Edge, Vertex, timeit, Graph
+from graph import Edge, Vertex, timeit, Graph, UnionFind
 from graph.mst.abstractMst import MST
 
+# The view depends on NumPy, which is imported just when a view is requested.
+if TYPE_CHECKING:
+    from graph.view import GraphView
+
 
 class Bucket():
     """
@@ -115,7 +119,12 @@ class Bucket():
 
 class Kruskal(MST):
     mst = Graph()
-    def __call__(self):
+    def __call__(self, backend: str = 'python'):
+        if backend != 'python':
+            from graph.sparse import check_backend
+
+            check_backend(backend)
+            return self._kruskal_scipy()
         return self._kruskal_cost()
 
     def _kruskal(self) -> Iterator[Edge]:
@@ -157,6 +166,56 @@ class Kruskal(MST):
                     mark.combine(compA, compB)
                     yield e
 
+    @staticmethod
+    def _kruskal_stream(vertex_count: int,
+                        chunks: Iterable[list[tuple]]
+                        ) -> Iterator[tuple]:
+        """
+        Run the Kruskal algorithm on a stream of edges sorted by weight.
+
+        As the edges already are sorted, a single pass over them is sufficient
+        and just the components of the vertexes need to be kept in memory.
+
+
+        :param vertex_count: The number of vertexes of the graph.
+        :param chunks: Chunks of edge tuples (start, end, weight) in order of
+            non-decreasing weight.
+
+        :returns: Iterator for the minimal spanning tree's edges.
+
+        :raises ValueError: The edges are not sorted by weight.
+        """
+        mark = UnionFind(vertex_count)
+        last = float('-inf')
+        for chunk in chunks:
+            for edge in chunk:
+                if edge[2] < last:
+                    raise ValueError(f'Edge {edge} is not sorted by weight.')
+                last = edge[2]
+
+                # Just edges merging two components are part of the minimal
+                # spanning tree, all others would close a cycle.
+                if mark.union(edge[0], edge[1]):
+                    yield edge
+                    if mark.count == 1:
+                        return
+
+    @timeit
+    def stream_cost(self, vertex_count: int, chunks: Iterable[list[tuple]]) -> float:
+        """
+        Get the cost of the minimal spanning tree for a stream of sorted edges.
+
+        See :py:meth:`_kruskal_stream` for details. The graph loaded by this
+        object is not used.
+
+
+        :param vertex_count: The number of vertexes of the graph.
+        :param chunks: Chunks of edge tuples sorted by weight.
+
+        :returns: The cost of the minimal spanning tree.
+        """
+        return sum(map(lambda e: e[2], self._kruskal_stream(vertex_count, chunks)))
+
     @timeit
     def _kruskal_cost(self) -> float:
         """
@@ -170,6 +229,34 @@ class Kruskal(MST):
         """
         return sum(map(lambda e: e.weight, self._kruskal()))
 
+    @timeit
+    def _kruskal_scipy(self) -> float:
+        """
+        Get the cost of the minimal spanning tree by
+        :py:func:`scipy.sparse.csgraph.minimum_spanning_tree`, e.g. to compare
+        results and runtime.
+
+
+        :returns: The cost of the minimal spanning tree.
+        """
+        from graph.sparse import csgraph
+
+        return float(csgraph().minimum_spanning_tree(self.graph.to_sparse()).sum())
+
+    @timeit
+    def mst_view(self) -> 'GraphView':
+        """
+        Run the Kruskal algorithm and get the found MST as view of the graph.
+
+        The view just selects the edges of the MST in the loaded graph, so no
+        vertexes or edges need to be created.
+
+        :return: A view of the found MST
+        """
+        from graph.view import GraphView
+
+        return GraphView.from_edges(self.graph, self._kruskal())
+
     @timeit
     def get_mst(self) -> Graph:
         """
@@ -177,6 +264,5 @@ class Kruskal(MST):
 
         :return: A Graph object that contains the found MST
         """
-        self.mst = Graph(self.graph.vertex_count)
-        list(map(self.mst.add_existing_edge, self._kruskal()))
+        self.mst = self.mst_view().to_graph()
         return self.mst
@@ -5,8 +5,8 @@ from graph.mst.abstractMst import MST
 
 
 class Prim(MST):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, graph=None):
+        super().__init__(graph)
 
     def __call__(self):
         return self._prim()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+
+"""
+Server answering graph queries over a socket.
+
+Clients send jobs as JSON lines, the same as for :py:mod:`graph.batch`, e.g.
+``{"graph": "extra/flow_max/Fluss1.txt", "algorithm": "edmonds_karp",
+"start": 0, "target": 7}``, and get a JSON line with the result for every job,
+in the order of their requests.
+
+Imported graphs are kept by the worker processes in a :py:class:`.LRUCache`,
+keyed by their path and modification time, so queries on the same file don't
+need to import it again until it changes. The jobs are solved by the worker
+processes to keep the event loop responsive. As every worker has its own
+cache, all jobs on a file are sent to the same worker.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .batch import parse_job, run_job
+from .cache import LRUCache
+
+# The imported inputs of a worker process, set up by _init_worker.
+_inputs: Optional[LRUCache] = None
+
+
+def _init_worker(cache_size: int) -> None:
+    global _inputs
+    _inputs = LRUCache(cache_size)
+
+
+def _solve(job: dict) -> dict:
+    """
+    Run a job in a worker process, using the worker's imported inputs.
+    """
+    try:
+        version = os.stat(job['graph']).st_mtime_ns
+    except OSError:
+        # Let the import fail to report the error for this job.
+        version = None
+    return run_job(job, _inputs, version)
+
+
+class Server:
+    """
+    Server running graph jobs in a pool of worker processes.
+    """
+
+    def __init__(self, workers: int = 1, cache_size: int = 8):
+        """
+        Constructor.
+
+
+        :param workers: The number of worker processes.
+        :param cache_size: The number of imported inputs each worker keeps.
+        """
+        # Every worker is a pool of its own, so jobs can be assigned to a
+        # specific worker, which already imported the job's input.
+        self._workers = [ProcessPoolExecutor(max_workers=1,
+                                             initializer=_init_worker,
+                                             initargs=(cache_size,))
+                         for _ in range(max(1, workers))]
+
+    def _worker(self, path: str) -> ProcessPoolExecutor:
+        return self._workers[zlib.crc32(path.encode()) % len(self._workers)]
+
+    async def solve(self, job: dict) -> dict:
+        """
+        Run a job by the worker assigned to its input.
+
+
+        :param job: The job to run.
+
+        :returns: The result of the job.
+        """
+        job['graph'] = os.path.abspath(job['graph'])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._worker(job['graph']), _solve, job)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the jobs of a single connection until it is closed.
+
+
+        :param reader: The stream to read jobs from.
+        :param writer: The stream to write results to.
+        """
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                # Any error of a job, e.g. an invalid one or a worker crashing,
+                # is answered, so the connection stays open for further jobs.
+                try:
+                    result = await self.solve(parse_job(line.decode()))
+                except Exception as e:
+                    result = {'error': f'{type(e).__name__}: {e}'}
+                writer.write(json.dumps(result).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, path: Optional[str] = None) -> None:
+        """
+        Serve until cancelled.
+
+
+        :param host: The address to listen on for TCP connections.
+        :param port: The port to listen on for TCP connections.
+        :param path: The path of a Unix socket to listen on instead of TCP.
+        """
+        if path:
+            server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        for worker in self._workers:
+            worker.shutdown(cancel_futures=True)
+
+
+def getArgs() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+
+    :returns: A :py:class:`argparse.Namespace` to access the argument values.
+    """
+    parser = argparse.ArgumentParser(prog='python -m graph.server',
+                                     description='Serve graph queries as JSON lines')
+    parser.add_argument('--host',
+                        default='127.0.0.1',
+                        help='Address to listen on')
+    parser.add_argument('-p', '--port',
+                        type=int,
+                        default=8765,
+                        help='Port to listen on')
+    parser.add_argument('-u', '--unix',
+                        metavar='PATH',
+                        help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('-w', '--workers',
+                        type=int,
+                        default=os.cpu_count(),
+                        help='Number of worker processes')
+    parser.add_argument('-c', '--cache-size',
+                        type=int,
+                        default=8,
+                        help='Number of imported graphs kept by each worker')
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Run the server configured by the command line arguments.
+
+
+    :param args: The parsed command line arguments.
+    """
+    # Stop on SIGTERM just like on Ctrl+C, shutting down the workers.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    server = Server(args.workers, args.cache_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main(getArgs())
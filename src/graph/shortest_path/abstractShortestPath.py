@@ -1,14 +1,74 @@
 import abc
+import weakref
+from typing import Callable
 
+from graph.cache import LRUCache
 from graph.graph import Graph, Vertex
-from graph.graph import timeit
+from graph.graph import bulk, timeit
+from graph.metrics import metrics
+from graph.stream import open_input
 
 
 class ShortestPath(abc.ABC):
+    # Shortest path trees computed before, shared by all instances. Every graph
+    # has its own cache together with the version it was filled for, which is
+    # dropped as soon as the graph changes or is garbage collected. The size of
+    # every cache is bound by the number of vertexes of its trees.
+    trees: 'weakref.WeakKeyDictionary[Graph, tuple[int, LRUCache]]' = weakref.WeakKeyDictionary()
+    MAXSIZE = 1 << 20
+
     def __init__(self, graph=None):
         super().__init__()
         self.graph = graph
 
+    def _memoized(self, start_vertex: int, solve: Callable[[int], tuple], cache: bool = True) -> tuple:
+        """
+        Get the shortest path tree from a start vertex, computing it just if
+        it's not cached for the current version of the graph.
+
+        The lists returned are copies, so changing them doesn't affect the
+        cached tree.
+
+
+        :param start_vertex: The vertex to start from.
+        :param solve: The method computing the tree.
+        :param cache: Whether to use the cache. Trees of graphs used just once
+            (e.g. residual graphs) don't need to be kept.
+
+        :returns: The result of ``solve``.
+        """
+        if not cache:
+            return solve(start_vertex)
+
+        version, trees = self.trees.get(self.graph, (None, None))
+        if version != self.graph.version:
+            trees = LRUCache(maxsize=self.MAXSIZE, size=lambda tree: len(tree[0]))
+            self.trees[self.graph] = (self.graph.version, trees)
+
+        # Trees are cached by the method computing them, so the trees of
+        # different algorithms or backends are kept apart.
+        key = (solve.__qualname__, start_vertex)
+        cached = trees.get(key)
+        if cached is None:
+            metrics.count('ShortestPath.cache_misses')
+            tree = solve(start_vertex)
+            # The predecessors are cached by their values, as vertexes would
+            # keep the graph alive. Whether they have been vertexes is kept to
+            # restore them.
+            vertexes = any(isinstance(p, Vertex) for p in tree[1])
+            predecessors = [p.value if isinstance(p, Vertex) else p for p in tree[1]]
+            trees[key] = cached = (tree[0], predecessors, *tree[2:], vertexes)
+        else:
+            metrics.count('ShortestPath.cache_hits')
+
+        *tree, vertexes = cached
+        tree = [list(x) if x is not None else None for x in tree]
+        if vertexes:
+            tree[1] = [self.graph.vertexes[p] if p is not None else None for p in tree[1]]
+        tree = tuple(tree)
+        self.distance, self.predecessors = tree[0], tree[1]
+        return tree
+
     @timeit
     def import_from_file(self, filepath, directed=True):
         """
@@ -17,7 +77,7 @@ class ShortestPath(abc.ABC):
         :param filepath: the path to the graph file
         :return: void
         """
-        with open(filepath, "r") as input_file:
+        with open_input(filepath) as input_file, bulk():
             self.graph = Graph(weighted=True, vertex_count=int(input_file.readline()), directed=directed)
             for i in range(self.graph.vertex_count):
                 self.graph.vertexes[i] = Vertex(value=i)
@@ -0,0 +1,373 @@
+import heapq
+import math
+from typing import Optional
+
+import numpy as np
+
+from graph.csr import CSR
+from graph.graph import timeit
+from graph.metrics import metrics
+from graph.shortest_path.abstractShortestPath import ShortestPath
+
+
+class ContractionHierarchy(ShortestPath):
+    """
+    Contraction hierarchy for fast point-to-point shortest path queries.
+
+    In a preprocessing step, the vertexes are ordered by their importance and
+    contracted one after another: a contracted vertex is removed from the graph
+    and shortcuts are inserted between its neighbours, where it has been part
+    of the only shortest path between them. Afterwards, every shortest path can
+    be found by two searches just going upwards in the order, from the start
+    vertex forwards and from the target backwards, which visit a tiny fraction
+    of the graph only.
+
+    The hierarchy keeps the upward edges of every vertex as :py:class:`.CSR`
+    adjacency, with the contracted vertex for each shortcut to unpack the
+    paths, and can be saved to disk to skip the preprocessing.
+
+    Hierarchies suit sparse graphs with a hierarchical structure like road
+    networks or grids. For random graphs, the vertexes contracted last get
+    densely connected, so the number of shortcuts may grow quadratically.
+    """
+
+    def __init__(self, graph=None, witness_limit: int = 64):
+        """
+        Constructor.
+
+
+        :param graph: The graph to preprocess. Weights must not be negative.
+        :param witness_limit: The maximum number of vertexes settled by a
+            witness search, before a shortcut is inserted anyway. Lower limits
+            speed up the preprocessing at the cost of more shortcuts.
+        """
+        super().__init__(graph)
+        self.witness_limit = witness_limit
+        self.rank: Optional[np.ndarray] = None
+        self.up: Optional[CSR] = None
+        self.down: Optional[CSR] = None
+        self._up_middle: Optional[np.ndarray] = None
+        self._down_middle: Optional[np.ndarray] = None
+
+    def __call__(self, start: int, target: int) -> float:
+        """
+        Get the distance of the shortest path between two vertexes.
+
+
+        :param start: The vertex to start from.
+        :param target: The vertex to reach.
+
+        :returns: The distance, or infinity if the target can't be reached.
+        """
+        return self._query(start, target)[0]
+
+    def path(self, start: int, target: int) -> Optional[list[int]]:
+        """
+        Get the shortest path between two vertexes.
+
+
+        :param start: The vertex to start from.
+        :param target: The vertex to reach.
+
+        :returns: The vertexes of the path including start and target, or
+            :py:class:`None` if the target can't be reached.
+        """
+        distance, meet, forward, backward = self._query(start, target)
+        if meet is None:
+            return None
+
+        # Collect the upward edges of both searches from the start vertex to
+        # the meeting vertex and from there down to the target. Each of them
+        # may be a shortcut, which is unpacked into the original edges.
+        edges = []
+        v = meet
+        while v != start:
+            u, middle = forward[v]
+            edges.append((u, v, middle))
+            v = u
+        edges.reverse()
+        v = meet
+        while v != target:
+            w, middle = backward[v]
+            edges.append((v, w, middle))
+            v = w
+
+        path = [start]
+        for edge in edges:
+            path.extend(self._unpack(*edge))
+        return path
+
+    def _unpack(self, u: int, v: int, middle: int) -> list[int]:
+        """
+        Unpack an edge of the hierarchy into the vertexes of the original path,
+        excluding its start vertex.
+        """
+        result = []
+        stack = [(u, v, middle)]
+        while stack:
+            u, v, middle = stack.pop()
+            if middle < 0:
+                result.append(v)
+            else:
+                # Unpack the first half before the second one. As shortcuts
+                # are inserted between neighbours of the contracted vertex
+                # just, both halves are edges of the contracted vertex, which
+                # lead upwards from it.
+                stack.append((middle, v, self._middle(self.up, self._up_middle, middle, v)))
+                stack.append((u, middle, self._middle(self.down, self._down_middle, middle, u)))
+        return result
+
+    @staticmethod
+    def _middle(csr: CSR, middles: np.ndarray, u: int, v: int) -> int:
+        """
+        Get the contracted vertex of the upward edge from ``u`` to ``v``.
+        """
+        begin, end = csr.indptr[u], csr.indptr[u + 1]
+        position = begin + int(np.flatnonzero(csr.indices[begin:end] == v)[0])
+        return int(middles[position])
+
+    @timeit
+    def _query(self, start: int, target: int) -> tuple[float, Optional[int], dict, dict]:
+        """
+        Run the bidirectional upward search.
+
+        Both searches are run alternately. A search stops, once the smallest
+        distance of its queue isn't below the best path found yet, as it can't
+        improve this path anymore.
+
+
+        :param start: The vertex to start from.
+        :param target: The vertex to reach.
+
+        :returns: The distance, the vertex both searches met at and the
+            predecessors of both searches.
+        """
+        if self.up is None:
+            self.preprocess()
+
+        distances = ({start: 0.0}, {target: 0.0})
+        parents = ({start: (start, -1)}, {target: (target, -1)})
+        queues = ([(0.0, start)], [(0.0, target)])
+        adjacency = ((self._up_lists, self._up_middle_list),
+                     (self._down_lists, self._down_middle_list))
+        best = math.inf
+        meet = None
+
+        side = 0
+        while queues[0] or queues[1]:
+            if not queues[side]:
+                side = 1 - side
+            queue = queues[side]
+            own = distances[side]
+            distance, v = heapq.heappop(queue)
+
+            if distance >= best:
+                queue.clear()
+            elif distance <= own[v]:
+                metrics.count('ContractionHierarchy.settled')
+                other = distances[1 - side].get(v)
+                if other is not None and distance + other < best:
+                    best = distance + other
+                    meet = v
+
+                (indptr, indices, weights), middles = adjacency[side]
+                for i in range(indptr[v], indptr[v + 1]):
+                    w = indices[i]
+                    d = distance + weights[i]
+                    if d < own.get(w, math.inf):
+                        own[w] = d
+                        parents[side][w] = (v, middles[i])
+                        heapq.heappush(queue, (d, w))
+            side = 1 - side
+
+        return best, meet, parents[0], parents[1]
+
+    @timeit
+    def preprocess(self) -> None:
+        """
+        Contract all vertexes of the graph to build the hierarchy.
+
+        The vertexes are contracted by their edge difference (the number of
+        shortcuts required minus the number of edges removed) plus the number
+        of neighbours contracted before, so the hierarchy stays flat and
+        contracted vertexes are spread uniformly. As priorities change by
+        contracting the neighbours, they are updated lazily, whenever a vertex
+        is about to be contracted.
+        """
+        n = self.graph.vertex_count
+        # The remaining graph, keeping the minimal weight between every pair of
+        # vertexes and the contracted vertex for shortcuts.
+        out_edges: list[dict[int, float]] = [{} for _ in range(n)]
+        in_edges: list[dict[int, float]] = [{} for _ in range(n)]
+        middle: dict[tuple[int, int], int] = {}
+        for edges in self.graph.edges.values():
+            for edge in edges.values():
+                u, v, weight = edge.start.value, edge.end.value, edge.weight
+                if weight < 0:
+                    raise ValueError('Contraction hierarchies require non-negative weights.')
+                if u != v and weight < out_edges[u].get(v, math.inf):
+                    out_edges[u][v] = weight
+                    in_edges[v][u] = weight
+
+        contracted = [0] * n
+        queue = [(self._simulate(v, out_edges, in_edges), v) for v in range(n)]
+        heapq.heapify(queue)
+
+        rank = np.empty(n, dtype=np.intp)
+        up = ([], [], [], [])
+        down = ([], [], [], [])
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            priority = self._simulate(v, out_edges, in_edges) + contracted[v]
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, v))
+                continue
+
+            # All remaining neighbours of v are contracted after it, so its
+            # remaining edges are the upward edges of the hierarchy.
+            rank[v] = order
+            order += 1
+            for w, weight in out_edges[v].items():
+                self._append(up, v, w, weight, middle.get((v, w), -1))
+            for u, weight in in_edges[v].items():
+                self._append(down, v, u, weight, middle.get((u, v), -1))
+
+            for u, w, weight in self._shortcuts(v, out_edges, in_edges):
+                out_edges[u][w] = weight
+                in_edges[w][u] = weight
+                middle[(u, w)] = v
+                metrics.count('ContractionHierarchy.shortcuts')
+
+            for w in out_edges[v]:
+                del in_edges[w][v]
+                contracted[w] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                contracted[u] += 1
+            out_edges[v] = {}
+            in_edges[v] = {}
+
+        self.rank = rank
+        self.up, self._up_middle = self._csr(n, up)
+        self.down, self._down_middle = self._csr(n, down)
+        self._to_lists()
+
+    @staticmethod
+    def _append(edges: tuple, v: int, w: int, weight: float, middle: int) -> None:
+        edges[0].append(v)
+        edges[1].append(w)
+        edges[2].append(weight)
+        edges[3].append(middle)
+
+    @staticmethod
+    def _csr(n: int, edges: tuple) -> tuple[CSR, np.ndarray]:
+        """
+        Build the CSR adjacency of upward edges, keeping the contracted vertex
+        of every edge in the same order.
+        """
+        starts = np.asarray(edges[0], dtype=np.intp)
+        order = np.argsort(starts, kind='stable')
+        csr = CSR.from_edges(n, starts, edges[1], edges[2])
+        return csr, np.asarray(edges[3], dtype=np.intp)[order]
+
+    def _simulate(self, v: int, out_edges: list[dict], in_edges: list[dict]) -> int:
+        """
+        Get the edge difference of contracting a vertex.
+        """
+        shortcuts = sum(1 for _ in self._shortcuts(v, out_edges, in_edges))
+        return shortcuts - len(out_edges[v]) - len(in_edges[v])
+
+    def _shortcuts(self, v: int, out_edges: list[dict], in_edges: list[dict]):
+        """
+        Get the shortcuts required for contracting a vertex.
+
+        For every incoming neighbour ``u``, a limited Dijkstra search (the
+        witness search) looks for paths to the outgoing neighbours avoiding
+        ``v``. If no such path is at most as long as the path over ``v``, a
+        shortcut is required.
+
+
+        :returns: Iterator over the start, end and weight of every shortcut.
+        """
+        targets = out_edges[v]
+        for u, first in in_edges[v].items():
+            candidates = {w: first + weight for w, weight in targets.items() if w != u}
+            if not candidates:
+                continue
+            witness = self._witness(u, v, candidates, max(candidates.values()), out_edges)
+            for w, weight in candidates.items():
+                if witness.get(w, math.inf) > weight:
+                    yield u, w, weight
+
+    def _witness(self, u: int, v: int, targets: dict, limit: float, out_edges: list[dict]) -> dict:
+        """
+        Search from ``u`` without passing ``v``, up to the distance ``limit``
+        and at most :py:attr:`witness_limit` settled vertexes.
+        """
+        distance = {u: 0.0}
+        queue = [(0.0, u)]
+        settled = 0
+        remaining = len(targets)
+        while queue and settled < self.witness_limit and remaining:
+            d, x = heapq.heappop(queue)
+            if d > distance[x]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            if x in targets:
+                remaining -= 1
+            for y, weight in out_edges[x].items():
+                if y != v and d + weight < distance.get(y, math.inf):
+                    distance[y] = d + weight
+                    heapq.heappush(queue, (d + weight, y))
+        return distance
+
+    def _to_lists(self) -> None:
+        """
+        Convert the adjacency into lists for the queries, as looking up single
+        python numbers is a lot faster than indexing numpy arrays element by
+        element.
+        """
+        self._up_lists = (self.up.indptr.tolist(), self.up.indices.tolist(), self.up.weights.tolist())
+        self._down_lists = (self.down.indptr.tolist(), self.down.indices.tolist(), self.down.weights.tolist())
+        self._up_middle_list = self._up_middle.tolist()
+        self._down_middle_list = self._down_middle.tolist()
+
+    def save(self, filepath) -> None:
+        """
+        Save the hierarchy as NumPy archive.
+
+
+        :param filepath: The file to write.
+        """
+        if self.up is None:
+            self.preprocess()
+        np.savez(filepath,
+                 rank=self.rank,
+                 up_indptr=self.up.indptr, up_indices=self.up.indices,
+                 up_weights=self.up.weights, up_middle=self._up_middle,
+                 down_indptr=self.down.indptr, down_indices=self.down.indices,
+                 down_weights=self.down.weights, down_middle=self._down_middle)
+
+    @classmethod
+    @timeit
+    def load(cls, filepath) -> 'ContractionHierarchy':
+        """
+        Load a hierarchy saved by :py:meth:`save`.
+
+
+        :param filepath: The file to read.
+
+        :returns: The hierarchy, ready for queries.
+        """
+        with np.load(filepath) as data:
+            hierarchy = cls()
+            hierarchy.rank = data['rank']
+            hierarchy.up = CSR(data['up_indptr'], data['up_indices'], data['up_weights'])
+            hierarchy.down = CSR(data['down_indptr'], data['down_indices'], data['down_weights'])
+            hierarchy._up_middle = data['up_middle']
+            hierarchy._down_middle = data['down_middle']
+        hierarchy._to_lists()
+        return hierarchy
@@ -20,11 +20,37 @@ class Node:
 
 
 class Dijkstra(ShortestPath):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, graph=None):
+        super().__init__(graph)
 
-    def __call__(self, start_vertex: int):
-        return self._dijkstra(start_vertex)
+    def __call__(self, start_vertex: int, cache: bool = True, backend: str = 'python'):
+        if backend != 'python':
+            from graph.sparse import check_backend
+
+            check_backend(backend)
+            return self._memoized(start_vertex, self._dijkstra_scipy, cache)
+        return self._memoized(start_vertex, self._dijkstra, cache)
+
+    @timeit
+    def _dijkstra_scipy(self, start_vertex: int) -> tuple[list, list]:
+        """
+        Run :py:func:`scipy.sparse.csgraph.dijkstra` from the provided start
+        vertex, e.g. to compare results and runtime.
+
+        :param start_vertex: The Vertex from where to start
+        :return: Two lists of distances and predecessors, just like
+            :py:meth:`_dijkstra`
+        """
+        from graph.sparse import csgraph
+
+        # The matrix has both directions of undirected edges, so it can be
+        # searched as directed graph in any case.
+        distance, predecessors = csgraph().dijkstra(self.graph.to_sparse(), directed=True,
+                                                    indices=start_vertex, return_predecessors=True)
+        self.distance = distance.tolist()[:self.graph.vertex_count]
+        self.predecessors = [self.graph.vertexes[p] if p >= 0 else None
+                             for p in predecessors.tolist()[:self.graph.vertex_count]]
+        return self.distance, self.predecessors
 
     @timeit
     def _dijkstra(self, start_vertex: int) -> tuple[list, list]:
@@ -55,6 +81,10 @@ class Dijkstra(ShortestPath):
             cur = heapq.heappop(remaining)
             if self.distance[cur.vertex.value] != math.inf:
                 continue
+            # All vertexes left are unreachable from the start vertex. They
+            # would just push each other with infinite distance again.
+            if cur.distance == math.inf:
+                break
 
             # Persist the distance and predecessor of this vertex in the global
             # variabled returned at the end of the method, as its values won't
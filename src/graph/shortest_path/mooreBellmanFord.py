@@ -1,3 +1,5 @@
+from graph.graph import timeit
+from graph.metrics import metrics
 from graph.shortest_path.abstractShortestPath import ShortestPath
 
 
@@ -5,9 +7,18 @@ class MooreBellmanFord(ShortestPath):
     def __init__(self, graph=None):
         super().__init__(graph)
 
-    def __call__(self, start_vertex: int):
-        return self._moore_bellman_ford(start_vertex)
+    # The backends available: relaxing edges one by one or by rounds of
+    # vectorized NumPy operations over all edges at once.
+    BACKENDS = ('python', 'numpy')
 
+    def __call__(self, start_vertex: int, cache: bool = True, backend: str = 'python'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(self.BACKENDS)}")
+        if backend == 'numpy':
+            return self._memoized(start_vertex, self._moore_bellman_ford_numpy, cache)
+        return self._memoized(start_vertex, self._moore_bellman_ford, cache)
+
+    @timeit
     def _moore_bellman_ford(self, start_vertex: int) -> tuple[list, list]:
         """
         Execute the Moore Bellman Ford Algorithm from the provided start vertex
@@ -24,6 +35,7 @@ class MooreBellmanFord(ShortestPath):
         hist = []
         # Repeat n-1 times
         for _ in range(self.graph.vertex_count - 1):
+            metrics.count('MooreBellmanFord.rounds')
             found_better_distance = False
             for start in self.graph.vertexes:
                 for edge in self.graph.edges[start].values():
@@ -37,6 +49,8 @@ class MooreBellmanFord(ShortestPath):
             # break if we haven't found a better option in our current iteration
             if not found_better_distance:
                 break
+        # every relaxation has been recorded in the history
+        metrics.count('MooreBellmanFord.relaxations', len(hist))
         # only check for negative cycles if we had an improvement in our last iteration
         if found_better_distance:
             # check for negative cycles
@@ -45,3 +59,59 @@ class MooreBellmanFord(ShortestPath):
                     if self.distance[start] + edge.weight < self.distance[edge.end.value]:
                         return self.distance, self.predecessors, hist
         return self.distance, self.predecessors, None
+
+    @timeit
+    def _moore_bellman_ford_numpy(self, start_vertex: int) -> tuple[list, list]:
+        """
+        Execute the Moore Bellman Ford Algorithm by vectorized rounds.
+
+        Every round relaxes all edges at once based on the distances of the
+        previous round: the candidate distances of all edges are reduced per
+        end vertex by ``np.minimum.at``, and the edges achieving an improved
+        minimum become the predecessors. After ``n - 1`` rounds, all shortest
+        paths are found, unless there is a negative cycle.
+
+        :param start_vertex: The Vertex from where to start
+        :return: Two lists of distances and predecessors and the history of
+            relaxations, just like :py:meth:`_moore_bellman_ford`
+        """
+        import numpy as np
+
+        # Get the edges as arrays once, as the graph doesn't change while
+        # running the algorithm.
+        edges = [e for x in self.graph.edges.values() for e in x.values()]
+        count = len(edges)
+        starts = np.fromiter((e.start.value for e in edges), dtype=np.intp, count=count)
+        ends = np.fromiter((e.end.value for e in edges), dtype=np.intp, count=count)
+        weights = np.fromiter((e.weight for e in edges), dtype=float, count=count)
+
+        distance = np.full(self.graph.vertex_count, np.inf)
+        predecessors = np.full(self.graph.vertex_count, -1, dtype=np.intp)
+        distance[start_vertex] = 0
+        found_better_distance = False
+        hist = []
+        for _ in range(self.graph.vertex_count - 1):
+            metrics.count('MooreBellmanFord.rounds')
+            candidates = distance[starts] + weights
+            better = candidates < distance[ends]
+            found_better_distance = bool(better.any())
+            if not found_better_distance:
+                break
+
+            # Reduce the candidates of all improving edges to the minimum per
+            # end vertex. If multiple edges achieve it, the last one is used.
+            improving = np.flatnonzero(better)
+            updated = distance.copy()
+            np.minimum.at(updated, ends[improving], candidates[improving])
+            improving = improving[candidates[improving] == updated[ends[improving]]]
+            predecessors[ends[improving]] = starts[improving]
+            hist.extend(starts[improving].tolist())
+            distance = updated
+        metrics.count('MooreBellmanFord.relaxations', len(hist))
+
+        self.distance = distance.tolist()
+        self.predecessors = [p if p >= 0 else None for p in predecessors.tolist()]
+        # Another round improving any distance proves a negative cycle.
+        if found_better_distance and (distance[starts] + weights < distance[ends]).any():
+            return self.distance, self.predecessors, hist
+        return self.distance, self.predecessors, None
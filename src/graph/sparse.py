@@ -0,0 +1,155 @@
+"""
+Conversion of graphs from and to SciPy sparse matrices.
+
+The matrices have a row and column for every vertex and an entry for every edge
+starting at the row's and ending at the column's vertex. Entries stored
+explicitly are edges, even if their value is zero, just like SciPy's
+:py:mod:`scipy.sparse.csgraph` routines treat them. Undirected graphs are
+represented by symmetric matrices.
+
+SciPy is an optional dependency, which is imported by the functions of this
+module only, so the rest of the package works without it.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .graph import Graph, Vertex, bulk
+
+if TYPE_CHECKING:
+    from .flow.flow import Flow
+
+# The backends available for algorithms supporting them: the package's own
+# implementation and the routines of scipy.sparse.csgraph.
+BACKENDS = ('python', 'scipy')
+
+
+def check_backend(backend: str) -> bool:
+    """
+    Check the backend selected for an algorithm.
+
+
+    :param backend: The name of the backend, one of :py:data:`BACKENDS`.
+
+    :returns: Whether SciPy should be used.
+
+    :raises ValueError: The backend is unknown.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+    return backend == 'scipy'
+
+
+def _scipy():
+    """
+    Import SciPy's sparse matrices and graph routines.
+
+    :raises ImportError: SciPy is not installed.
+    """
+    try:
+        import scipy.sparse
+        import scipy.sparse.csgraph
+    except ImportError as e:
+        raise ImportError('SciPy is required for sparse matrices and the scipy backend, '
+                          'install it by: pip install scipy') from e
+    return scipy
+
+
+def csgraph():
+    """
+    :returns: The module :py:mod:`scipy.sparse.csgraph`.
+
+    :raises ImportError: SciPy is not installed.
+    """
+    return _scipy().sparse.csgraph
+
+
+def to_sparse(graph: Graph, values: str = 'weight', format: str = 'csr'):
+    """
+    Export the edges of a graph as sparse matrix.
+
+
+    :param graph: The graph to export.
+    :param values: The attribute of the edges used as value of the entries,
+        e.g. ``capacity`` for flows.
+    :param format: The format of the matrix, e.g. ``csr`` or ``coo``.
+
+    :returns: The sparse matrix of the graph.
+    """
+    sparse = _scipy().sparse
+    edges = [e for x in graph.edges.values() for e in x.values()]
+    count = len(edges)
+    starts = np.fromiter((e.start.value for e in edges), dtype=np.intp, count=count)
+    ends = np.fromiter((e.end.value for e in edges), dtype=np.intp, count=count)
+    data = np.fromiter((getattr(e, values) for e in edges), dtype=float, count=count)
+    n = max(graph.vertex_count, int(starts.max(initial=-1)) + 1, int(ends.max(initial=-1)) + 1)
+    return sparse.coo_matrix((data, (starts, ends)), shape=(n, n)).asformat(format)
+
+
+def _entries(matrix) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the number of vertexes and the rows, columns and values of all entries
+    of a sparse (or dense) matrix. Duplicate entries are summed up.
+    """
+    sparse = _scipy().sparse
+    if not sparse.issparse(matrix):
+        matrix = sparse.coo_matrix(np.asarray(matrix))
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f'The matrix must be square, but has shape {matrix.shape}.')
+    matrix = sparse.coo_matrix(matrix)
+    matrix.sum_duplicates()
+    return matrix.shape[0], matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist()
+
+
+def from_sparse(matrix, directed: bool = False) -> Graph:
+    """
+    Import a graph from a sparse matrix.
+
+    For undirected graphs, an entry in either triangle of the matrix adds an
+    edge. If both are given, the first one in order of the entries is used.
+
+
+    :param matrix: The matrix, e.g. of :py:mod:`scipy.sparse`.
+    :param directed: Whether the graph is directed.
+
+    :returns: The graph of the matrix.
+    """
+    n, rows, cols, data = _entries(matrix)
+    with bulk():
+        graph = Graph(vertex_count=n, directed=directed, weighted=True)
+        for i in range(n):
+            graph.vertexes[i] = Vertex(value=i)
+        for s, e, w in zip(rows, cols, data):
+            if directed or e not in graph.edges[s]:
+                graph.add_edge(s, e, w)
+    return graph
+
+
+def flow_from_sparse(capacities, weights=None, balances: Optional[np.ndarray] = None) -> 'Flow':
+    """
+    Import a flow network from sparse matrices.
+
+
+    :param capacities: The capacity of every edge.
+    :param weights: The cost of every edge, given at the same positions as the
+        capacities. By default, the edges don't have any cost.
+    :param balances: The balance of every vertex, e.g. for cost minimal flows.
+
+    :returns: The flow network with zero flow.
+    """
+    from .flow.flow import Flow
+
+    n, rows, cols, data = _entries(capacities)
+    cost = {}
+    if weights is not None:
+        _, w_rows, w_cols, w_data = _entries(weights)
+        cost = dict(zip(zip(w_rows, w_cols), w_data))
+    with bulk():
+        flow = Flow(vertex_count=n, weighted=weights is not None)
+        if balances is not None:
+            for v, balance in zip(flow.vertexes.values(), np.asarray(balances).tolist()):
+                v.balance = balance
+        for s, e, c in zip(rows, cols, data):
+            flow.add_edge(s, e, c, weight=cost.get((s, e), 0))
+    return flow
@@ -0,0 +1,187 @@
+import sys
+from contextlib import nullcontext
+from itertools import islice
+from typing import BinaryIO, ContextManager, Iterator, Optional, TextIO, Union
+
+from .unionFind import UnionFind
+
+# The magic bytes at the start of compressed files, by their format.
+MAGIC = {
+    'gzip': b'\x1f\x8b',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
+
+def _open_gzip(source: Union[str, BinaryIO]) -> TextIO:
+    import gzip
+
+    return gzip.open(source, 'rt')
+
+
+def _open_xz(source: Union[str, BinaryIO]) -> TextIO:
+    import lzma
+
+    return lzma.open(source, 'rt')
+
+
+def _open_zstd(source: Union[str, BinaryIO]) -> TextIO:
+    # Python 3.14 ships zstd as compression.zstd, older versions need the
+    # optional zstandard package.
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError as e:
+            raise ImportError('Reading zstd compressed files requires Python 3.14 or the zstandard '
+                              'package, install it by: pip install zstandard') from e
+    return zstd.open(source, 'rt')
+
+
+# Functions to open a compressed file or binary stream for reading text,
+# decompressing it on the fly.
+_OPENERS = {
+    'gzip': _open_gzip,
+    'xz': _open_xz,
+    'zstd': _open_zstd,
+}
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """
+    Detect the compression of a file by its magic bytes.
+
+    :param head: The first bytes of the file (at least 6).
+    :return: The format of the compression, one of :py:data:`MAGIC`, or
+        :py:class:`None` for uncompressed files.
+    """
+    for compression, magic in MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def compression(filepath) -> Optional[str]:
+    """
+    Detect the compression of a graph file, see :py:func:`detect_compression`.
+
+    :param filepath: The path to the graph file or ``-`` for stdin.
+    :return: The format of the compression or :py:class:`None`.
+    """
+    if filepath == '-':
+        return detect_compression(sys.stdin.buffer.peek(6)[:6])
+    with open(filepath, 'rb') as input_file:
+        return detect_compression(input_file.read(6))
+
+
+def open_input(filepath) -> Union[TextIO, ContextManager[TextIO]]:
+    """
+    Open a graph file for reading.
+
+    Files compressed by gzip, xz or zstd are detected by their magic bytes and
+    decompressed while reading, without any temporary file.
+
+    :param filepath: The path to the graph file or ``-`` to read from stdin.
+    :return: A text file object to be used by a ``with`` statement. Leaving
+        it doesn't close stdin.
+    """
+    kind = compression(filepath)
+    if filepath == '-':
+        # Decompressing wraps stdin without closing it, but stdin itself would
+        # be closed by the with statement.
+        return _OPENERS[kind](sys.stdin.buffer) if kind else nullcontext(sys.stdin)
+    if kind:
+        return _OPENERS[kind](filepath)
+    return open(filepath, "r")
+
+
+def open_output(filepath) -> Union[TextIO, ContextManager[TextIO]]:
+    """
+    Open a graph file for writing.
+
+    :param filepath: The path to the graph file or ``-`` to write to stdout.
+    :return: A text file object to be used by a ``with`` statement. Leaving
+        it doesn't close stdout.
+    """
+    if filepath == '-':
+        return nullcontext(sys.stdout)
+    return open(filepath, "w")
+
+
+def read_header(input_file: TextIO) -> int:
+    """
+    Read the number of vertexes from the first line of a graph file.
+
+    :param input_file: The file object, positioned at its start.
+    :return: The number of vertexes.
+    """
+    return int(input_file.readline())
+
+
+def read_chunks(input_file: TextIO, chunk_size: int = 65536) -> Iterator[list[str]]:
+    """
+    Read the lines of a file in chunks of fixed size.
+
+    :param input_file: The file object to read from.
+    :param chunk_size: The maximum number of lines per chunk.
+    :return: Iterator over the chunks of lines.
+    """
+    while True:
+        chunk = list(islice(input_file, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_edges(chunks: Iterator[list[str]]) -> Iterator[list[tuple]]:
+    """
+    Parse chunks of edge lines.
+
+    The first two columns of each line are the start and end vertex, all
+    further columns (e.g. weight or capacity) are parsed as float. Empty lines
+    will be skipped.
+
+    :param chunks: Iterator over chunks of lines.
+    :return: Iterator over the chunks of edge tuples.
+    """
+    for chunk in chunks:
+        edges = []
+        for line in chunk:
+            fields = line.split()
+            if fields:
+                edges.append((int(fields[0]), int(fields[1]), *map(float, fields[2:])))
+        yield edges
+
+
+def read_edges(input_file: TextIO, chunk_size: int = 65536) -> Iterator[list[tuple]]:
+    """
+    Stream the edges of a graph file in chunks.
+
+    Just a single chunk of lines is held in memory at a time, so files larger
+    than the available memory can be processed by one-pass algorithms. The
+    header needs to be consumed by :py:func:`read_header` before.
+
+    :param input_file: The file object to read from.
+    :param chunk_size: The maximum number of edges per chunk.
+    :return: Iterator over the chunks of edge tuples.
+    """
+    return parse_edges(read_chunks(input_file, chunk_size))
+
+
+def stream_components(vertex_count: int, chunks: Iterator[list[tuple]]) -> UnionFind:
+    """
+    Get the components of a streamed graph.
+
+    The edges are merged into a :py:class:`.UnionFind` chunk by chunk, so the
+    memory required is bound by the number of vertexes, not edges.
+
+    :param vertex_count: The number of vertexes.
+    :param chunks: Iterator over chunks of edge tuples.
+    :return: The union-find of the graph's components.
+    """
+    components = UnionFind(vertex_count)
+    for chunk in chunks:
+        for edge in chunk:
+            components.union(edge[0], edge[1])
+    return components
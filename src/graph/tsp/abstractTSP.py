@@ -1,31 +1,39 @@
 import abc
+from typing import Optional, Union
 
-from graph.graph import Graph, Vertex
+from graph.graph import Graph
 from graph.graph import timeit
+from graph.tsp.distanceMatrix import DistanceMatrix
+from graph.tsp.tour import Tour
 
 
 class TSP(abc.ABC):
-    def __init__(self):
+    def __init__(self, graph: Optional[Union[DistanceMatrix, Graph]] = None):
         super().__init__()
-        self.graph = None
+        if isinstance(graph, Graph):
+            graph = DistanceMatrix.from_graph(graph)
+        self.graph = graph
         self.round_trip = None
 
     @timeit
     def import_from_file(self, filepath):
         """
-        Import the given file as mst
+        Import the given file as distance matrix
 
         :param filepath: the path to the graph file
         :return: void
         """
-        with open(filepath, "r") as input_file:
-            self.graph = Graph(weighted=True, vertex_count=int(input_file.readline()))
-            self.round_trip = Graph(weighted=True, vertex_count=self.graph.vertex_count)
-            for i in range(self.graph.vertex_count):
-                self.graph.vertexes[i] = Vertex(value=i)
-            for knot in input_file:
-                s, e, w = knot.split("\t")
-                self.graph.add_edge(int(s), int(e), float(w.replace('\n', '')))
+        self.graph = DistanceMatrix.from_file(filepath)
+
+    def _round_trip(self, order) -> Tour:
+        """
+        Get the round trip for an order of vertexes.
+
+        :param order: The vertexes in the order they are visited.
+        :return: The Tour for the round trip
+        """
+        self.round_trip = Tour(self.graph, order)
+        return self.round_trip
 
     @abc.abstractmethod
     def __call__(self):
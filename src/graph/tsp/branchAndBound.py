@@ -1,5 +1,3 @@
-from graph.graph import Vertex
-
 from .bruteForce import BruteForce
 
 
@@ -13,8 +11,8 @@ class BranchAndBound(BruteForce):
     """
 
     def _run(self,
-             vertex: Vertex,
-             path: list[Vertex] = [],
+             vertex: int,
+             path: list[int],
              distance: float = 0.0
              ) -> None:
         """
@@ -1,65 +1,65 @@
 import math
 
-from graph.graph import Vertex, timeit
+from graph.graph import timeit
 from graph.tsp.abstractTSP import TSP
+from graph.tsp.tour import Tour
 
 
 class BruteForce(TSP):
-    def __init__(self):
+    def __init__(self, graph=None):
         """
         Constructor.
         """
         self.min_cost = math.inf
         self.min_path = []
+        self._weights = []
 
-        super().__init__()
+        super().__init__(graph)
 
-    def __call__(self, start: int = 0) -> float:
+    def __call__(self, start: int = 0) -> Tour:
         """
-        Get the minimal cost for a TSP route.
+        Get the minimal TSP route.
 
 
-        :param start: ID of the :py:class:`.Vertex` to start from.
+        :param start: ID of the vertex to start from.
 
-        :returns: Cost of the minimal TSP route.
+        :returns: The minimal TSP route.
         """
-        # Calculate the minimal TSP route by calling the internal methods, which
-        # in fact are just wrappers to measure the time spent on calculations.
-        self.__timeHelper(self.graph.vertexes.get(start))
+        # Convert the distance matrix into nested lists once, as looking up
+        # single python floats is a lot faster than indexing numpy arrays
+        # element by element in the recursion below.
+        self._weights = self.graph.weights.tolist()
 
-        # TODO: If required by other methods and external callees, a graph
-        #       including just the TSP route could be calculated from 'min_path'
-        #       here.
+        # Calculate the minimal TSP route by calling the internal methods.
+        self._brute_force(start)
 
-        # Return the cost of the minimal route calculated above. It can't be
-        # returned directly from the function, as its using recursion and can't
-        # reliable determine when a global minimum is reached during runtime.
-        return self.min_cost
+        # Return the minimal route calculated above. It can't be returned
+        # directly from the function, as its using recursion and can't reliable
+        # determine when a global minimum is reached during runtime.
+        return self._round_trip(self.min_path)
 
     @timeit
-    def __timeHelper(self,
-                     vertex: Vertex,
-                     path: list[Vertex] = [],
-                     distance: float = 0.0
-                     ) -> None:
+    def _brute_force(self, start: int) -> None:
         """
-        Timed version of :py:meth:`_run`.
+        Determine a minimal round trip starting from ``start``.
 
-        This wrapper of :py:meth:`_run` uses the global :py:func:`.timeit`
-        wrapper to get the runtime of this algorithm.
+        This method resets the global minimum and starts the recursion of
+        :py:meth:`_run`.
         """
-        self._run(vertex, path, distance)
+        self.min_cost = math.inf
+        self.min_path = []
+        self._run(start, [])
 
     def _run(self,
-             vertex: Vertex,
-             path: list[Vertex] = [],
+             vertex: int,
+             path: list[int],
              distance: float = 0.0
              ) -> None:
         """
         Determine a minimal round trip using bruteforce.
 
 
-        :param vertex: :py:class:`.Vertex` to start from.
+        :param vertex: The vertex to start from.
         :param path: Vertexes already visited.
         :param distance: Commulated distance of the vertexes already visited.
 
@@ -76,17 +76,17 @@ class BruteForce(TSP):
         # NOTE: On recursion, copies of local variables need to be used to not
         #       just pass references, which would alter the current scope on
         #       writes and make recursions to other nodes impossible.
-        if len(path) < len(self.graph.vertexes):
-            for e in vertex.edges:
-                if e.end not in path:
-                    self._run(e.end, list(path), distance + e.weight)
+        weights = self._weights[vertex]
+        if len(path) < len(weights):
+            for end, weight in enumerate(weights):
+                if end not in path and weight != math.inf:
+                    self._run(end, list(path), distance + weight)
 
         else:
             # If the node visited is the last remaining of the graph not visited
             # yet, add another edge and its weight to close the route back to
             # the starting point.
-            finEdge = next(filter(lambda e: e.end == path[0], vertex.edges))
-            distance = distance + finEdge.weight
+            distance = distance + weights[path[0]]
 
             # If the distance calculated is a new global minimum, update the
             # global variables with its successors.
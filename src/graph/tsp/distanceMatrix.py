@@ -0,0 +1,110 @@
+import numpy as np
+
+from graph.graph import Graph, Vertex
+from graph.stream import open_input
+
+
+class DistanceMatrix:
+    """
+    Dense representation of a complete graph.
+
+    TSP instances are complete graphs, so storing them as ``n x n`` array of
+    weights is both smaller and faster than a :py:class:`.Graph` with an
+    :py:class:`.Edge` object per direction of every vertex pair. The weight
+    between two vertexes can be looked up in constant time by indexing the
+    matrix. Pairs not connected are set to infinity.
+    """
+
+    def __init__(self, weights: np.ndarray):
+        """
+        Constructor.
+
+
+        :param weights: The ``n x n`` array of weights.
+        """
+        self.weights = np.asarray(weights, dtype=float)
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        :returns: The number of vertexes of this graph.
+        """
+        return self.weights.shape[0]
+
+    def __len__(self) -> int:
+        return self.vertex_count
+
+    def __getitem__(self, key):
+        return self.weights[key]
+
+    def weight(self, start: int, end: int) -> float:
+        """
+        Get the weight of the edge between two vertexes.
+
+
+        :param start: The start vertex.
+        :param end: The end vertex.
+
+        :returns: The weight of the edge from ``start`` to ``end``.
+        """
+        return float(self.weights[start, end])
+
+    @classmethod
+    def from_file(cls, filepath) -> 'DistanceMatrix':
+        """
+        Import a weighted, undirected graph file as distance matrix.
+
+        The file's edges will be written into the matrix for both directions
+        without creating any intermediate vertex or edge objects.
+
+
+        :param filepath: the path to the graph file
+
+        :returns: The distance matrix of the graph.
+        """
+        with open_input(filepath) as input_file:
+            n = int(input_file.readline())
+            edges = np.loadtxt(input_file, ndmin=2)
+
+        weights = np.full((n, n), np.inf)
+        np.fill_diagonal(weights, 0)
+        if len(edges):
+            s = edges[:, 0].astype(np.intp)
+            e = edges[:, 1].astype(np.intp)
+            weights[s, e] = edges[:, 2]
+            weights[e, s] = edges[:, 2]
+        return cls(weights)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'DistanceMatrix':
+        """
+        Convert a :py:class:`.Graph` into a distance matrix.
+
+
+        :param graph: The graph to convert.
+
+        :returns: The distance matrix of the graph.
+        """
+        n = graph.vertex_count
+        weights = np.full((n, n), np.inf)
+        np.fill_diagonal(weights, 0)
+        for ends in graph.edges.values():
+            for edge in ends.values():
+                weights[edge.start.value, edge.end.value] = edge.weight
+        return cls(weights)
+
+    def to_graph(self) -> Graph:
+        """
+        Convert this distance matrix into an undirected :py:class:`.Graph`.
+
+
+        :returns: The graph including all edges of finite weight.
+        """
+        graph = Graph(weighted=True, vertex_count=self.vertex_count)
+        for i in range(self.vertex_count):
+            graph.vertexes[i] = Vertex(value=i)
+        s, e = np.nonzero(np.isfinite(self.weights))
+        for start, end in zip(s.tolist(), e.tolist()):
+            if start < end:
+                graph.add_edge(start, end, float(self.weights[start, end]))
+        return graph
@@ -1,30 +1,63 @@
-from graph import Graph, timeit, TSP, Kruskal
+import numpy as np
+
+from graph import timeit, TSP, Tour
 
 
 class DoubleTree(TSP):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, graph=None):
+        super().__init__(graph)
 
     def __call__(self):
         return self._double_tree()
 
+    def _mst(self) -> list[list[int]]:
+        """
+        Get a minimal spanning tree of the distance matrix using Prim.
+
+        As the graph is complete, Prim's algorithm on the dense matrix needs
+        just ``O(n^2)`` operations without any priority queue: the cheapest
+        connection of every vertex to the tree is kept in an array and updated
+        with the row of the vertex added last.
+
+        :return: The children of every vertex in the MST rooted at vertex 0
+        """
+        n = self.graph.vertex_count
+        in_tree = np.zeros(n, dtype=bool)
+        cost = np.full(n, np.inf)
+        parent = np.zeros(n, dtype=np.intp)
+        children = [[] for _ in range(n)]
+
+        current = 0
+        in_tree[current] = True
+        for _ in range(n - 1):
+            # update the cheapest connection to the tree for all vertexes, which
+            # are closer to the vertex added last
+            row = self.graph.weights[current]
+            closer = row < cost
+            cost[closer] = row[closer]
+            parent[closer] = current
+            # add the vertex with the cheapest connection to the tree
+            current = int(np.argmin(np.where(in_tree, np.inf, cost)))
+            in_tree[current] = True
+            children[parent[current]].append(current)
+        return children
+
     @timeit
-    def _double_tree(self) -> Graph:
+    def _double_tree(self) -> Tour:
         """
         determine a minimal round trip using double_tree
-        :return: The Graph for the round trip
+        :return: The Tour for the round trip
         """
-        # get an mst from the graph using Kruskal
-        kruskal = Kruskal(self.graph)
-        mst = kruskal.get_mst()
-        # get the trip list using DFS
-        trip_vertex_list = mst.dfs()
-        # iterate through the list until you reach the last item
-        for i in range(len(trip_vertex_list) - 1):
-            # always add the edge to the next vertex
-            current_edge = self.graph.get_edge(start_v=trip_vertex_list[i], end_v=trip_vertex_list[i + 1])
-            self.round_trip.add_existing_edge(current_edge)
-        # Add the Last edge back to the start
-        current_edge = self.graph.get_edge(start_v=trip_vertex_list[-1], end_v=trip_vertex_list[0])
-        self.round_trip.add_existing_edge(current_edge)
-        return self.round_trip
+        # get an mst from the graph using Prim
+        children = self._mst()
+        # get the trip list using DFS, visiting the children with smaller
+        # values first
+        trip_vertex_list = []
+        stack = [0]
+        while stack:
+            current_vertex = stack.pop()
+            trip_vertex_list.append(current_vertex)
+            stack.extend(reversed(children[current_vertex]))
+        # connect the vertexes in order of the DFS and add the last edge back to
+        # the start
+        return self._round_trip(trip_vertex_list)
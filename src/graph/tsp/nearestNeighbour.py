@@ -1,31 +1,86 @@
-from graph.graph import Graph, timeit
+import numpy as np
+
+from graph.graph import timeit
 from graph.tsp.abstractTSP import TSP
+from graph.tsp.tour import Tour
 
 
 class NearestNeighbour(TSP):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, graph=None):
+        super().__init__(graph)
+
+    def __call__(self, start: int = 0, multi_start: bool = False):
+        return self._nearest_neighbour(start, multi_start)
+
+    @staticmethod
+    def _tours(distances: np.ndarray, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Run nearest neighbour from multiple start vertexes in parallel.
+
+        Each row of the returned tour array is the order of vertexes visited by
+        the nearest neighbour heuristic originating from the related start
+        vertex. All tours are extended simultaneously: in every step, the rows
+        of the distance matrix for the current vertexes are masked by the
+        vertexes already visited and the next vertex is chosen by ``argmin``.
+
 
-    def __call__(self):
-        return self._nearest_neighbour()
+        :param distances: The weights of the graph's distance matrix.
+        :param starts: The vertexes to start the tours from.
+
+        :returns: The tours and the cost of each closed round trip. Tours
+            getting stuck, as all unvisited vertexes are unreachable from their
+            current one in an incomplete graph, have infinite cost.
+        """
+        n = distances.shape[0]
+        k = len(starts)
+        rows = np.arange(k)
+
+        tours = np.empty((k, n), dtype=np.intp)
+        tours[:, 0] = starts
+        cost = np.zeros(k)
+        visited = np.zeros((k, n), dtype=bool)
+        visited[rows, starts] = True
+
+        current = starts
+        for i in range(1, n):
+            # Get the distances from all current vertexes and mask the ones
+            # already visited, so argmin will choose the nearest unvisited one.
+            candidates = np.where(visited, np.inf, distances[current])
+            current = np.argmin(candidates, axis=1)
+            # If all candidates are infinite, argmin returns the first vertex,
+            # which might be visited already. The tour is invalid then, but its
+            # infinite cost marks it to be dropped.
+            cost += candidates[rows, current]
+            visited[rows, current] = True
+            tours[:, i] = current
+
+        # Close the round trips by going back to the start vertexes.
+        cost += distances[current, starts]
+        return tours, cost
 
     @timeit
-    def _nearest_neighbour(self) -> Graph:
+    def _nearest_neighbour(self, start: int = 0, multi_start: bool = False) -> Tour:
         """
         determine a minimal round trip using nearest_neighbour
-        :return: The Graph for the round trip
+
+        :param start: The vertex to start the round trip from.
+        :param multi_start: Run the algorithm from every vertex and keep the
+            round trip with minimal cost. This ignores ``start``.
+        :return: The Tour for the round trip
+        :raises ValueError: No round trip could be found from any start, e.g.
+            as the graph is incomplete.
         """
-        # choose the 0 vertex as start vertex
-        start_vertex = self.graph.vertexes[0]
-        current_vertex = start_vertex
-        # proceed until all vertexes are present within the round trip graph
-        for _ in range(self.graph.vertex_count - 1):
-            # choose the smallest edge in the list of edges where the end vertex isn't present yet
-            current_edge = min([_ for _ in current_vertex.edges if _.end not in self.round_trip.vertexes])
-            self.round_trip.add_existing_edge(current_edge)
-            current_vertex = current_edge.end
-        # get the edge back to the start vertex
-        final_edge = self.graph.get_edge(start_v=current_vertex.value, end_v=start_vertex.value)
-        # add the last edge back to the start to close the round trip
-        self.round_trip.add_existing_edge(final_edge)
-        return self.round_trip
+        distances = self.graph.weights
+        if multi_start:
+            starts = np.arange(self.graph.vertex_count)
+        else:
+            starts = np.array([start])
+        tours, cost = self._tours(distances, starts)
+        # Starts getting stuck are dropped, as their cost is infinite.
+        best = np.argmin(cost)
+        if not np.isfinite(cost[best]):
+            where = 'every start' if multi_start else f'vertex {start}'
+            raise ValueError(f'Nearest neighbour gets stuck from {where}, as the graph is incomplete.')
+        tour = self._round_trip(tours[best])
+        tour.validate()
+        return tour
@@ -0,0 +1,119 @@
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from graph.graph import Graph, Vertex
+from graph.tsp.distanceMatrix import DistanceMatrix
+
+
+class Tour:
+    """
+    Round trip through a :py:class:`.DistanceMatrix`.
+
+    A tour just stores the order of the vertexes visited and keeps track of its
+    cost while vertexes are appended, so the cost of a round trip can be
+    retrieved in constant time instead of summing up the edges of a
+    :py:class:`.Graph`. The edge back to the first vertex is implied and
+    included in :py:attr:`cost`.
+    """
+
+    def __init__(self, distances: DistanceMatrix, order: Iterable[int] = ()):
+        """
+        Constructor.
+
+
+        :param distances: The distance matrix the tour belongs to.
+        :param order: The vertexes of the tour in the order they are visited.
+        """
+        self.distances = distances
+        self._order = np.empty(distances.vertex_count, dtype=np.intp)
+        self._size = 0
+        self._path_cost = 0.0
+
+        order = np.fromiter(order, dtype=np.intp)
+        if len(order) > len(self._order):
+            raise ValueError('The tour visits more vertexes than the graph has.')
+        if len(order):
+            self._order[:len(order)] = order
+            self._size = len(order)
+            self._path_cost = float(distances.weights[order[:-1], order[1:]].sum())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.order.tolist())
+
+    def __str__(self):
+        return f"{self.order.tolist()} ({self.cost})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def order(self) -> np.ndarray:
+        """
+        :returns: The vertexes of the tour in the order they are visited.
+        """
+        return self._order[:self._size]
+
+    @property
+    def cost(self) -> float:
+        """
+        Get the cost of the round trip.
+
+        The cost is maintained while vertexes are appended, so just the edge
+        from the last vertex back to the first one needs to be added here.
+
+
+        :returns: The cost of the round trip including the edge back to the
+            start vertex.
+        """
+        if self._size < 2:
+            return 0.0
+        return self._path_cost + self.distances.weight(self._order[self._size - 1], self._order[0])
+
+    def append(self, vertex: int) -> None:
+        """
+        Visit another vertex at the end of the tour.
+
+
+        :param vertex: The vertex to be visited next.
+        """
+        if self._size >= len(self._order):
+            raise ValueError('The tour already visits all vertexes of the graph.')
+        if self._size:
+            self._path_cost += self.distances.weight(self._order[self._size - 1], vertex)
+        self._order[self._size] = vertex
+        self._size += 1
+
+    def validate(self) -> None:
+        """
+        Check whether this tour is a valid round trip.
+
+        A valid round trip visits every vertex of the graph exactly once and
+        just uses edges existing in the graph.
+
+
+        :raises ValueError: The tour isn't a valid round trip.
+        """
+        n = self.distances.vertex_count
+        if self._size != n or not np.array_equal(np.sort(self.order), np.arange(n)):
+            raise ValueError('The tour does not visit every vertex exactly once.')
+        if not np.isfinite(self.distances.weights[self.order, np.roll(self.order, -1)]).all():
+            raise ValueError('The tour uses edges not present in the graph.')
+
+    def to_graph(self) -> Graph:
+        """
+        Convert this tour into an undirected :py:class:`.Graph`.
+
+
+        :returns: A Graph including just the edges of this round trip.
+        """
+        graph = Graph(weighted=True, vertex_count=self.distances.vertex_count)
+        for i in range(self.distances.vertex_count):
+            graph.vertexes[i] = Vertex(value=i)
+        order = self.order.tolist()
+        for s, e in zip(order, order[1:] + order[:1]):
+            graph.add_edge(s, e, self.distances.weight(s, e))
+        return graph
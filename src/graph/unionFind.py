@@ -0,0 +1,113 @@
+class UnionFind:
+    """
+    Disjoint-set forest to track components incrementally.
+
+    Every component is represented by a tree of vertexes, whose root
+    identifies the component. Merging components attaches the smaller tree to
+    the root of the larger one (union by size) and lookups halve the path to the
+    root, so all operations run in amortized near-constant time and the number
+    of components is always known without traversing the graph.
+    """
+
+    def __init__(self, vertex_count: int = 0):
+        """
+        Constructor.
+
+
+        :param vertex_count: The number of vertexes, each being a component of
+            its own initially.
+        """
+        self._parent = list(range(vertex_count))
+        self._size = [1] * vertex_count
+        self.count = vertex_count
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def grow(self, vertex_count: int) -> None:
+        """
+        Add vertexes as new components of their own.
+
+
+        :param vertex_count: The new total number of vertexes.
+        """
+        added = vertex_count - len(self._parent)
+        if added > 0:
+            self._parent.extend(range(len(self._parent), vertex_count))
+            self._size.extend([1] * added)
+            self.count += added
+
+    def find(self, v: int) -> int:
+        """
+        Get the component of a vertex.
+
+
+        :param v: The vertex to look up.
+
+        :returns: The root vertex identifying the component of ``v``.
+        """
+        parent = self._parent
+        while parent[v] != v:
+            # Path halving: let every other vertex on the path skip its parent,
+            # so subsequent lookups need fewer steps.
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Merge the components of two vertexes.
+
+
+        :param a: The first vertex.
+        :param b: The second vertex.
+
+        :returns: Whether the components have been merged, i.e. ``a`` and ``b``
+            didn't belong to the same component before.
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+
+        # Always attach the smaller tree to the larger one to keep the trees
+        # flat.
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self.count -= 1
+        return True
+
+    def same(self, a: int, b: int) -> bool:
+        """
+        Check whether two vertexes belong to the same component.
+
+
+        :param a: The first vertex.
+        :param b: The second vertex.
+
+        :returns: Whether ``a`` and ``b`` are in the same component.
+        """
+        return self.find(a) == self.find(b)
+
+    def size(self, v: int) -> int:
+        """
+        Get the size of a vertex's component.
+
+
+        :param v: The vertex to look up.
+
+        :returns: The number of vertexes in the component of ``v``.
+        """
+        return self._size[self.find(v)]
+
+    def sizes(self) -> dict[int, int]:
+        """
+        Get the sizes of all components.
+
+
+        :returns: The number of vertexes for every component, keyed by the root
+            vertex identifying the component.
+        """
+        return {v: self._size[v] for v, p in enumerate(self._parent) if v == p}
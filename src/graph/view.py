@@ -0,0 +1,185 @@
+from itertools import compress
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .csr import CSR
+from .graph import Edge, Graph, Vertex
+
+
+class GraphView:
+    """
+    Subgraph of a :py:class:`.Graph`, selecting its edges by a boolean mask.
+
+    The view doesn't create any vertexes or edges, but refers to the objects of
+    the viewed graph. Its edges are selected by :py:attr:`mask`, which has an
+    entry for every edge of the graph in the order of :py:attr:`Graph.edges`.
+    For undirected graphs, both directions of an edge are selected separately,
+    just like they are stored. Views are converted into a full graph by
+    :py:meth:`to_graph` only, if needed.
+
+    .. note:: The view refers to the edges of the graph at the time of its
+        creation. Edges added later are not part of the view.
+    """
+
+    def __init__(self, graph: Graph, mask: Optional[np.ndarray] = None, edges: Optional[list[Edge]] = None):
+        """
+        Constructor.
+
+
+        :param graph: The graph to view.
+        :param mask: Boolean array selecting the edges of the view. By default,
+            all edges are selected.
+        :param edges: The edges of ``graph`` in the order of ``mask``, to share
+            them with another view of the same graph.
+        """
+        self.graph = graph
+        self._edges = edges if edges is not None else [e for x in graph.edges.values() for e in x.values()]
+        self.mask = mask if mask is not None else np.ones(len(self._edges), dtype=bool)
+        self._ends: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_edges(cls, graph: Graph, edges: Iterable[Edge]) -> 'GraphView':
+        """
+        Get a view of selected edges of a graph.
+
+        For undirected graphs, selecting either direction of an edge selects
+        both of them.
+
+
+        :param graph: The graph to view.
+        :param edges: The edges of ``graph`` to select.
+
+        :returns: The view of the edges.
+        """
+        view = cls(graph)
+        view.mask[:] = False
+        starts, ends = view.ends
+        selected = np.array([(e.start.value, e.end.value) for e in edges], dtype=np.intp).reshape(-1, 2)
+        # Find the positions of the edges by their vertexes, encoded into a
+        # single key per edge to search them in bulk.
+        size = max(view._bound, int(selected.max(initial=-1)) + 1)
+        keys = starts * size + ends
+        order = np.argsort(keys)
+        wanted = selected[:, 0] * size + selected[:, 1]
+        if not graph.directed:
+            wanted = np.concatenate((wanted, selected[:, 1] * size + selected[:, 0]))
+        positions = np.searchsorted(keys, wanted, sorter=order)
+        found = positions < len(keys)
+        found[found] = keys[order[positions[found]]] == wanted[found]
+        view.mask[order[positions[found]]] = True
+        return view
+
+    @property
+    def ends(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :returns: The values of the start and end vertexes of all edges of the
+            graph, in the order of :py:attr:`mask`.
+        """
+        if self._ends is None:
+            count = len(self._edges)
+            self._ends = (np.fromiter((e.start.value for e in self._edges), dtype=np.intp, count=count),
+                          np.fromiter((e.end.value for e in self._edges), dtype=np.intp, count=count))
+        return self._ends
+
+    @property
+    def _bound(self) -> int:
+        # An upper bound of the vertex values, e.g. to index arrays by them.
+        starts, ends = self.ends
+        return max(self.graph.vertex_count, int(starts.max(initial=-1)) + 1, int(ends.max(initial=-1)) + 1)
+
+    def _view(self, mask: np.ndarray) -> 'GraphView':
+        view = GraphView(self.graph, mask, self._edges)
+        view._ends = self._ends
+        return view
+
+    def __iter__(self) -> Iterator[Edge]:
+        """
+        :returns: Iterator over the edges of the view.
+        """
+        return compress(self._edges, self.mask)
+
+    def __len__(self) -> int:
+        """
+        :returns: The number of edges of the view, counting both directions of
+            undirected edges.
+        """
+        return int(np.count_nonzero(self.mask))
+
+    @property
+    def vertexes(self) -> np.ndarray:
+        """
+        :returns: The sorted values of all vertexes with an edge in the view.
+        """
+        starts, ends = self.ends
+        return np.union1d(starts[self.mask], ends[self.mask])
+
+    @property
+    def overall_weight(self) -> float:
+        """
+        Get the weight of all edges of the view. For undirected graphs, each
+        edge is counted once, just like :py:attr:`.Graph.overall_weight`.
+
+        :returns: The weight of all edges.
+        """
+        return sum(e.weight for e in self
+                   if self.graph.directed or e.start.value <= e.end.value)
+
+    def subgraph(self, vertexes: Iterable[int]) -> 'GraphView':
+        """
+        Get the subgraph induced by a subset of vertexes.
+
+
+        :param vertexes: The values of the vertexes to keep.
+
+        :returns: A view of the edges of this view between ``vertexes``.
+        """
+        starts, ends = self.ends
+        keep = np.zeros(self._bound, dtype=bool)
+        vertexes = np.fromiter(vertexes, dtype=np.intp)
+        keep[vertexes[vertexes < len(keep)]] = True
+        return self._view(self.mask & keep[starts] & keep[ends])
+
+    def filter(self, mask: np.ndarray) -> 'GraphView':
+        """
+        Select a subset of the edges of this view.
+
+
+        :param mask: Boolean array of the edges to keep, in the order of
+            :py:attr:`mask`.
+
+        :returns: A view of the edges selected by both masks.
+        """
+        return self._view(self.mask & mask)
+
+    def to_csr(self) -> CSR:
+        """
+        Get the :py:class:`.CSR` adjacency of the edges of this view.
+
+        :returns: The CSR adjacency, having all vertexes of the graph.
+        """
+        starts, ends = self.ends
+        weights = np.fromiter((e.weight for e in self), dtype=float, count=len(self))
+        return CSR.from_edges(self.graph.vertex_count, starts[self.mask], ends[self.mask], weights)
+
+    def to_graph(self) -> Graph:
+        """
+        Convert this view into a :py:class:`.Graph` of its own.
+
+        The graph gets new vertexes for all vertexes of the viewed graph and new
+        edges for the edges of the view, so changing it doesn't affect the
+        viewed graph.
+
+
+        :returns: The graph of the edges of this view.
+        """
+        graph = Graph(vertex_count=self.graph.vertex_count, directed=self.graph.directed,
+                      weighted=self.graph.weighted)
+        for value in self.graph.vertexes:
+            graph.vertexes[value] = Vertex(value)
+            graph.edges.setdefault(value, {})
+        for e in self:
+            # Undirected edges are added with both directions at once.
+            if self.graph.directed or e.end.value not in graph.edges[e.start.value]:
+                graph.add_edge(e.start.value, e.end.value, e.weight)
+        return graph
@@ -1,19 +1,16 @@
 #!/usr/bin/env python
 
 import argparse
+import cProfile
+import json
+import sys
+import tracemalloc
 
-from graph.flow.cost_minimal.successive_shortest_path import SuccessiveShortestPath
-from graph.flow.cost_minimal.cycle_canceling import CycleCanceling
-from graph.flow.max.edmondsKarp import EdmondsKarp
-from graph.graph import Graph
-from graph.mst.kruskal import Kruskal
-from graph.mst.prim import Prim
-from graph.shortest_path.dijkstra import Dijkstra
-from graph.shortest_path.mooreBellmanFord import MooreBellmanFord
-from graph.tsp.branchAndBound import BranchAndBound
-from graph.tsp.bruteForce import BruteForce
-from graph.tsp.doubleTree import DoubleTree
-from graph.tsp.nearestNeighbour import NearestNeighbour
+from graph.metrics import metrics
+
+# The algorithms are imported by the branches of run() using them, as most of
+# them are needed for a few invocations only and importing them (and NumPy)
+# would dominate the runtime of small graphs.
 
 
 def getArgs() -> argparse.Namespace:
@@ -31,14 +28,41 @@ def getArgs() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
 
     parser.add_argument('graph',
-                        help='graph file to load')
+                        nargs='?',
+                        help='graph file to load (- to read from stdin)')
+    parser.add_argument('--batch',
+                        metavar='FILE',
+                        help='Run the jobs of a JSON lines file (- to read from stdin) and write their results as JSON lines')
+    parser.add_argument('-j', '--job',
+                        action='append',
+                        metavar='SPEC',
+                        help='Run a job on the graph, e.g. "kruskal" or "dijkstra,start=2". Can be given multiple times')
+    parser.add_argument('--workers',
+                        type=int,
+                        help='Number of processes to run the jobs of different graphs in parallel (default: 1), or to parse the graph by --parallel (default: all CPUs for large files)')
+    parser.add_argument('--parallel',
+                        action='store_true',
+                        help='Parse the graph file into arrays by a pool of processes and count its components on the CSR adjacency built from them')
+    parser.add_argument('--stream',
+                        action='store_true',
+                        help='Stream the edges in chunks instead of loading the whole graph. Supported for components and Kruskal (on edges sorted by weight)')
+    parser.add_argument('--chunk-size',
+                        type=int,
+                        default=65536,
+                        help='Number of edges per chunk when streaming')
     parser.add_argument('-m', '--moore_bellman_ford',
                         help='Use the Moore-Bellman-Ford Algorithm to determine shortest paths')
     parser.add_argument('--dijkstra',
                         help='Use the Dijkstra Algorithm to determine shortest paths')
+    parser.add_argument('--ch',
+                        action='store_true',
+                        help='Use a contraction hierarchy to determine the shortest path from --start to --target. The graph may be a hierarchy saved by --save (.npz)')
+    parser.add_argument('--save',
+                        metavar='FILE',
+                        help='Save the contraction hierarchy to FILE (.npz)')
     parser.add_argument('--directed',
                         action='store_true',
-                        help='Define whether the imported graph is directed or not. (Currently only applicable for Shortest Path')
+                        help='Define whether the imported graph is directed or not. (Currently only applicable for Shortest Path and components)')
     parser.add_argument('-k', '--kruskal',
                         action='store_true',
                         help='Use the Kruskal algorithm to declare an MSTs cost')
@@ -48,6 +72,9 @@ def getArgs() -> argparse.Namespace:
     parser.add_argument('-n', '--nearestneighbour',
                         action='store_true',
                         help='Use nearest Neighbour to determine an optimal round trip')
+    parser.add_argument('--multistart',
+                        action='store_true',
+                        help='Run nearest Neighbour from every vertex and keep the best round trip')
     parser.add_argument('-d', '--doubletree',
                         action='store_true',
                         help='Use Double-Tree Algorithm to determine an optimal round trip')
@@ -64,6 +91,30 @@ def getArgs() -> argparse.Namespace:
                         action='store_true',
                         help='Use Cycle Canceling Algorithm to determine a cost minimal flow')
 
+    parser.add_argument('--frontier',
+                        action='store_true',
+                        help='Count components by vectorized frontier based searches')
+    parser.add_argument('--strong',
+                        action='store_true',
+                        help='Count the strongly connected components of a directed graph')
+
+    parser.add_argument('--backend',
+                        choices=('python', 'scipy', 'numpy'),
+                        default='python',
+                        help='Run Dijkstra, Kruskal, Edmonds-Karp or components by SciPy\'s csgraph routines (if installed) to compare results and runtime, or Moore-Bellman-Ford (also within Successive Shortest Path and Cycle Canceling) by vectorized NumPy rounds')
+
+    parser.add_argument('--metrics',
+                        nargs='?',
+                        const='-',
+                        metavar='FILE',
+                        help='Collect timings and counters and write them as JSON to FILE (default: stderr)')
+    parser.add_argument('--profile',
+                        metavar='FILE',
+                        help='Profile the run with cProfile and write the stats to FILE')
+    parser.add_argument('--tracemalloc',
+                        action='store_true',
+                        help='Trace memory allocations and report the peak in the metrics (implies --metrics)')
+
     parser.add_argument('-s', '--start',
                         type=int,
                         help='Start vertex')
@@ -73,83 +124,231 @@ def getArgs() -> argparse.Namespace:
     parser.add_argument('-ek', '--edmondsKarp',
                         action='store_true',
                         help='Use Edmonds-Karp algorithm to determine a maximal flow')
+    parser.add_argument('-gh', '--gomoryHu',
+                        action='store_true',
+                        help='Build a Gomory-Hu tree of the network (as undirected) to determine the minimum cut between --start and --target, or print the tree. Its maximum flows run in parallel by --workers processes')
+    parser.add_argument('--cut',
+                        action='store_true',
+                        help='Print the minimum cut of the maximal flow as well')
 
     # Parse the command line arguments and return the generated namespace. If
     # an argument is unknown, or its value does not match the specification, an
     # error message will be generated and the help message shown.
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.graph is None and args.batch is None:
+        parser.error('the graph is required, unless running a batch')
+    if args.stream:
+        # Streaming supports one-pass algorithms only, anything else would be
+        # ignored silently.
+        unsupported = [name for name in ('moore_bellman_ford', 'dijkstra', 'ch', 'prim', 'nearestneighbour',
+                                         'doubletree', 'bruteforce', 'branchAndBound', 'successiveShortestPath',
+                                         'cycleCanceling', 'edmondsKarp', 'gomoryHu', 'strong', 'parallel')
+                       if getattr(args, name)]
+        if unsupported:
+            parser.error(f"--stream supports components and --kruskal only, not --{', --'.join(unsupported)}")
+    return args
 
 
-if __name__ == '__main__':
-    # Parse the command line arguments. If necessary, this function will print
-    # error messages and exits the application on errors.
-    args = getArgs()
+def run(args: argparse.Namespace) -> None:
+    """
+    Run the algorithm selected by the command line arguments.
+
+
+    :param args: The parsed command line arguments.
+    """
+    if args.batch or args.job:
+        from graph.batch import parse_job, read_jobs, run_batch
+        from graph.stream import open_input
+
+        # Collect all jobs first, so invalid ones are reported before running
+        # any of them. Every input is imported once and shared by its jobs.
+        try:
+            jobs = [parse_job(spec, args.graph) for spec in args.job or []]
+            if args.batch:
+                with open_input(args.batch) as input_file:
+                    jobs.extend(read_jobs(input_file, args.graph))
+        except ValueError as e:
+            sys.exit(f'invalid job: {e}')
+        for result in run_batch(jobs, args.workers or 1):
+            print(json.dumps(result), flush=True)
+
+    elif args.stream:
+        from graph.mst.kruskal import Kruskal
+        from graph.stream import open_input, read_edges, read_header, stream_components
+
+        # Read the edges chunk by chunk and feed them into one-pass algorithms,
+        # so the graph never needs to be held in memory completely.
+        with open_input(args.graph) as input_file:
+            vertex_count = read_header(input_file)
+            edges = read_edges(input_file, args.chunk_size)
+            if args.kruskal:
+                print(Kruskal().stream_cost(vertex_count, edges))
+            else:
+                print(stream_components(vertex_count, edges).count)
+
+    elif args.parallel:
+        from graph.loader import load_csr
+
+        # Build the adjacency from the parsed arrays directly, without creating
+        # any vertex or edge objects. Weakly connected components don't depend
+        # on the direction of the edges, so just the strong ones need it.
+        strong = args.directed and args.strong
+        try:
+            csr = load_csr(args.graph, directed=strong, workers=args.workers)
+        except ValueError as e:
+            sys.exit(f'invalid graph: {e}')
+        print(int(csr.strongly_connected().max(initial=-1)) + 1 if strong else csr.components())
+
+    elif args.moore_bellman_ford:
+        from graph.shortest_path.mooreBellmanFord import MooreBellmanFord
 
-    if args.moore_bellman_ford:
         graph = MooreBellmanFord()
         graph.import_from_file(args.graph, directed=False or args.directed)
-        print(graph(int(args.moore_bellman_ford)))
+        print(graph(int(args.moore_bellman_ford), backend=args.backend))
+
+    elif args.ch:
+        from graph.shortest_path.contractionHierarchy import ContractionHierarchy
+
+        if args.graph.endswith('.npz'):
+            ch = ContractionHierarchy.load(args.graph)
+        else:
+            ch = ContractionHierarchy()
+            ch.import_from_file(args.graph, directed=args.directed)
+            ch.preprocess()
+        if args.save:
+            ch.save(args.save)
+        if args.start is not None and args.target is not None:
+            print(ch(args.start, args.target))
+            print('path:', ch.path(args.start, args.target))
 
     elif args.dijkstra:
+        from graph.shortest_path.dijkstra import Dijkstra
+
         graph = Dijkstra()
         graph.import_from_file(args.graph, directed=False or args.directed)
-        print(graph(int(args.dijkstra)))
+        print(graph(int(args.dijkstra), backend=args.backend))
 
     elif args.kruskal:
+        from graph.mst.kruskal import Kruskal
+
         mst = Kruskal()
         mst.import_from_file(args.graph)
-        print(mst())
+        print(mst(args.backend))
 
     elif args.prim:
+        from graph.mst.prim import Prim
+
         mst = Prim()
         mst.import_from_file(args.graph)
         print(mst())
 
     elif args.nearestneighbour:
+        from graph.tsp.nearestNeighbour import NearestNeighbour
+
         tsp = NearestNeighbour()
         tsp.import_from_file(args.graph)
-        print(tsp().overall_weight)
+        print(tsp(args.start or 0, args.multistart).cost)
 
     elif args.doubletree:
+        from graph.tsp.doubleTree import DoubleTree
+
         tsp = DoubleTree()
         tsp.import_from_file(args.graph)
-        print(tsp().overall_weight)
+        print(tsp().cost)
 
     elif args.bruteforce:
+        from graph.tsp.bruteForce import BruteForce
+
         tsp = BruteForce()
         tsp.import_from_file(args.graph)
-        tsp()
-        print(tsp.min_cost)
+        print(tsp().cost)
 
     elif args.branchAndBound:
+        from graph.tsp.branchAndBound import BranchAndBound
+
         tsp = BranchAndBound()
         tsp.import_from_file(args.graph)
-        tsp()
-        print(tsp.min_cost)
+        print(tsp().cost)
 
     elif args.edmondsKarp:
+        from graph.flow.max.edmondsKarp import EdmondsKarp
+
         ek = EdmondsKarp()
         ek.import_from_file(args.graph)
-        print(ek(args.start, args.target))
+        print(ek(args.start, args.target, args.backend))
         print('flow:', ek.flow)
+        if args.cut:
+            source_side, edges = ek.min_cut()
+            print('source side:', sorted(source_side))
+            print('cut:', [(e.start.value, e.end.value) for e in edges])
+    elif args.gomoryHu:
+        from graph.flow.max.gomoryHu import GomoryHu
+
+        tree = GomoryHu()
+        tree.import_from_file(args.graph)
+        parent, capacity = tree(args.workers or 1)
+        if args.start is not None and args.target is not None:
+            print(tree.min_cut_value(args.start, args.target))
+        else:
+            for v, (p, c) in enumerate(zip(parent, capacity)):
+                if p != v:
+                    print(f'{v} -> {p} ({c})')
     elif args.successiveShortestPath:
+        from graph.flow.cost_minimal.successive_shortest_path import SuccessiveShortestPath
+
         ssp = SuccessiveShortestPath()
         ssp.import_from_file(args.graph)
-        result, graph = ssp()
+        result, graph = ssp(args.backend)
         if result:
             # print(graph)
             print('cost:', ssp.cost)
         else:
             print("no b-flow possible")
     elif args.cycleCanceling:
+        from graph.flow.cost_minimal.cycle_canceling import CycleCanceling
+
         cc = CycleCanceling()
         cc.import_from_file(args.graph)
-        res = cc()
+        res = cc(args.backend)
         if res:
             print(res)
             print('cost:', res.cost)
 
     else:
-        graph = Graph()
+        from graph.graph import Graph
+
+        graph = Graph(directed=args.directed)
         graph.import_from_file(args.graph)
-        graph.component_time()
+        graph.component_time(args.frontier, args.strong, args.backend)
+
+
+if __name__ == '__main__':
+    # Parse the command line arguments. If necessary, this function will print
+    # error messages and exits the application on errors.
+    args = getArgs()
+
+    # Enable the instrumentation hooks requested. Metrics are collected by the
+    # functions of the graph package and written after the run, including the
+    # peak memory traced and a profile of all calls, if requested.
+    # The peak memory traced is reported by the metrics, which are written to
+    # stderr by default, if tracing is requested alone.
+    if args.tracemalloc and not args.metrics:
+        args.metrics = '-'
+    if args.metrics:
+        metrics.enable()
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(run, args)
+        profiler.dump_stats(args.profile)
+    else:
+        with metrics.phase('main.run'):
+            run(args)
+
+    if args.tracemalloc:
+        metrics.set('peak_memory_bytes', tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    if args.metrics:
+        metrics.dump(args.metrics)